@@ -4,10 +4,42 @@ import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime, timedelta
 import os
+import shutil
+import time
+import zipfile
 from src.data_processor import DataProcessor
 from src.database import DatabaseManager
 from src.calls_processor import CallsProcessor
 from src.combined_processor import CombinedProcessor
+from src.executors import SdrResultStore
+from src.job_runner import get_job_runner
+from src.pipeline_jobs import multi_sdr_job, calls_job, combined_join_job
+from src.sdr_archive import extract_sdr_archive
+from src.read_schema import build_read_schema
+from src.processed_store import find_processed_file, read_processed, load_processed_files
+
+# Per-SDR Send-Open joins run in a thread pool: uploaded files live in this
+# process, and the joins share nothing until the contacts stage
+SDR_EXECUTOR = os.environ.get('SDR_EXECUTOR', 'thread')
+SDR_JOBS = int(os.environ.get('SDR_JOBS', '0'))  # 0 = one worker per CPU
+# Independent processed-file loads run side by side ('thread', 'process' or 'serial')
+LOAD_EXECUTOR = os.environ.get('LOAD_EXECUTOR', 'thread')
+# Bulk (zip) uploads: SDR files are read from disk, so worker processes can join them in parallel
+BULK_EXECUTOR = os.environ.get('BULK_EXECUTOR', 'process')
+BULK_JOBS = int(os.environ.get('BULK_JOBS', '0'))  # 0 = one worker per CPU
+# Validated frames and join results of identical uploads are reused from here ('' disables)
+RESULT_CACHE_DIR = os.environ.get('RESULT_CACHE_DIR', 'data/processed_files/cache/results') or None
+# Cleaned contacts frame and email index, rebuilt only when data/contacts.csv changes ('' disables)
+CONTACTS_CACHE_DIR = os.environ.get('CONTACTS_CACHE_DIR', 'data/processed_files/cache') or None
+# Long pipeline runs execute on background worker threads shared by all sessions;
+# the page re-runs every JOB_POLL_SECONDS while one of its jobs is active
+JOB_WORKERS = int(os.environ.get('JOB_WORKERS', '2'))
+JOB_POLL_SECONDS = float(os.environ.get('JOB_POLL_SECONDS', '1'))
+
+# Typed reads of the processed files (categoricals, dates parsed while reading)
+PROCESSED_DIR = 'data/processed_files'
+PROCESSED_EMAIL_SCHEMA = build_read_schema('processed_email')
+PROCESSED_CALLS_SCHEMA = build_read_schema('processed_calls')
 
 # Configure page
 st.set_page_config(
@@ -19,13 +51,17 @@ st.set_page_config(
 
 # Initialize session state
 if 'data_processor' not in st.session_state:
-    st.session_state.data_processor = DataProcessor()
+    st.session_state.data_processor = DataProcessor(contacts_cache_dir=CONTACTS_CACHE_DIR, result_cache_dir=RESULT_CACHE_DIR)
 if 'db_manager' not in st.session_state:
     st.session_state.db_manager = DatabaseManager()
 if 'calls_processor' not in st.session_state:
-    st.session_state.calls_processor = CallsProcessor()
+    st.session_state.calls_processor = CallsProcessor(result_cache_dir=RESULT_CACHE_DIR)
+if 'sdr_result_store' not in st.session_state:
+    st.session_state.sdr_result_store = SdrResultStore()
 if 'combined_processor' not in st.session_state:
-    st.session_state.combined_processor = CombinedProcessor()
+    st.session_state.combined_processor = CombinedProcessor(result_cache_dir=RESULT_CACHE_DIR, contacts_cache_dir=CONTACTS_CACHE_DIR)
+if 'pipeline_jobs' not in st.session_state:
+    st.session_state.pipeline_jobs = {}  # job_id -> {'kind', 'label', 'context'} until the result is attached
 
 def main():
     # Create a container at the top for consistent focus
@@ -34,6 +70,10 @@ def main():
         st.title("📊 Communication Analytics Dashboard")
         st.markdown("Upload your CSV files and analyze email and call trends across different time periods")
     
+    # Attach results of finished background jobs before the dashboards read session state
+    collect_finished_jobs()
+    show_background_jobs()
+    
     # Create main navigation tabs
     email_tab, calls_tab, combined_tab = st.tabs(["📧 Email Analytics", "📞 Calls Analytics", "📊 Combined Analytics"])
     
@@ -45,6 +85,61 @@ def main():
     
     with combined_tab:
         show_combined_dashboard()
+    
+    # Poll while this session has jobs running (any interaction re-runs sooner)
+    if active_pipeline_jobs():
+        time.sleep(JOB_POLL_SECONDS)
+        st.rerun()
+
+def submit_pipeline_job(kind, label, func, args, context=None):
+    """Start func(job, *args) on the background job runner and track it in this session"""
+    job_id = get_job_runner(JOB_WORKERS).submit(label, func, *args)
+    st.session_state.pipeline_jobs[job_id] = {'kind': kind, 'label': label, 'context': context or {}}
+    st.rerun()
+
+def active_pipeline_jobs(kind=None):
+    """Snapshots of this session's queued or running jobs (optionally of one kind)"""
+    runner = get_job_runner(JOB_WORKERS)
+    snapshots = []
+    for job_id, record in st.session_state.pipeline_jobs.items():
+        job = runner.get(job_id)
+        if job is not None and not job.finished and (kind is None or record['kind'] == kind):
+            snapshots.append(job.snapshot())
+    return snapshots
+
+def collect_finished_jobs():
+    """Attach the results of this session's finished jobs to session state (once per job)"""
+    runner = get_job_runner(JOB_WORKERS)
+    for job_id, record in list(st.session_state.pipeline_jobs.items()):
+        job = runner.get(job_id)
+        if job is None:
+            del st.session_state.pipeline_jobs[job_id]
+            st.warning(f"⚠️ {record['label']}: job result is no longer available, please run it again")
+            continue
+        if not job.finished:
+            continue
+        
+        del st.session_state.pipeline_jobs[job_id]
+        if job.status == 'failed':
+            st.error(f"❌ {record['label']} failed: {job.error}")
+        elif record['kind'] == 'multi_sdr':
+            attach_multi_sdr_result(job.result)
+        elif record['kind'] == 'calls':
+            attach_calls_result(job.result)
+        elif record['kind'] == 'combined':
+            attach_combined_result(job.result, record['context'])
+
+def show_background_jobs():
+    """Progress of this session's running jobs: stage, units done, rows processed"""
+    for snapshot in active_pipeline_jobs():
+        total = snapshot['total'] or 0
+        fraction = min(snapshot['done'] / total, 1.0) if total else 0.0
+        counts = f" · {snapshot['done']} / {total}" if total else ""
+        st.progress(fraction, text=f"⏳ {snapshot['label']}: {snapshot['stage']}{counts} · "
+                                   f"{snapshot['rows_processed']:,} rows · {snapshot['elapsed_seconds']:.0f}s")
+        if snapshot['items']:
+            with st.expander("📋 Progress Details", expanded=True):
+                st.dataframe(pd.DataFrame(snapshot['items']), use_container_width=True, hide_index=True)
 
 def show_email_dashboard():
     """Handle the multi-SDR email analytics dashboard with card-based UI"""
@@ -62,7 +157,7 @@ def show_email_dashboard():
         # Pre-processed vs Upload choice
         data_source = st.radio(
             "Choose data source:",
-            ["📂 Use Pre-processed Data", "📤 Upload Multiple SDR Files"],
+            ["📂 Use Pre-processed Data", "📤 Upload Multiple SDR Files", "🗜️ Bulk Upload (Zip Archive)"],
             index=0,  # Default to demo files
             key="email_data_source"
         )
@@ -195,10 +290,14 @@ def show_email_dashboard():
         with col3:
             if st.button("🚀 Process All SDRs", 
                         type="primary", 
-                        disabled=len(ready_sdrs) == 0,
+                        disabled=len(ready_sdrs) == 0 or bool(active_pipeline_jobs('multi_sdr')),
                         key="process_multi_sdr"):
                 process_multi_sdr_data(ready_sdrs)
     
+    # Main area for bulk (zip) upload
+    if data_source == "🗜️ Bulk Upload (Zip Archive)":
+        show_bulk_sdr_upload()
+    
     # Main email dashboard
     if 'successful_data' in st.session_state:
         show_dashboard()
@@ -236,31 +335,12 @@ def show_calls_dashboard():
             # Single calls file uploader
             calls_file = st.file_uploader("Upload Calls Record CSV", type=['csv'], key='calls_record')
             
-            # Process calls file button
-            if st.button("Process Calls File", type="primary", key="process_calls_file"):
+            # Process calls file button (runs as a background job)
+            calls_running = bool(active_pipeline_jobs('calls'))
+            if st.button("Process Calls File", type="primary", key="process_calls_file", disabled=calls_running):
                 if calls_file:
-                    with st.spinner("Processing calls file..."):
-                        try:
-                            # Process the calls data
-                            is_valid, error_messages, calls_data = st.session_state.calls_processor.process_calls_file(calls_file)
-                            
-                            if is_valid:
-                                # Store in session state (separate from email data)
-                                st.session_state.calls_data = calls_data
-                                
-                                st.success(f"Calls file processed successfully!")
-                                st.info(f"📞 **Processing Summary:**\n"
-                                       f"- Total call records: {len(calls_data):,}\n"
-                                       f"- Required columns: ✅ All present")
-                                
-                                st.rerun()
-                            else:
-                                # Show validation errors
-                                st.error("**Calls File Validation Failed**")
-                                for error in error_messages:
-                                    st.error(error)
-                        except Exception as e:
-                            st.error(f"Error: {str(e)}")
+                    submit_pipeline_job('calls', f"Process {calls_file.name}", calls_job,
+                                        (st.session_state.calls_processor, calls_file))
                 else:
                     st.warning("Please upload a Calls Record CSV file")
     
@@ -643,16 +723,16 @@ def load_demo_data_calls():
         st.info("🔄 Loading pre-processed calls data...")
         
         # Check if processed files exist
-        processed_calls_file = 'data/processed_files/processed_calls_data.csv'
+        processed_calls_file = find_processed_file(PROCESSED_DIR, 'processed_calls_data')
         metadata_file = 'data/processed_files/preprocessing_metadata.json'
         
-        if not os.path.exists(processed_calls_file):
+        if processed_calls_file is None:
             st.error("❌ Pre-processed calls data not found!")
             st.info("🔧 Please run the preprocessing script first: `python preprocess_data.py`")
             return
         
         # Load processed calls data
-        calls_data = pd.read_csv(processed_calls_file)
+        calls_data = read_processed(processed_calls_file, PROCESSED_CALLS_SCHEMA)
         
         # Load metadata if exists
         metadata = {}
@@ -660,16 +740,6 @@ def load_demo_data_calls():
             with open(metadata_file, 'r') as f:
                 metadata = json.load(f)
         
-        # Parse datetime columns if they exist
-        date_columns = ['Date', 'date', 'call_date']  # Common call date column names
-        for col in date_columns:
-            if col in calls_data.columns:
-                try:
-                    calls_data[col] = pd.to_datetime(calls_data[col])
-                    break  # Only convert the first matching column
-                except:
-                    continue
-        
         # Store in session state
         st.session_state.calls_data = calls_data
         
@@ -710,15 +780,20 @@ def load_demo_data_combined():
     
     try:
         # Define pre-processed file paths
-        processed_combined_file = 'data/processed_files/processed_combined_data.csv'
-        processed_email_file = 'data/processed_files/processed_email_data.csv'
-        processed_calls_file = 'data/processed_files/processed_calls_data.csv'
-        contacts_failed_file = 'data/processed_files/contacts_failed_records.csv'
+        processed_combined_file = find_processed_file(PROCESSED_DIR, 'processed_combined_data')
+        processed_email_file = find_processed_file(PROCESSED_DIR, 'processed_email_data')
+        processed_calls_file = find_processed_file(PROCESSED_DIR, 'processed_calls_data')
+        contacts_failed_file = find_processed_file(PROCESSED_DIR, 'contacts_failed_records')
         metadata_file = 'data/processed_files/preprocessing_metadata.json'
         
         # Check if pre-processed files exist
-        required_files = [processed_combined_file, processed_email_file, processed_calls_file, metadata_file]
-        missing_files = [f for f in required_files if not os.path.exists(f)]
+        required_files = {
+            'processed_combined_data': processed_combined_file,
+            'processed_email_data': processed_email_file,
+            'processed_calls_data': processed_calls_file,
+            metadata_file: metadata_file if os.path.exists(metadata_file) else None
+        }
+        missing_files = [name for name, path in required_files.items() if path is None]
         
         if missing_files:
             st.error(f"❌ Pre-processed files not found: {', '.join(missing_files)}")
@@ -731,37 +806,20 @@ def load_demo_data_combined():
                 preprocessing_metadata = json.load(f)
             
             # Load pre-processed combined data
-            combined_data = pd.read_csv(processed_combined_file)
+            # Load combined, email, calls and failed records concurrently
+            # (processed files come back with their date columns as datetime)
+            frames, load_timings, load_seconds = load_processed_files({
+                'combined': (processed_combined_file, PROCESSED_EMAIL_SCHEMA),
+                'email': (processed_email_file, PROCESSED_EMAIL_SCHEMA),
+                'calls': (processed_calls_file, PROCESSED_CALLS_SCHEMA),
+                'failed': (contacts_failed_file, PROCESSED_EMAIL_SCHEMA)
+            }, executor=LOAD_EXECUTOR)
+            combined_data = frames['combined']
+            email_data = frames['email']
+            calls_data = frames['calls']
             
-            # Load individual email and calls data for context
-            email_data = pd.read_csv(processed_email_file)
-            calls_data = pd.read_csv(processed_calls_file)
-            
-            # Convert date columns to datetime for all datasets
-            for df in [combined_data, email_data]:
-                if 'sent_date' in df.columns:
-                    df['sent_date'] = pd.to_datetime(df['sent_date'], errors='coerce')
-                if 'last_opened' in df.columns:
-                    df['last_opened'] = pd.to_datetime(df['last_opened'], errors='coerce')
-            
-            # Convert date columns for calls data
-            date_columns = ['Date', 'date', 'call_date']
-            for col in date_columns:
-                if col in calls_data.columns:
-                    calls_data[col] = pd.to_datetime(calls_data[col], errors='coerce')
-                    break
-            
-            # Load failed contacts records if exists
-            failed_data = None
-            if os.path.exists(contacts_failed_file):
-                failed_data = pd.read_csv(contacts_failed_file)
-                # Convert date columns for failed data too
-                if 'sent_date' in failed_data.columns:
-                    failed_data['sent_date'] = pd.to_datetime(failed_data['sent_date'], errors='coerce')
-                if 'last_opened' in failed_data.columns:
-                    failed_data['last_opened'] = pd.to_datetime(failed_data['last_opened'], errors='coerce')
-            else:
-                failed_data = pd.DataFrame()
+            # Failed contacts records are optional
+            failed_data = frames.get('failed', pd.DataFrame())
                 
             # Store in session state
             st.session_state.successful_data = email_data
@@ -817,6 +875,7 @@ def load_demo_data_combined():
             st.info(f"📧 **Email**: {len(email_data):,} records | 📞 **Calls**: {len(calls_data):,} records")
             st.info(f"🔗 **Combined**: {len(combined_data):,} records ({join_stats['joined_records']} with calls, {join_stats['email_only_records']} email-only)")
             st.caption(f"🕒 Processed on: {processing_date}")
+            st.caption(f"⏱️ Loaded in {load_seconds:.2f}s: " + ", ".join(f"{key} {seconds:.2f}s" for key, seconds in load_timings.items()))
                 
             st.rerun()
                         
@@ -830,33 +889,22 @@ def load_demo_data_multi_sdr():
         st.info("🔄 Loading pre-processed demo data...")
         
         # Check if processed files exist
-        processed_email_file = 'data/processed_files/processed_email_data.csv'
-        contacts_failed_file = 'data/processed_files/contacts_failed_records.csv'
+        processed_email_file = find_processed_file(PROCESSED_DIR, 'processed_email_data')
+        contacts_failed_file = find_processed_file(PROCESSED_DIR, 'contacts_failed_records')
         metadata_file = 'data/processed_files/preprocessing_metadata.json'
         
-        if not os.path.exists(processed_email_file):
+        if processed_email_file is None:
             st.error("❌ Pre-processed email data not found!")
             st.info("🔧 Please run the preprocessing script first: `python preprocess_data.py`")
             return
         
-        # Load processed email data
-        successful_data = pd.read_csv(processed_email_file)
-        
-        # Convert date columns to datetime for proper filtering
-        if 'sent_date' in successful_data.columns:
-            successful_data['sent_date'] = pd.to_datetime(successful_data['sent_date'], errors='coerce')
-        if 'last_opened' in successful_data.columns:
-            successful_data['last_opened'] = pd.to_datetime(successful_data['last_opened'], errors='coerce')
-        
-        # Load failed data if exists
-        failed_data = pd.DataFrame()
-        if os.path.exists(contacts_failed_file):
-            failed_data = pd.read_csv(contacts_failed_file)
-            # Convert date columns to datetime for failed data too
-            if 'sent_date' in failed_data.columns:
-                failed_data['sent_date'] = pd.to_datetime(failed_data['sent_date'], errors='coerce')
-            if 'last_opened' in failed_data.columns:
-                failed_data['last_opened'] = pd.to_datetime(failed_data['last_opened'], errors='coerce')
+        # Load processed email data and failed records concurrently (date columns come back as datetime for filtering)
+        frames, load_timings, load_seconds = load_processed_files({
+            'email': (processed_email_file, PROCESSED_EMAIL_SCHEMA),
+            'failed': (contacts_failed_file, PROCESSED_EMAIL_SCHEMA)
+        }, executor=LOAD_EXECUTOR)
+        successful_data = frames['email']
+        failed_data = frames.get('failed', pd.DataFrame())
         
         # Load metadata if exists
         metadata = {}
@@ -865,12 +913,6 @@ def load_demo_data_multi_sdr():
             with open(metadata_file, 'r') as f:
                 metadata = json.load(f)
         
-        # Parse datetime columns
-        if 'sent_date' in successful_data.columns:
-            successful_data['sent_date'] = pd.to_datetime(successful_data['sent_date'])
-        if len(failed_data) > 0 and 'sent_date' in failed_data.columns:
-            failed_data['sent_date'] = pd.to_datetime(failed_data['sent_date'])
-        
         # Store in session state
         st.session_state.successful_data = successful_data
         st.session_state.failed_data = failed_data
@@ -924,6 +966,8 @@ def load_demo_data_multi_sdr():
             processing_date = metadata['processing_date'][:19].replace('T', ' ')  # Format datetime
             processing_info.append(f"- Processed on: {processing_date}")
         
+        processing_info.append(f"- Loaded in {load_seconds:.2f}s (" + ", ".join(f"{key} {seconds:.2f}s" for key, seconds in load_timings.items()) + ")")
+        
         st.info("📊 **Processing Summary:**\n" + "\n".join(processing_info))
         
         st.rerun()
@@ -932,97 +976,137 @@ def load_demo_data_multi_sdr():
         st.error(f"Error loading pre-processed demo data: {str(e)}")
         st.info("💡 Make sure to run: `python preprocess_data.py` first")
 
-def process_multi_sdr_data(ready_sdrs):
-    """Process multiple SDR files individually then combine"""
-    with st.spinner("🔄 Processing SDR data..."):
-        try:
-            all_send_open_successful = []
-            all_send_open_failed = []
-            processing_log = []
-            
-            # Step 1: Process each SDR individually (Send-Open join only)
-            for idx, sdr_info in enumerate(ready_sdrs):
-                sdr_name = sdr_info['name']
-                processing_log.append(f"Processing SDR {idx + 1}: {sdr_name}...")
-                
-                # Process this SDR's Send-Open join
-                send_open_successful, send_open_failed, errors = st.session_state.data_processor.process_single_sdr(
-                    sdr_info['send_file'],
-                    sdr_info['open_file'], 
-                    sdr_name
-                )
-                
-                if send_open_successful is not None:
-                    all_send_open_successful.append(send_open_successful)
-                    if send_open_failed is not None and len(send_open_failed) > 0:
-                        all_send_open_failed.append(send_open_failed)
-                    
-                    processing_log.append(f"✅ {sdr_name}: {len(send_open_successful)} Send-Open joined, {len(send_open_failed) if send_open_failed is not None else 0} failed")
-                else:
-                    processing_log.append(f"❌ {sdr_name}: Failed - {', '.join(errors)}")
-            
-            # Step 2: Combine all SDRs' Send-Open data
-            if all_send_open_successful:
-                combined_send_open = pd.concat(all_send_open_successful, ignore_index=True)
-                combined_send_open_failed = pd.concat(all_send_open_failed, ignore_index=True) if all_send_open_failed else pd.DataFrame()
-                
-                processing_log.append(f"📊 Combined {len(all_send_open_successful)} SDRs: {len(combined_send_open)} total Send-Open records")
-                
-                # Step 3: Join combined data with contacts
-                final_successful, contacts_failed, errors = st.session_state.data_processor.process_multi_sdr_combined(
-                    combined_send_open
-                )
-                
-                if final_successful is not None:
-                    # Combine all failed records
-                    all_failed_list = []
-                    if len(combined_send_open_failed) > 0:
-                        all_failed_list.append(combined_send_open_failed)
-                    if contacts_failed is not None and len(contacts_failed) > 0:
-                        all_failed_list.append(contacts_failed)
-                    
-                    all_failed = pd.concat(all_failed_list, ignore_index=True) if all_failed_list else pd.DataFrame()
-                    
-                    # Store in session state
-                    st.session_state.successful_data = final_successful
-                    st.session_state.failed_data = all_failed
-                    st.session_state.original_send_count = len(combined_send_open) + len(combined_send_open_failed)
-                    st.session_state.multi_sdr_processing_log = processing_log
-                    
-                    processing_log.append(f"✅ Final: {len(final_successful)} records with contacts, {len(all_failed)} total failed")
-                    
-                    # Show summary
-                    st.success(f"✅ Successfully processed {len(all_send_open_successful)} SDRs!")
-                    
-                    # Show detailed log
-                    with st.expander("📋 Processing Details", expanded=True):
-                        for log_entry in processing_log:
-                            if "✅" in log_entry:
-                                st.success(log_entry)
-                            elif "❌" in log_entry:
-                                st.error(log_entry)
-                            else:
-                                st.info(log_entry)
-                    
-                    # Summary metrics
-                    col1, col2, col3, col4 = st.columns(4)
-                    with col1:
-                        st.metric("SDRs Processed", len(all_send_open_successful))
-                    with col2:
-                        st.metric("Total Records", len(final_successful) + len(all_failed))
-                    with col3:
-                        st.metric("Successful", len(final_successful))
-                    with col4:
-                        st.metric("Failed", len(all_failed))
-                    
-                    st.rerun()
-                else:
-                    st.error(f"Failed to join with contacts: {', '.join(errors)}")
+def process_multi_sdr_data(ready_sdrs, executor=SDR_EXECUTOR, jobs=SDR_JOBS, use_result_store=True, label=None, work_dir=None):
+    """
+    Process multiple SDR files individually then combine, as a background job
+    (unchanged SDR cards reuse their previous Send-Open join result). The job
+    removes work_dir, if given, when it ends.
+    """
+    result_store = st.session_state.sdr_result_store if use_result_store else None
+    submit_pipeline_job('multi_sdr', label or f"Process {len(ready_sdrs)} SDR(s)", multi_sdr_job,
+                        (st.session_state.data_processor, list(ready_sdrs), executor, jobs, result_store, work_dir))
+
+def attach_multi_sdr_result(result):
+    """Store a finished multi-SDR job's data in session state and show its processing log"""
+    processing_log = result['processing_log']
+    if result['error'] is None:
+        st.session_state.successful_data = result['successful_data']
+        st.session_state.failed_data = result['failed_data']
+        st.session_state.original_send_count = result['original_send_count']
+        st.session_state.multi_sdr_processing_log = processing_log
+        st.success(f"✅ Successfully processed {result['sdr_count']} SDRs!")
+    else:
+        st.error(result['error'])
+    
+    with st.expander("📋 Processing Details", expanded=result['error'] is not None):
+        for log_entry in processing_log:
+            if "✅" in log_entry:
+                st.success(log_entry)
+            elif "❌" in log_entry:
+                st.error(log_entry)
             else:
-                st.error("No SDR Send-Open joins were successful")
-                
-        except Exception as e:
-            st.error(f"Error processing SDR data: {str(e)}")
+                st.info(log_entry)
+
+def attach_calls_result(result):
+    """Store a finished calls job's data in session state, or show its validation errors"""
+    if result['is_valid']:
+        # Store in session state (separate from email data)
+        st.session_state.calls_data = result['calls_data']
+        st.success(f"Calls file processed successfully! 📞 {len(result['calls_data']):,} call records")
+    else:
+        st.error("**Calls File Validation Failed**")
+        for error in result['error_messages']:
+            st.error(error)
+
+def attach_combined_result(result, context):
+    """Store a finished email-calls join in the combined session state"""
+    join_stats = result['join_stats']
+    if result['joined_data'] is None:
+        st.error(f"❌ Failed to join email and calls data: {join_stats.get('error', 'Unknown error')}")
+        return
+    
+    email_failed = context['email_failed']
+    st.session_state.combined_joined_data = result['joined_data']  # This is the main combined data
+    st.session_state.combined_email_only_data = result['email_only_data']
+    st.session_state.combined_calls_only_data = result['calls_only_data']
+    st.session_state.combined_join_stats = join_stats
+    st.session_state.combined_email_failed = email_failed
+    
+    # Create metadata from joined data
+    metadata = {
+        'email_total': context['email_count'] + len(email_failed),
+        'email_successful': context['email_count'],
+        'email_failed': len(email_failed),
+        'calls_total': context['calls_count'],
+        'joined_records': join_stats['joined_records'],
+        'email_only_records': join_stats['email_only_records'],
+        'calls_only_records': join_stats['calls_only_records'],
+        'join_success_rate': join_stats['join_success_rate'],
+        'processing_timestamp': datetime.now().isoformat(),
+        'data_source': 'joined_from_other_tabs'
+    }
+    st.session_state.combined_metadata = metadata
+    
+    st.success(f"Combined analytics created successfully with email-calls join! "
+               f"🔗 {join_stats['joined_records']:,} email records with calls "
+               f"({join_stats['join_success_rate']:.1f}% join success rate)")
+
+def show_bulk_sdr_upload():
+    """Bulk mode: one zip of {sdr}_send.csv / {sdr}_open.csv pairs, extracted to disk"""
+    st.header("🗜️ Bulk SDR Upload")
+    st.info("Upload one zip with a `{sdr}_send.csv` and `{sdr}_open.csv` file per SDR. "
+            "Files are extracted to a temporary folder and joined by a worker pool.")
+    
+    archive = st.file_uploader("📦 SDR files (zip)", type=['zip'], key="bulk_sdr_archive")
+    bulk = st.session_state.get('bulk_sdr_archive_data')
+    if archive is None:
+        # Uploader cleared: drop the extracted files this session still owns
+        if bulk is not None:
+            discard_bulk_archive(bulk)
+            del st.session_state.bulk_sdr_archive_data
+        return
+    
+    # Extract once per uploaded archive (the script re-runs on every interaction)
+    archive_key = (archive.name, archive.size, getattr(archive, 'file_id', None))
+    if bulk is None or bulk['archive_key'] != archive_key:
+        if bulk is not None:
+            discard_bulk_archive(bulk)
+        try:
+            sdr_configs, warnings, directory = extract_sdr_archive(archive)
+        except zipfile.BadZipFile:
+            st.error("❌ The uploaded file is not a valid zip archive")
+            return
+        bulk = {'archive_key': archive_key, 'sdr_configs': sdr_configs, 'warnings': warnings, 'directory': directory}
+        st.session_state.bulk_sdr_archive_data = bulk
+    
+    sdr_configs = bulk['sdr_configs']
+    if bulk['warnings']:
+        with st.expander(f"⚠️ {len(bulk['warnings'])} archive entries skipped", expanded=False):
+            for warning in bulk['warnings']:
+                st.warning(warning)
+    if not sdr_configs:
+        st.error("❌ No complete {sdr}_send.csv / {sdr}_open.csv pairs found in the archive")
+        return
+    
+    st.success(f"📊 {len(sdr_configs)} SDR(s) found in {archive.name}")
+    # Joined by a worker pool in a background job, with a per-SDR progress table
+    if st.button("🚀 Process Archive", type="primary", key="process_bulk_sdr",
+                 disabled=bool(active_pipeline_jobs('multi_sdr'))):
+        if bulk['directory'] is None:
+            # An earlier run removed its extracted files: extract the archive again
+            archive.seek(0)
+            bulk['sdr_configs'], _, bulk['directory'] = extract_sdr_archive(archive)
+        # The job owns the extracted files from here on and removes them when it ends
+        sdr_configs, directory = bulk['sdr_configs'], bulk['directory']
+        bulk['directory'] = None
+        process_multi_sdr_data(sdr_configs, executor=BULK_EXECUTOR, jobs=BULK_JOBS, use_result_store=False,
+                               label=f"Bulk archive {archive.name}: {len(sdr_configs)} SDR(s)", work_dir=directory)
+
+def discard_bulk_archive(bulk):
+    """Remove an extracted bulk archive unless a job has taken over its files"""
+    if bulk['directory'] is not None:
+        shutil.rmtree(bulk['directory'], ignore_errors=True)
+        bulk['directory'] = None
 
 def show_multi_sdr_welcome():
     """Show welcome message for multi-SDR mode"""
@@ -2108,64 +2192,18 @@ def show_combined_dashboard():
                 st.success("🎉 Both Email and Calls data are available!")
                 st.markdown("**Ready to create combined analytics**")
                 
-                if st.button("🚀 Create Combined Analytics", type="primary", key="create_combined"):
-                    with st.spinner("Creating combined analytics from existing data..."):
-                        try:
-                            # Use existing processed data instead of reprocessing files
-                            email_data = st.session_state.successful_data  # Final processed email data
-                            calls_data = st.session_state.calls_data       # Processed calls data
-                            email_failed = st.session_state.get('failed_data', pd.DataFrame())
-                            
-                            # Perform the email-calls join
-                            joined_data, email_only_data, calls_only_data, join_stats = st.session_state.combined_processor.join_email_calls(
-                                email_data, calls_data
-                            )
-                            
-                            if joined_data is not None:
-                                # Store joined data in combined session state
-                                st.session_state.combined_joined_data = joined_data  # This is the main combined data
-                                st.session_state.combined_email_only_data = email_only_data
-                                st.session_state.combined_calls_only_data = calls_only_data
-                                st.session_state.combined_join_stats = join_stats
-                                st.session_state.combined_email_failed = email_failed
-                                
-                                # Create metadata from joined data
-                                metadata = {
-                                    'email_total': len(email_data) + len(email_failed),
-                                    'email_successful': len(email_data),
-                                    'email_failed': len(email_failed),
-                                    'calls_total': len(calls_data),
-                                    'joined_records': join_stats['joined_records'],
-                                    'email_only_records': join_stats['email_only_records'],
-                                    'calls_only_records': join_stats['calls_only_records'],
-                                    'join_success_rate': join_stats['join_success_rate'],
-                                    'processing_timestamp': datetime.now().isoformat(),
-                                    'data_source': 'joined_from_other_tabs'
-                                }
-                                st.session_state.combined_metadata = metadata
-                                
-                                st.success("Combined analytics created successfully with email-calls join!")
-                            
-                                # Show join summary
-                                st.info(f"🔗 **Email-Calls Join Results:**\n"
-                                       f"- Email records with calls: {join_stats['joined_records']:,}\n"
-                                       f"- Email only (no calls): {join_stats['email_only_records']:,}\n"
-                                       f"- Calls only (no emails): {join_stats['calls_only_records']:,}\n"
-                                       f"- Join success rate: {join_stats['join_success_rate']:.1f}%")
-                                
-                                st.info(f"📧 **Original Email Data:**\n"
-                                       f"- Total email records: {len(email_data):,}\n"
-                                       f"- Failed email records: {len(email_failed):,}")
-                                
-                                st.info(f"📞 **Original Calls Data:**\n"
-                                       f"- Total call records: {len(calls_data):,}")
-                                
-                                st.rerun()
-                            else:
-                                st.error(f"❌ Failed to join email and calls data: {join_stats.get('error', 'Unknown error')}")
-                        
-                        except Exception as e:
-                            st.error(f"Error creating combined analytics: {str(e)}")
+                if st.button("🚀 Create Combined Analytics", type="primary", key="create_combined",
+                             disabled=bool(active_pipeline_jobs('combined'))):
+                    # Use existing processed data instead of reprocessing files
+                    email_data = st.session_state.successful_data  # Final processed email data
+                    calls_data = st.session_state.calls_data       # Processed calls data
+                    email_failed = st.session_state.get('failed_data', pd.DataFrame())
+                    
+                    # Perform the email-calls join in a background job
+                    submit_pipeline_job('combined', "Create combined analytics", combined_join_job,
+                                        (st.session_state.combined_processor, email_data, calls_data),
+                                        context={'email_count': len(email_data), 'calls_count': len(calls_data),
+                                                 'email_failed': email_failed})
             
             elif email_processed:
                 # Only email available
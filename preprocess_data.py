@@ -4,28 +4,68 @@ Pre-process SDR email and calls data files for dashboard.
 Run this script to generate processed data files for production dashboard.
 
 Usage:
-    python preprocess_data.py
+    python preprocess_data.py [--jobs N] [--executor {serial,thread,process}] [--join-shards N] [--incremental]
+                              [--streaming] [--explode-open-recipients] [--csv-engine {auto,pyarrow,c}]
+                              [--output-format {parquet,feather,csv}] [--force]
+
+    --jobs N         Number of workers for the per-SDR Send-Open joins (default: 1, 0 = one per CPU)
+    --executor       How per-SDR joins run when --jobs > 1 (default: process)
+    --join-shards N  Split each SDR's Send-Open join into N recipient hash shards
+                     matched in worker processes (default: 1, for very large exports)
+    --incremental    Keep per-SDR join state in data/processed_files/join_state and
+                     only match rows added since the previous run
+    --streaming      Join each SDR's files in chunks through on-disk time buckets, for
+                     exports larger than memory, writing the per-SDR joins to
+                     data/processed_files/send_open/{sdr_name}_send_open.csv
+                     (not combined with --incremental or --join-shards). Rows come
+                     in time-bucket order, so Company URL IDs are numbered in it
+    --explode-open-recipients
+                     Match every recipient of a multi-recipient Open row ("A,B,C")
+                     instead of only the first one (Views / Clicks / PDF views are
+                     counted once, on the first recipient's Open; the others get 0)
+    --csv-engine     CSV parser for full-file reads: pyarrow's multithreaded reader when
+                     installed (auto: for files of 4 MiB or more), or the pandas C parser
+                     (default: c)
+    --output-format  Storage format of the processed files: Parquet / Feather keep dates,
+                     categoricals and numbers typed for the dashboard, CSV is a plain
+                     export (default: parquet when pyarrow is installed, otherwise csv)
+    --force          Reprocess every stage, ignoring the input manifest
+
+Only stages whose inputs changed since the previous run are reprocessed: the
+input manifest records each input file's size, mtime and content hash, and the
+per-SDR Send-Open joins, contacts join, calls and combined outputs are stored
+under data/processed_files/stages/. A changed rep's files re-run that SDR's
+join; the contacts and combined joins re-run only if an upstream output changed.
 
 Input Files (in data/ folder):
 - Email: {sdr_name}_send.csv, {sdr_name}_open.csv (e.g., himanshu_send.csv, himanshu_open.csv)
 - Calls: calls_data.csv
 - Contacts: contacts.csv
 
-Output Files (in data/processed_files/):
-- processed_email_data.csv
-- contacts_failed_records.csv  
-- processed_calls_data.csv
+Output Files (in data/processed_files/, .parquet / .feather / .csv per --output-format):
+- processed_email_data
+- contacts_failed_records
+- processed_calls_data
+- processed_combined_data
 - preprocessing_metadata.json
+- input_manifest.json (input fingerprints and stage output digests)
+- send_open/{sdr_name}_send_open.csv (per-SDR Send-Open joins, --streaming only)
 """
 
 import pandas as pd
 import os
 import glob
 import json
+import argparse
 from datetime import datetime
 from src.data_processor import DataProcessor
 from src.calls_processor import CallsProcessor
 from src.combined_processor import CombinedProcessor
+from src.executors import run_sdr_joins, EXECUTOR_MODES
+from src.csv_loader import set_csv_engine, CSV_ENGINES
+from src.read_schema import build_read_schema, read_csv_with_schema
+from src.processed_store import OUTPUT_FORMATS, resolve_output_format, write_processed, processed_file_name
+from src.input_manifest import InputManifest, stage_key, output_digest
 import logging
 
 # Setup logging
@@ -35,6 +75,40 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Per-SDR Send-Open join state for --incremental runs
+JOIN_STATE_DIR = 'data/processed_files/join_state'
+# Per-SDR Send-Open joins written by --streaming runs
+STREAMING_DIR = 'data/processed_files/send_open'
+# Cleaned contacts frame and email index, reused while data/contacts.csv is unchanged
+CONTACTS_CACHE_DIR = 'data/processed_files/cache'
+CONTACTS_FILE = 'data/contacts.csv'
+CALLS_FILE = 'data/calls_data.csv'
+
+# Manifest stage each processed dataset comes from (unchanged datasets are not rewritten)
+OUTPUT_STAGES = {'email_data': 'email', 'contacts_failed': 'email', 'calls_data': 'calls', 'combined_data': 'combined'}
+
+def run_stage(manifest, stage, key, compute, output_frames):
+    """
+    Run a preprocessing stage, or load its stored output when the manifest has it for key
+    
+    Args:
+        manifest: InputManifest (None = always compute, nothing stored)
+        stage: Stage name
+        key: stage_key of everything the output depends on
+        compute: Callable producing the output
+        output_frames: Callable giving the output's frames to digest, or None for a failed run (not stored)
+    """
+    if manifest is None:
+        return compute()
+    stored = manifest.load(stage, key)
+    if stored is not None:
+        return stored[0]
+    output = compute()
+    frames = output_frames(output)
+    if frames is not None:
+        manifest.store(stage, key, output, output_digest(*frames))
+    return output
+
 def scan_sdr_files():
     """
     Scan data/ folder for SDR files with naming convention: {sdr_name}_send.csv, {sdr_name}_open.csv
@@ -70,10 +144,25 @@ def scan_sdr_files():
     logger.info(f"Found {len(sdr_configs)} complete SDR file pairs")
     return sdr_configs
 
-def process_email_data():
+def load_streamed_join(sdr_result):
+    """Send-Open join a --streaming SDR run wrote to its output file, typed like the processed email data"""
+    successful, _ = read_csv_with_schema(sdr_result['output_file'], build_read_schema('processed_email'))
+    return dict(sdr_result, successful=successful, failed=pd.DataFrame())
+
+def process_email_data(jobs=1, executor='process', join_shards=1, incremental=False, explode_open_recipients=False,
+                       manifest=None, streaming=False):
     """
     Process email data using existing multi-SDR logic
     
+    Args:
+        jobs: Number of workers for the per-SDR Send-Open joins
+        executor: 'serial', 'thread' or 'process'
+        join_shards: Recipient hash shards per SDR join (1 = no sharding)
+        incremental: Reuse persisted per-SDR join state and only match new rows
+        explode_open_recipients: One Open event per recipient of multi-recipient Open rows
+        manifest: InputManifest; SDRs with unchanged files reuse their stored join
+        streaming: Stream each SDR's join to STREAMING_DIR and read it back for the contacts join
+    
     Returns:
         tuple: (successful_df, failed_df, processing_stats)
     """
@@ -88,7 +177,15 @@ def process_email_data():
         logger.error("No SDR files found! Please ensure files follow naming convention: {sdr_name}_send.csv, {sdr_name}_open.csv")
         return None, None, None
     
-    processor = DataProcessor()
+    if streaming:
+        os.makedirs(STREAMING_DIR, exist_ok=True)
+        for sdr_config in sdr_configs:
+            sdr_config['output_file'] = os.path.join(STREAMING_DIR, f"{sdr_config['name']}_send_open.csv")
+    
+    join_state_dir = JOIN_STATE_DIR if incremental else None
+    open_recipient_mode = 'explode' if explode_open_recipients else 'first'
+    processor = DataProcessor(join_shards=join_shards, join_state_dir=join_state_dir, contacts_cache_dir=CONTACTS_CACHE_DIR,
+                              open_recipient_mode=open_recipient_mode)
     all_send_open_successful = []
     all_send_open_failed = []
     sdr_stats = {}
@@ -96,16 +193,33 @@ def process_email_data():
     # Step 1: Process each SDR individually (Send-Open join only)
     logger.info(f"Step 1: Processing {len(sdr_configs)} SDRs individually...")
     
-    for config in sdr_configs:
-        sdr_name = config['name']
-        logger.info(f"Processing SDR: {sdr_name}")
-        
-        # Process this SDR's Send-Open join
-        send_open_successful, send_open_failed, errors = processor.process_single_sdr(
-            config['send_file'],
-            config['open_file'], 
-            sdr_name
-        )
+    # SDRs whose Send and Open files are unchanged reuse their stored join
+    sdr_results = [None] * len(sdr_configs)
+    sdr_keys = {}
+    if manifest is not None:
+        for position, sdr_config in enumerate(sdr_configs):
+            sdr_keys[position] = stage_key(sdr_config['name'], manifest.file_hash(sdr_config['send_file']),
+                                           manifest.file_hash(sdr_config['open_file']), open_recipient_mode, streaming)
+            stored = manifest.load(f"sdr_{sdr_config['name']}", sdr_keys[position])
+            if stored is not None:
+                sdr_results[position] = stored[0]
+    stale = [position for position, sdr_result in enumerate(sdr_results) if sdr_result is None]
+    
+    # SDRs are independent until the contacts join; results come back in scan order
+    fresh_results = run_sdr_joins(processor, [sdr_configs[position] for position in stale], executor=executor, jobs=jobs)
+    for position, sdr_result in zip(stale, fresh_results):
+        if sdr_result.get('output_file') and not sdr_result['errors']:
+            sdr_result = load_streamed_join(sdr_result)
+        sdr_results[position] = sdr_result
+        if manifest is not None and sdr_result['successful'] is not None:
+            manifest.store(f"sdr_{sdr_result['name']}", sdr_keys[position], sdr_result,
+                           output_digest(sdr_result['successful'], sdr_result['failed']))
+    
+    for sdr_result in sdr_results:
+        sdr_name = sdr_result['name']
+        send_open_successful = sdr_result['successful']
+        send_open_failed = sdr_result['failed']
+        errors = sdr_result['errors']
         
         if send_open_successful is not None:
             all_send_open_successful.append(send_open_successful)
@@ -116,10 +230,11 @@ def process_email_data():
             sdr_stats[sdr_name] = {
                 'total_send': len(send_open_successful) + (len(send_open_failed) if send_open_failed is not None else 0),
                 'joined': len(send_open_successful),
-                'failed': len(send_open_failed) if send_open_failed is not None else 0
+                'failed': len(send_open_failed) if send_open_failed is not None else 0,
+                'memory': sdr_result['memory_stats']
             }
             
-            logger.info(f"  ✅ {sdr_name}: {len(send_open_successful)} Send-Open joined, {len(send_open_failed) if send_open_failed is not None else 0} failed")
+            logger.info(f"  ✅ {sdr_name}: {len(send_open_successful)} Send-Open joined, {len(send_open_failed) if send_open_failed is not None else 0} failed ({sdr_result['elapsed_seconds']:.2f}s)")
         else:
             logger.error(f"  ❌ {sdr_name}: Failed - {', '.join(errors)}")
             sdr_stats[sdr_name] = {'error': ', '.join(errors)}
@@ -134,10 +249,23 @@ def process_email_data():
     
     logger.info(f"Step 2: Combined {len(all_send_open_successful)} SDRs into {len(combined_send_open)} total Send-Open records")
     
-    # Step 3: Join combined data with contacts
+    # Step 3: Join combined data with contacts (re-run only if an SDR's output or the contacts changed)
     logger.info("Step 3: Joining combined data with contacts...")
     
-    final_successful, contacts_failed, errors = processor.process_multi_sdr_combined(combined_send_open)
+    def join_contacts():
+        final_successful, contacts_failed, errors = processor.process_multi_sdr_combined(combined_send_open, CONTACTS_FILE)
+        return final_successful, contacts_failed, errors, processor.last_memory_stats
+    
+    contacts_key = None
+    if manifest is not None:
+        sdr_digests = [(sdr_result['name'], manifest.digest(f"sdr_{sdr_result['name']}"))
+                       for sdr_result in sdr_results if sdr_result['successful'] is not None]
+        contacts_hash = manifest.file_hash(CONTACTS_FILE) if os.path.exists(CONTACTS_FILE) else None
+        contacts_key = stage_key(sdr_digests, contacts_hash, open_recipient_mode, streaming)
+    final_successful, contacts_failed, errors, contacts_memory = run_stage(
+        manifest, 'email', contacts_key, join_contacts,
+        lambda output: output[:2] if output[0] is not None else None
+    )
     
     if final_successful is not None:
         logger.info(f"  ✅ Contacts join: {len(final_successful)} successful, {len(contacts_failed) if contacts_failed is not None else 0} failed")
@@ -148,7 +276,8 @@ def process_email_data():
             'contacts_join_stats': {
                 'total_send_open_records': len(combined_send_open),
                 'successful_contacts_join': len(final_successful),
-                'failed_contacts_join': len(contacts_failed) if contacts_failed is not None else 0
+                'failed_contacts_join': len(contacts_failed) if contacts_failed is not None else 0,
+                'memory': contacts_memory
             }
         }
         
@@ -157,9 +286,10 @@ def process_email_data():
         logger.error(f"Failed to join with contacts: {', '.join(errors)}")
         return None, None, sdr_stats
 
-def process_combined_data(email_data, calls_data):
+def process_combined_data(email_data, calls_data, manifest=None):
     """
     Process combined email and calls data by joining them
+    (re-run only if the email or calls output changed, per manifest)
     
     Returns:
         tuple: (combined_df, processing_stats)
@@ -174,6 +304,12 @@ def process_combined_data(email_data, calls_data):
     
     logger.info(f"Combining {len(email_data)} email records with {len(calls_data)} call records...")
     
+    combined_key = stage_key(manifest.digest('email'), manifest.digest('calls')) if manifest is not None else None
+    return run_stage(manifest, 'combined', combined_key, lambda: _join_email_calls(email_data, calls_data),
+                     lambda output: (output[0],) if output[0] is not None else None)
+
+def _join_email_calls(email_data, calls_data):
+    """Email-calls join of process_combined_data"""
     processor = CombinedProcessor()
     
     try:
@@ -202,9 +338,10 @@ def process_combined_data(email_data, calls_data):
         logger.error(f"Error processing combined data: {str(e)}")
         return None, {'error': str(e)}
 
-def process_calls_data():
+def process_calls_data(manifest=None):
     """
     Process calls data using existing CallsProcessor logic
+    (skipped when the calls file is unchanged, per manifest)
     
     Returns:
         tuple: (calls_df, processing_stats)
@@ -213,7 +350,7 @@ def process_calls_data():
     logger.info("PROCESSING CALLS DATA")
     logger.info("=" * 60)
     
-    calls_file = 'data/calls_data.csv'
+    calls_file = CALLS_FILE
     
     if not os.path.exists(calls_file):
         logger.warning(f"Calls file not found: {calls_file}")
@@ -221,6 +358,12 @@ def process_calls_data():
     
     logger.info(f"Processing calls file: {calls_file}")
     
+    calls_key = stage_key(manifest.file_hash(calls_file)) if manifest is not None else None
+    return run_stage(manifest, 'calls', calls_key, lambda: _process_calls_file(calls_file),
+                     lambda output: (output[0],) if output[0] is not None else None)
+
+def _process_calls_file(calls_file):
+    """CallsProcessor run of process_calls_data"""
     processor = CallsProcessor()
     
     try:
@@ -233,7 +376,9 @@ def process_calls_data():
             stats = {
                 'total_records': len(calls_data),
                 'successful': True,
-                'errors': calls_errors if calls_errors else []
+                'errors': calls_errors if calls_errors else [],
+                'encoding': processor.last_load_stats.get('encoding'),
+                'encoding_detection_seconds': processor.last_load_stats.get('encoding_detection_seconds')
             }
             
             return calls_data, stats
@@ -253,38 +398,54 @@ def create_output_directory():
         logger.info(f"Created output directory: {output_dir}")
     return output_dir
 
-def save_results(email_successful, email_failed, email_stats, calls_data, calls_stats, combined_data, combined_stats):
+def save_results(email_successful, email_failed, email_stats, calls_data, calls_stats, combined_data, combined_stats,
+                 output_format='csv', unchanged=(), stages=None):
     """
-    Save all processed results to output files
+    Save all processed results to output files (output_format: one of OUTPUT_FORMATS)
+    
+    Args:
+        unchanged: Output names (OUTPUT_STAGES keys) identical to the files already saved; not rewritten
+        stages: Manifest stage summary for the metadata ({'computed': [...], 'reused': [...]})
     """
     logger.info("=" * 60)
     logger.info("SAVING RESULTS")
     logger.info("=" * 60)
     
     output_dir = create_output_directory()
+    email_schema = build_read_schema('processed_email')
+    output_files = {'email_data': None, 'contacts_failed': None, 'calls_data': None, 'combined_data': None}
+    
+    # Keep unchanged outputs already saved in this format
+    for output_name, dataset_name in [('email_data', 'processed_email_data'), ('contacts_failed', 'contacts_failed_records'),
+                                      ('calls_data', 'processed_calls_data'), ('combined_data', 'processed_combined_data')]:
+        file_name = processed_file_name(dataset_name, output_format)
+        if output_name in unchanged and os.path.exists(os.path.join(output_dir, file_name)):
+            output_files[output_name] = file_name
+            logger.info(f"⏭️ {file_name} is unchanged, not rewritten")
     
     # Save email data
-    if email_successful is not None:
-        email_file = os.path.join(output_dir, 'processed_email_data.csv')
-        email_successful.to_csv(email_file, index=False)
+    if email_successful is not None and output_files['email_data'] is None:
+        email_file = write_processed(email_successful, output_dir, 'processed_email_data', output_format, email_schema)
+        output_files['email_data'] = os.path.basename(email_file)
         logger.info(f"✅ Saved {len(email_successful)} email records to {email_file}")
     
     # Save email contacts failures
-    if email_failed is not None and len(email_failed) > 0:
-        failed_file = os.path.join(output_dir, 'contacts_failed_records.csv')
-        email_failed.to_csv(failed_file, index=False)
+    if email_failed is not None and len(email_failed) > 0 and output_files['contacts_failed'] is None:
+        failed_file = write_processed(email_failed, output_dir, 'contacts_failed_records', output_format, email_schema)
+        output_files['contacts_failed'] = os.path.basename(failed_file)
         logger.info(f"📝 Saved {len(email_failed)} contacts failed records to {failed_file}")
     
     # Save calls data
-    if calls_data is not None:
-        calls_file = os.path.join(output_dir, 'processed_calls_data.csv')
-        calls_data.to_csv(calls_file, index=False)
+    if calls_data is not None and output_files['calls_data'] is None:
+        calls_file = write_processed(calls_data, output_dir, 'processed_calls_data', output_format,
+                                     build_read_schema('processed_calls'))
+        output_files['calls_data'] = os.path.basename(calls_file)
         logger.info(f"✅ Saved {len(calls_data)} call records to {calls_file}")
     
     # Save combined data
-    if combined_data is not None:
-        combined_file = os.path.join(output_dir, 'processed_combined_data.csv')
-        combined_data.to_csv(combined_file, index=False)
+    if combined_data is not None and output_files['combined_data'] is None:
+        combined_file = write_processed(combined_data, output_dir, 'processed_combined_data', output_format, email_schema)
+        output_files['combined_data'] = os.path.basename(combined_file)
         logger.info(f"✅ Saved {len(combined_data)} combined records to {combined_file}")
     
     # Save metadata
@@ -293,12 +454,9 @@ def save_results(email_successful, email_failed, email_stats, calls_data, calls_
         'email_processing': email_stats,
         'calls_processing': calls_stats,
         'combined_processing': combined_stats,
-        'output_files': {
-            'email_data': 'processed_email_data.csv' if email_successful is not None else None,
-            'contacts_failed': 'contacts_failed_records.csv' if email_failed is not None and len(email_failed) > 0 else None,
-            'calls_data': 'processed_calls_data.csv' if calls_data is not None else None,
-            'combined_data': 'processed_combined_data.csv' if combined_data is not None else None
-        }
+        'output_format': output_format,
+        'output_files': output_files,
+        'stages': stages or {}
     }
     
     metadata_file = os.path.join(output_dir, 'preprocessing_metadata.json')
@@ -306,8 +464,39 @@ def save_results(email_successful, email_failed, email_stats, calls_data, calls_
         json.dump(metadata, f, indent=2)
     logger.info(f"📊 Saved processing metadata to {metadata_file}")
 
-def main():
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Pre-process SDR email and calls data files for dashboard.")
+    parser.add_argument('--jobs', type=int, default=1,
+                        help="Number of workers for the per-SDR Send-Open joins (default: 1, 0 = one per CPU)")
+    parser.add_argument('--executor', choices=EXECUTOR_MODES, default='process',
+                        help="How per-SDR joins run when --jobs > 1 (default: process)")
+    parser.add_argument('--join-shards', type=int, default=1,
+                        help="Recipient hash shards per SDR Send-Open join, matched in worker processes (default: 1)")
+    parser.add_argument('--incremental', action='store_true',
+                        help=f"Persist per-SDR join state in {JOIN_STATE_DIR} and only match new rows")
+    parser.add_argument('--streaming', action='store_true',
+                        help=f"Join each SDR's files in chunks through on-disk buckets, writing the joins to {STREAMING_DIR}")
+    parser.add_argument('--explode-open-recipients', action='store_true',
+                        help="Match every recipient of a multi-recipient Open row instead of only the first one")
+    parser.add_argument('--csv-engine', choices=CSV_ENGINES, default='c',
+                        help="CSV parser for full-file reads: pyarrow when installed (auto: large files only) or the C parser (default: c)")
+    parser.add_argument('--output-format', choices=OUTPUT_FORMATS, default=None,
+                        help="Processed file format: parquet / feather (typed) or csv (default: parquet when pyarrow is installed)")
+    parser.add_argument('--force', action='store_true',
+                        help="Reprocess every stage, ignoring the input manifest of the previous run")
+    args = parser.parse_args(argv)
+    if args.streaming and (args.incremental or args.join_shards > 1):
+        parser.error("--streaming cannot be combined with --incremental or --join-shards")
+    return args
+
+def main(args=None):
     """Main preprocessing function"""
+    if args is None:
+        args = parse_args()
+    set_csv_engine(args.csv_engine)
+    output_format = resolve_output_format(args.output_format)
+    
     print("\n" + "=" * 60)
     print("SDR DATA PREPROCESSING SCRIPT")
     print("=" * 60)
@@ -318,20 +507,30 @@ def main():
     print("\nStarting preprocessing automatically...")
     
     try:
+        # Input fingerprints and stored stage outputs of the previous run
+        manifest = InputManifest(create_output_directory(), settings={'output_format': output_format}, reuse=not args.force)
+        
         # Process email data
-        email_successful, email_failed, email_stats = process_email_data()
+        email_successful, email_failed, email_stats = process_email_data(jobs=args.jobs, executor=args.executor, join_shards=args.join_shards,
+                                                                          incremental=args.incremental,
+                                                                          explode_open_recipients=args.explode_open_recipients,
+                                                                          manifest=manifest, streaming=args.streaming)
         
         # Process calls data
-        calls_data, calls_stats = process_calls_data()
+        calls_data, calls_stats = process_calls_data(manifest=manifest)
         
         # Process combined data
         combined_data = None
         combined_stats = {}
         if email_successful is not None and calls_data is not None:
-            combined_data, combined_stats = process_combined_data(email_successful, calls_data)
+            combined_data, combined_stats = process_combined_data(email_successful, calls_data, manifest=manifest)
         
-        # Save results
-        save_results(email_successful, email_failed, email_stats, calls_data, calls_stats, combined_data, combined_stats)
+        # Save results (outputs identical to the saved files are kept), then the manifest
+        unchanged = [output_name for output_name, stage in OUTPUT_STAGES.items() if manifest.unchanged_since_last_run(stage)]
+        save_results(email_successful, email_failed, email_stats, calls_data, calls_stats, combined_data, combined_stats,
+                     output_format=output_format, unchanged=unchanged,
+                     stages={'computed': manifest.computed, 'reused': manifest.reused})
+        manifest.save()
         
         # Summary
         print("\n" + "=" * 60)
@@ -3,6 +3,9 @@ import numpy as np
 from datetime import datetime
 import os
 import logging
+from .csv_loader import read_csv_sniffed, read_csv_sample, sniff_encoding
+from .read_schema import build_read_schema
+from .result_cache import ResultCache, input_digest
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -12,7 +15,12 @@ class CallsProcessor:
     Simple Calls Data Processor - Single CSV file with basic validation
     """
     
-    def __init__(self):
+    def __init__(self, result_cache_dir=None):
+        # Encoding and load timings of the last loaded calls file
+        self.last_load_stats = {}
+        # Processed calls frames keyed by file content (None = always recompute)
+        self.result_cache = ResultCache(result_cache_dir) if result_cache_dir else None
+        
         # Required columns for calls record CSV
         self.required_columns = [
             'Assigned', 
@@ -24,6 +32,9 @@ class CallsProcessor:
             'Email',
             'Full Comments'
         ]
+        
+        # Dtypes, categoricals and the Date format for calls CSVs
+        self.read_schema = build_read_schema('calls', required_columns=self.required_columns)
     
     def validate_calls_file(self, file_obj):
         """
@@ -38,17 +49,19 @@ class CallsProcessor:
         error_messages = []
         
         try:
-            # Load the CSV with automatic encoding detection
-            df = self._load_csv_with_encoding(file_obj)
-            logger.info(f"Loaded calls CSV: {len(df)} rows, {len(df.columns)} columns")
+            # Check header + first rows before parsing the whole file
+            if hasattr(file_obj, 'seek'):
+                file_obj.seek(0)
+            sniffed = sniff_encoding(file_obj)
+            sample_df = read_csv_sample(file_obj, sniffed[0])
             
             # Check if file is empty
-            if len(df) == 0:
+            if len(sample_df) == 0:
                 error_messages.append("❌ **Empty File**: Calls CSV contains no data rows.")
                 return False, error_messages, None
             
             # Check for required columns
-            available_columns = list(df.columns)
+            available_columns = list(sample_df.columns)
             missing_columns = [col for col in self.required_columns if col not in available_columns]
             
             if missing_columns:
@@ -56,6 +69,10 @@ class CallsProcessor:
                 error_messages.append(f"📋 **Available Columns**: {', '.join(available_columns)}")
                 return False, error_messages, None
             
+            # Load the CSV with the encoding detected above
+            df = self._load_csv_with_encoding(file_obj, sniffed=sniffed, header=available_columns)
+            logger.info(f"Loaded calls CSV: {len(df)} rows, {len(df.columns)} columns")
+            
             logger.info(f"✅ Calls CSV validation passed: All required columns present")
             return True, [], df
             
@@ -63,35 +80,27 @@ class CallsProcessor:
             error_messages.append(f"❌ **File Processing Error**: {str(e)}")
             return False, error_messages, None
     
-    def _load_csv_with_encoding(self, file_obj):
+    def _load_csv_with_encoding(self, file_obj, sniffed=None, header=None):
         """
         Load CSV file with automatic encoding detection
-        Tries common encodings: utf-8, latin-1, cp1252, iso-8859-1
-        """
-        encodings = ['utf-8', 'latin-1', 'cp1252', 'iso-8859-1', 'utf-16']
+        Sniffs BOM + a bounded byte sample (utf-8, cp1252, latin-1) and parses once
         
-        for encoding in encodings:
-            try:
-                # Reset file pointer to beginning
+        Args:
+            sniffed: Optional (encoding, detection_seconds) already detected for file_obj
+            header: Optional column names of file_obj; when given, only the read
+                    schema's columns are parsed, with their declared dtypes and dates
+        """
+        try:
+            # Reset file pointer to beginning
+            if hasattr(file_obj, 'seek'):
                 file_obj.seek(0)
-                df = pd.read_csv(file_obj, encoding=encoding)
-                logger.info(f"Successfully loaded CSV with {encoding} encoding")
+            if header is None:
+                df, self.last_load_stats = read_csv_sniffed(file_obj, sniffed=sniffed)
                 return df
-            except UnicodeDecodeError:
-                logger.warning(f"Failed to load CSV with {encoding} encoding, trying next...")
-                continue
-            except Exception as e:
-                logger.error(f"Error loading CSV with {encoding} encoding: {str(e)}")
-                continue
-        
-        # If all encodings fail, try with error handling
-        try:
-            file_obj.seek(0)
-            df = pd.read_csv(file_obj, encoding='utf-8', encoding_errors='ignore')
-            logger.warning("Loaded CSV with UTF-8 encoding, ignoring invalid characters")
-            return df
+            df, self.last_load_stats = read_csv_sniffed(file_obj, sniffed=sniffed, **self.read_schema.read_csv_kwargs(header))
+            return self.read_schema.parse_dates(df)
         except Exception as e:
-            logger.error(f"Failed to load CSV with all attempted encodings: {str(e)}")
+            logger.error(f"Failed to load calls CSV: {str(e)}")
             raise Exception(f"Unable to read file with any supported encoding. Please save your CSV file as UTF-8.")
     
     def process_calls_file(self, file_obj):
@@ -104,6 +113,23 @@ class CallsProcessor:
         Returns:
             tuple: (is_valid, error_messages, dataframe)
         """
+        if self.result_cache is None:
+            return self._process_calls_file(file_obj)
+        
+        # Identical file contents reuse the stored result
+        key = self.result_cache.key('calls', input_digest(file_obj))
+        entry = self.result_cache.get(key)
+        if entry is not None:
+            self.last_load_stats = entry['load_stats']
+            return entry['result']
+        
+        result = self._process_calls_file(file_obj)
+        if result[0]:
+            self.result_cache.put(key, {'result': result, 'load_stats': self.last_load_stats})
+        return result
+    
+    def _process_calls_file(self, file_obj):
+        """Validate the calls file and convert Date and Call Duration (uncached)"""
         try:
             # Validate file
             is_valid, error_messages, df = self.validate_calls_file(file_obj)
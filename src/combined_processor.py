@@ -1,24 +1,41 @@
 import pandas as pd
 import numpy as np
 from datetime import datetime
+import io
 import os
 import logging
 from .data_processor import DataProcessor
 from .calls_processor import CallsProcessor
+from .executors import run_concurrently
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+def _picklable_file(file):
+    """Paths and in-memory buffers as is; other file objects read into a BytesIO"""
+    if file is None or isinstance(file, (str, os.PathLike, io.BytesIO)) or not hasattr(file, 'read'):
+        return file
+    return io.BytesIO(file.read())
+
+
 class CombinedProcessor:
     """
     Combined Email and Calls Data Processor
     Handles both email analytics and calls data independently, then provides combined insights
     """
     
-    def __init__(self):
+    def __init__(self, executor='thread', result_cache_dir=None, contacts_cache_dir=None):
+        """
+        Args:
+            executor: How the email and calls pipelines overlap in process_combined_files:
+                      'thread' (default), 'process' or 'serial'
+            result_cache_dir: Result cache shared by both pipelines (None = always recompute)
+            contacts_cache_dir: Contacts index cache of the email pipeline (None = always parse the CSV)
+        """
         # Initialize individual processors
-        self.email_processor = DataProcessor()
-        self.calls_processor = CallsProcessor()
+        self.email_processor = DataProcessor(contacts_cache_dir=contacts_cache_dir, result_cache_dir=result_cache_dir)
+        self.calls_processor = CallsProcessor(result_cache_dir=result_cache_dir)
+        self.executor = executor
         
         logger.info("CombinedProcessor initialized with independent email and calls processors")
     
@@ -41,22 +58,33 @@ class CombinedProcessor:
             - email_failed: Failed email records
             - calls_failed: Failed calls records (empty for now)
             - validation_errors: List of all validation errors
-            - metadata: Processing metadata
+            - metadata: Processing metadata (with per-pipeline timings)
         """
         logger.info("Starting combined files processing...")
         
         all_validation_errors = []
         
         try:
-            # Process email files first
-            logger.info("Processing email files...")
+            # Email and calls pipelines share no data until join_email_calls, so they run side by side
+            logger.info("Processing email and calls files...")
             email_files = {
                 'send_mails': files.get('send_mails'),
                 'open_mails': files.get('open_mails'),
                 'contacts': files.get('contacts', 'data/contacts.csv')
             }
+            calls_file = files.get('calls')
+            if self.executor == 'process':
+                # Worker processes get pickled inputs: buffer open file handles in memory
+                email_files = {key: _picklable_file(value) for key, value in email_files.items()}
+                calls_file = _picklable_file(calls_file)
+            
+            pipelines = {'email': (self.email_processor.process_files, (email_files,))}
+            if calls_file is not None:
+                pipelines['calls'] = (self.calls_processor.process_calls_file, (calls_file,))
+            pipeline_results, pipeline_timings, pipeline_seconds = run_concurrently(
+                pipelines, executor=self.executor, label='email and calls pipelines')
             
-            email_result = self.email_processor.process_files(email_files)
+            email_result = pipeline_results['email']
             
             # Handle different email result formats
             if len(email_result) == 6:
@@ -78,15 +106,12 @@ class CombinedProcessor:
             if email_validation_errors:
                 all_validation_errors.extend([f"📧 Email: {error}" for error in email_validation_errors])
             
-            # Process calls file
-            logger.info("Processing calls file...")
-            calls_file = files.get('calls')
-            
+            # Calls pipeline result
             if calls_file is None:
                 all_validation_errors.append("📞 Calls: Missing Calls Record CSV file")
                 calls_success, calls_errors, calls_data = False, ["Missing calls file"], None
             else:
-                calls_success, calls_errors, calls_data = self.calls_processor.process_calls_file(calls_file)
+                calls_success, calls_errors, calls_data = pipeline_results['calls']
                 
                 # Add calls validation errors to combined list
                 if calls_errors:
@@ -106,7 +131,9 @@ class CombinedProcessor:
                     'email_failed': len(failed_email_data),
                     'calls_total': len(calls_data),
                     'original_send_count': original_send_count,
-                    'processing_timestamp': datetime.now().isoformat()
+                    'processing_timestamp': datetime.now().isoformat(),
+                    'pipeline_seconds': pipeline_timings,
+                    'wall_seconds': pipeline_seconds
                 }
                 
                 combined_result = {
@@ -134,7 +161,11 @@ class CombinedProcessor:
                     'email_failed': failed_email_data if email_success else None,
                     'calls_failed': pd.DataFrame(),
                     'validation_errors': all_validation_errors,
-                    'metadata': {'processing_timestamp': datetime.now().isoformat()},
+                    'metadata': {
+                        'processing_timestamp': datetime.now().isoformat(),
+                        'pipeline_seconds': pipeline_timings,
+                        'wall_seconds': pipeline_seconds
+                    },
                     'intermediate_data': None
                 }
                 
@@ -0,0 +1,128 @@
+import hashlib
+import os
+import pickle
+import time
+import logging
+from .read_schema import read_csv_with_schema
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+CACHE_VERSION = 3
+
+# Entries already loaded by this process, keyed by absolute contacts path
+_memory_cache = {}
+
+
+def file_content_hash(path, block_size=1 << 20):
+    """blake2b hex digest of a file's bytes"""
+    digest = hashlib.blake2b(digest_size=20)
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ContactsIndexCache:
+    """
+    On-disk cache of the cleaned contacts frame and its email index.
+
+    Each contacts file gets one pickle in cache_dir holding the cleaned frame,
+    the unique-email Index with first-occurrence row positions, and the source
+    fingerprint (mtime, size, content hash). A matching mtime and size is
+    trusted as is. Otherwise the content hash decides whether the entry can be
+    reused (touched but unchanged file) or must be rebuilt. Loaded entries are
+    also kept in memory, so later loads in the same process are free.
+    """
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+
+    def cache_path(self, contacts_file):
+        """Cache file for a contacts path (one entry per source file)"""
+        path_key = hashlib.blake2b(os.path.abspath(contacts_file).encode('utf-8'), digest_size=8).hexdigest()
+        return os.path.join(self.cache_dir, f"contacts_index_{path_key}.pkl")
+
+    def load(self, contacts_file, processor):
+        """
+        Cleaned contacts and their email index, rebuilt only when the file changed.
+
+        Args:
+            contacts_file: Path to the contacts CSV
+            processor: DataProcessor providing read_schemas, _clean_data and _build_contacts_index
+
+        Returns:
+            tuple: (contacts_df, contacts_index, contacts_first_pos)
+        """
+        start_time = time.time()
+        abs_path = os.path.abspath(contacts_file)
+        stat = os.stat(abs_path)
+
+        # Step 1: Same process, untouched file
+        entry = _memory_cache.get(abs_path)
+        if entry is not None and self._same_stat(entry, stat):
+            return self._unpack(entry)
+
+        # Step 2: On-disk entry, trusted on mtime + size, otherwise verified by content hash
+        content_hash = None
+        entry = self._read(contacts_file)
+        if entry is not None and not self._same_stat(entry, stat):
+            content_hash = file_content_hash(abs_path)
+            if content_hash == entry['content_hash']:
+                entry['mtime_ns'], entry['size'] = stat.st_mtime_ns, stat.st_size
+                self._write(contacts_file, entry)
+            else:
+                entry = None
+
+        if entry is not None:
+            logger.info(f"⚡ Loaded contacts index from cache ({len(entry['contacts_df'])} rows) in {time.time() - start_time:.3f}s")
+        else:
+            # Step 3: Rebuild from the CSV
+            contacts_df, _ = read_csv_with_schema(abs_path, processor.read_schemas['contacts'])
+            contacts_df = processor._clean_data(contacts_df, 'contacts')
+            contacts_index, contacts_first_pos = processor._build_contacts_index(contacts_df)
+            entry = {
+                'version': CACHE_VERSION,
+                'mtime_ns': stat.st_mtime_ns,
+                'size': stat.st_size,
+                'content_hash': content_hash or file_content_hash(abs_path),
+                'contacts_df': contacts_df,
+                'contacts_index': contacts_index,
+                'contacts_first_pos': contacts_first_pos
+            }
+            self._write(contacts_file, entry)
+            logger.info(f"🔨 Built contacts index cache ({len(contacts_df)} rows, {len(contacts_index)} unique emails) in {time.time() - start_time:.3f}s")
+
+        _memory_cache[abs_path] = entry
+        return self._unpack(entry)
+
+    def _same_stat(self, entry, stat):
+        return entry['mtime_ns'] == stat.st_mtime_ns and entry['size'] == stat.st_size
+
+    def _unpack(self, entry):
+        return entry['contacts_df'], entry['contacts_index'], entry['contacts_first_pos']
+
+    def _read(self, contacts_file):
+        """Cached entry for a contacts file, None if missing, stale format or unreadable"""
+        cache_file = self.cache_path(contacts_file)
+        if not os.path.exists(cache_file):
+            return None
+        try:
+            with open(cache_file, 'rb') as f:
+                entry = pickle.load(f)
+            return entry if entry.get('version') == CACHE_VERSION else None
+        except Exception as e:
+            logger.warning(f"⚠️ Ignoring unreadable contacts cache {cache_file}: {str(e)}")
+            return None
+
+    def _write(self, contacts_file, entry):
+        """Write atomically; a failed write only costs a rebuild next time"""
+        cache_file = self.cache_path(contacts_file)
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_file = f"{cache_file}.{os.getpid()}.tmp"
+            with open(tmp_file, 'wb') as f:
+                pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_file, cache_file)
+        except Exception as e:
+            logger.warning(f"⚠️ Could not write contacts cache {cache_file}: {str(e)}")
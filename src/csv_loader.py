@@ -0,0 +1,295 @@
+import pandas as pd
+import numpy as np
+import codecs
+import io
+import os
+import time
+import logging
+from pandas._libs.parsers import STR_NA_VALUES
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+except ImportError:  # Optional: without pyarrow every CSV goes through the pandas C parser
+    pa = None
+    pa_csv = None
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Bytes probed at each end of the file; parse errors past the sample are rare
+# enough that they pay for one re-parse instead of every file paying up front
+SNIFF_SAMPLE_BYTES = 64 * 1024
+
+BOM_ENCODINGS = [
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+]
+
+# Probed in order; latin-1 decodes any byte, so it always ends the search
+PROBE_ENCODINGS = ['utf-8', 'cp1252', 'latin-1']
+
+UTF8_CONTINUATION_BYTES = bytes(range(0x80, 0xC0))
+
+# Data rows parsed for header-first validation (content checks look at the first 10)
+HEADER_SAMPLE_ROWS = 10
+
+# Full-file parsers: 'auto' uses pyarrow's multithreaded reader (when installed) for
+# files of at least ARROW_MIN_BYTES, 'pyarrow' for every file, 'c' (the default) never
+CSV_ENGINES = ('auto', 'pyarrow', 'c')
+ARROW_MIN_BYTES = 4 * 1024 * 1024
+# read_csv options the pyarrow reader reproduces; anything else uses the C parser
+ARROW_READ_OPTIONS = {'usecols', 'dtype'}
+ARROW_TEXT_DTYPES = (str, 'str', object, 'object', 'category')
+# Values the C parser reads as booleans (pyarrow also accepts 1/0 by default)
+BOOL_TRUE_VALUES = ['True', 'TRUE', 'true']
+BOOL_FALSE_VALUES = ['False', 'FALSE', 'false']
+
+_csv_engine = 'c'
+
+
+def set_csv_engine(engine):
+    """Select the full-file CSV parser for this process (one of CSV_ENGINES)"""
+    global _csv_engine
+    if engine not in CSV_ENGINES:
+        raise ValueError(f"Unknown CSV engine '{engine}'. Expected one of: {', '.join(CSV_ENGINES)}")
+    if engine == 'pyarrow' and pa_csv is None:
+        logger.warning("⚠️ pyarrow is not installed, CSVs are parsed with the C parser")
+    _csv_engine = engine
+
+
+def _read_sample(file, sample_bytes):
+    """Head and tail byte samples of a path or seekable binary file object"""
+    if isinstance(file, (str, os.PathLike)):
+        with open(file, 'rb') as f:
+            return _read_sample(f, sample_bytes)
+
+    start = file.tell() if hasattr(file, 'tell') else 0
+    head = file.read(sample_bytes)
+    tail = b''
+    if len(head) == sample_bytes and hasattr(file, 'seek'):
+        file.seek(0, io.SEEK_END)
+        size = file.tell()
+        if size > 2 * sample_bytes:
+            file.seek(size - sample_bytes)
+            tail = file.read(sample_bytes)
+    if hasattr(file, 'seek'):
+        file.seek(start)
+    return head, tail
+
+
+def _decodes(sample, encoding, final):
+    """True if sample decodes cleanly (final=False tolerates a cut multi-byte char at the end)"""
+    try:
+        codecs.getincrementaldecoder(encoding)().decode(sample, final=final)
+        return True
+    except UnicodeDecodeError:
+        return False
+
+
+def sniff_encoding(file, sample_bytes=SNIFF_SAMPLE_BYTES):
+    """
+    Detect a CSV's encoding from a BOM check plus a decode probe of bounded
+    head/tail byte samples, without parsing the file.
+
+    Args:
+        file: Path or seekable file object (position is restored)
+
+    Returns:
+        tuple: (encoding, detection_seconds); encoding is None for text-mode objects
+    """
+    start_time = time.time()
+    head, tail = _read_sample(file, sample_bytes)
+
+    if isinstance(head, str):
+        return None, time.time() - start_time
+
+    for bom, encoding in BOM_ENCODINGS:
+        if head.startswith(bom):
+            return encoding, time.time() - start_time
+
+    for encoding in PROBE_ENCODINGS:
+        # The tail sample may start mid-character; skip its leading continuation bytes
+        tail_probe = tail.lstrip(UTF8_CONTINUATION_BYTES) if encoding == 'utf-8' else tail
+        if _decodes(head, encoding, final=False) and _decodes(tail_probe, encoding, final=True):
+            return encoding, time.time() - start_time
+
+    return 'latin-1', time.time() - start_time
+
+
+def read_csv_sample(file, encoding, sample_rows=HEADER_SAMPLE_ROWS):
+    """
+    Parse only the header row and the first sample_rows rows, leaving a file
+    object's position unchanged so it can be fully parsed afterwards.
+    """
+    start_position = file.tell() if hasattr(file, 'tell') else None
+    try:
+        kwargs = {'encoding': encoding} if encoding is not None else {}
+        return pd.read_csv(file, nrows=sample_rows, **kwargs)
+    finally:
+        if start_position is not None:
+            file.seek(start_position)
+
+
+def read_csv_sniffed(file, sniffed=None, **read_csv_kwargs):
+    """
+    pd.read_csv with the encoding detected by sniff_encoding: one parse per file.
+
+    If a byte outside the probed samples does not decode, the file is parsed
+    once more with the next probe encoding.
+
+    Args:
+        sniffed: (encoding, detection_seconds) from an earlier sniff_encoding call
+
+    Returns:
+        tuple: (DataFrame, load_info dict with encoding, encoding_detection_seconds, parse_seconds)
+    """
+    encoding, detection_seconds = sniffed if sniffed is not None else sniff_encoding(file)
+    start_position = file.tell() if hasattr(file, 'tell') else None
+
+    if encoding in PROBE_ENCODINGS:
+        fallbacks = PROBE_ENCODINGS[PROBE_ENCODINGS.index(encoding):]
+    else:
+        fallbacks = [encoding]
+    parse_start = time.time()
+
+    engine = _select_engine(file, encoding, read_csv_kwargs)
+    if engine == 'pyarrow':
+        try:
+            df, candidate, fallbacks = _read_csv_arrow(file, encoding, **read_csv_kwargs), encoding, []
+        except Exception as e:
+            # Anything pyarrow rejects (ragged rows, duplicate headers, bad bytes) gets the C parser's handling
+            logger.warning(f"⚠️ pyarrow could not parse the CSV, using the C parser: {str(e)}")
+            engine = 'c'
+            if start_position is not None:
+                file.seek(start_position)
+
+    for attempt, candidate in enumerate(fallbacks):
+        try:
+            if attempt > 0 and start_position is not None:
+                file.seek(start_position)
+            kwargs = dict(read_csv_kwargs)
+            if candidate is not None:
+                kwargs['encoding'] = candidate
+            df = pd.read_csv(file, **kwargs)
+            break
+        except UnicodeDecodeError:
+            if attempt == len(fallbacks) - 1:
+                raise
+            logger.warning(f"Byte outside the sniffed sample is not valid {candidate}, re-parsing as {fallbacks[attempt + 1]}")
+
+    load_info = {
+        'encoding': candidate or 'text',
+        'encoding_detection_seconds': detection_seconds,
+        'engine': engine,
+        'parse_seconds': time.time() - parse_start
+    }
+    logger.info(f"Loaded CSV with {load_info['encoding']} encoding (detected in {detection_seconds * 1000:.1f}ms, parsed by {engine} in {load_info['parse_seconds']:.3f}s)")
+    return df, load_info
+
+
+def _select_engine(file, encoding, read_csv_kwargs):
+    """'pyarrow' or 'c' for one full-file parse, per the configured engine"""
+    if _csv_engine == 'c' or pa_csv is None or encoding is None:
+        return 'c'
+    if set(read_csv_kwargs) - ARROW_READ_OPTIONS or read_csv_kwargs.get('usecols') == []:
+        return 'c'
+    if any(dtype not in ARROW_TEXT_DTYPES for dtype in (read_csv_kwargs.get('dtype') or {}).values()):
+        return 'c'
+    if _csv_engine == 'pyarrow':
+        return 'pyarrow'
+
+    if isinstance(file, (str, os.PathLike)):
+        size = os.path.getsize(file)
+    elif hasattr(file, 'seek') and hasattr(file, 'tell'):
+        start = file.tell()
+        size = file.seek(0, io.SEEK_END) - start
+        file.seek(start)
+    else:
+        return 'c'
+    return 'pyarrow' if size >= ARROW_MIN_BYTES else 'c'
+
+
+def _read_csv_arrow(file, encoding, usecols=None, dtype=None):
+    """
+    Parse a CSV with pyarrow's multithreaded reader into the frame pd.read_csv
+    builds: the C parser's null and boolean tokens, NaN (not None) for missing
+    text, text kept for dates and times pyarrow would infer, all-empty columns
+    as float NaN, and categoricals built after the parse.
+
+    Columns pyarrow reads as floats, and text columns whose every value is a
+    number, are converted with pd.to_numeric from their text instead: float
+    parsing differs in the last bit for long literals, and only pandas reads
+    values like "+5" as int64. Text is never re-parsed as CSV.
+    """
+    dtype = dtype or {}
+    start_position = file.tell() if hasattr(file, 'tell') else None
+    column_types = {column: pa.string() for column in dtype}
+    table = _arrow_table(file, encoding, usecols, column_types)
+
+    # Dates, times and other types the C parser does not infer: re-read those columns as text
+    retyped = {field.name: pa.string() for field in table.schema if not _c_parser_type(field.type)}
+    numeric_columns = [field.name for field in table.schema if pa.types.is_floating(field.type)]
+    retyped.update({column: pa.string() for column in numeric_columns})
+    if retyped:
+        if start_position is not None:
+            file.seek(start_position)
+        table = _arrow_table(file, encoding, usecols, {**column_types, **retyped})
+
+    names = table.column_names
+    if len(set(names)) != len(names) or '' in names:
+        raise ValueError("header has duplicate or empty column names")
+    for position, field in enumerate(table.schema):
+        if pa.types.is_null(field.type):
+            table = table.set_column(position, field.name, pa.nulls(table.num_rows, pa.float64()))
+
+    df = table.to_pandas()
+    for column in df.columns[(df.dtypes == object).values]:
+        values = df[column].values
+        missing = pd.isna(values)
+        if missing.any():
+            df[column] = np.where(missing, np.nan, values)
+    for column in numeric_columns:
+        df[column] = pd.to_numeric(df[column].values)
+    for column in df.columns[(df.dtypes == object).values]:
+        if column not in dtype and column not in numeric_columns:
+            df[column] = _numeric_or_text(df[column].values)
+    for column, column_dtype in dtype.items():
+        if column_dtype == 'category' and column in df.columns:
+            df[column] = df[column].astype('category')
+    return df
+
+
+def _numeric_or_text(values):
+    """A text column (NaN = missing) as numbers when every value converts, as the C parser infers, else unchanged"""
+    missing = pd.isna(values)
+    if missing.all() or pd.isna(pd.to_numeric(values[~missing][:1], errors='coerce')[0]):
+        return values
+    numbers = pd.to_numeric(values, errors='coerce')
+    if (pd.isna(numbers) & ~missing).any():
+        return values
+    return numbers
+
+
+def _arrow_table(file, encoding, usecols, column_types):
+    """One pyarrow CSV parse with pandas-compatible options"""
+    read_options = pa_csv.ReadOptions(encoding='utf8' if encoding == 'utf-8' else encoding)
+    parse_options = pa_csv.ParseOptions(newlines_in_values=True)
+    convert_kwargs = {'include_columns': list(usecols)} if usecols is not None else {}
+    convert_options = pa_csv.ConvertOptions(
+        column_types=column_types,
+        null_values=sorted(STR_NA_VALUES),
+        strings_can_be_null=True,
+        true_values=BOOL_TRUE_VALUES,
+        false_values=BOOL_FALSE_VALUES,
+        **convert_kwargs
+    )
+    source = os.fspath(file) if isinstance(file, os.PathLike) else file
+    return pa_csv.read_csv(source, read_options=read_options, parse_options=parse_options, convert_options=convert_options)
+
+
+def _c_parser_type(arrow_type):
+    """True for arrow types the C parser would also infer (numbers, booleans, text)"""
+    return (pa.types.is_integer(arrow_type) or pa.types.is_floating(arrow_type) or pa.types.is_boolean(arrow_type)
+            or pa.types.is_string(arrow_type) or pa.types.is_large_string(arrow_type) or pa.types.is_null(arrow_type))
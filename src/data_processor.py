@@ -2,13 +2,71 @@ import pandas as pd
 import numpy as np
 from datetime import datetime
 import os
+import re
+import time
 import logging
+from .join_engine import AsofJoinEngine, OpenIndex, NANOS_PER_SECOND, PHASE1_WINDOW, new_join_plan, join_plan_stats, to_int64_ns
+from .executors import map_tasks
+from .join_state import SdrJoinState, JOIN_PLAN_FIELDS
+from .streaming_join import StreamingSendOpenJoin, OPEN_OVERLAP_SECONDS
+from .contacts_cache import ContactsIndexCache
+from .csv_loader import read_csv_sniffed, read_csv_sample, sniff_encoding
+from .read_schema import build_read_schema, read_csv_with_schema, SEND_DATE_FORMAT, OPEN_DATE_FORMATS
+from .date_parsing import matches_layout, parse_datetimes, parse_general_datetimes
+from .memory_stats import MemoryReport
+from .result_cache import ResultCache, input_digest, frame_digest
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class DataProcessor:
-    def __init__(self):
+    # Send-Open join backends selectable by _incremental_datetime_join
+    JOIN_BACKENDS = ('asof', 'iterrows')
+    # Multi-recipient Open rows ("A,B,C"): keep the first recipient, or one Open event per recipient
+    OPEN_RECIPIENT_MODES = ('first', 'explode')
+    # Per-email Open counters kept on the first recipient's event only when exploding
+    OPEN_COUNTER_COLUMNS = ('Views', 'Clicks', 'PDF views')
+    # File roles validated by process_files and by the per-SDR Send-Open join
+    FILE_ROLES = ('send_mails', 'open_mails', 'contacts')  # Removed 'account_history'
+    SDR_FILE_ROLES = ('send_mails', 'open_mails')
+    # _clean_data file types → file roles (read schemas)
+    FILE_TYPE_ROLES = {'send': 'send_mails', 'open': 'open_mails', 'contacts': 'contacts'}
+    # Offending row numbers listed per content rule
+    VALIDATION_REPORT_ROWS = 5
+    EMAIL_PATTERN = r'^\s*[^@\s]+@[^@\s]+\s*$'
+    # Per-run stats stored with cached results and restored on a cache hit
+    CACHED_STATS = ('last_join_stats', 'last_load_stats', 'last_validation_report', 'last_memory_stats')
+    
+    def __init__(self, join_backend='asof', join_shards=1, join_shard_executor='process', join_shard_jobs=None, join_state_dir=None,
+                 contacts_cache_dir=None, open_recipient_mode='first', result_cache_dir=None):
+        if join_backend not in self.JOIN_BACKENDS:
+            raise ValueError(f"Unknown join backend '{join_backend}'. Expected one of: {', '.join(self.JOIN_BACKENDS)}")
+        if open_recipient_mode not in self.OPEN_RECIPIENT_MODES:
+            raise ValueError(f"Unknown open recipient mode '{open_recipient_mode}'. Expected one of: {', '.join(self.OPEN_RECIPIENT_MODES)}")
+        if join_shards < 1:
+            raise ValueError(f"join_shards must be at least 1, got {join_shards}")
+        self.join_backend = join_backend
+        self.join_engine = AsofJoinEngine()
+        # Recipient hash shards for a single large Send-Open join (1 = no sharding)
+        self.join_shards = join_shards
+        self.join_shard_executor = join_shard_executor
+        self.join_shard_jobs = join_shard_jobs
+        # Directory holding per-SDR join state; when set, process_single_sdr ingests deltas only
+        self.join_state_dir = join_state_dir
+        # Cleaned contacts + email index cached on disk (None = always parse the CSV)
+        self.contacts_cache = ContactsIndexCache(contacts_cache_dir) if contacts_cache_dir else None
+        # 'explode' matches every recipient of a multi-recipient Open row, not just the first
+        self.open_recipient_mode = open_recipient_mode
+        # Validated frames and join results keyed by input content (None = always recompute)
+        self.result_cache = ResultCache(result_cache_dir) if result_cache_dir else None
+        self.last_join_stats = {}
+        # Per file role: encoding and load timings from the last sheets_validator run
+        self.last_load_stats = {}
+        # Per file role: full-file content rule counts from the last sheets_validator run
+        self.last_validation_report = {}
+        # Bytes held per pipeline stage and peak RSS from the last run (see MemoryReport)
+        self.last_memory_stats = {}
+        
         self.required_send_columns = ['recipient_name', 'sent_date', 'Recipient Email']
         self.required_open_columns = ['recipient_name', 'sent_date', 'Views', 'Clicks']
         # self.required_account_history_columns = ['Edit Date', 'Company URL', 'New Value', 'Account Owner']
@@ -42,12 +100,38 @@ class DataProcessor:
             #     'Account Owner': 'Account Owner'
             # }
         }
+        
+        # Per-role read schema: columns to parse, dtypes, categoricals and date formats
+        self.read_schemas = {
+            'send_mails': build_read_schema('send_mails', self.column_mappings['send_mails'], self.required_send_columns),
+            'open_mails': build_read_schema('open_mails', self.column_mappings['open_mails'], self.required_open_columns),
+            'contacts': build_read_schema('contacts', self.column_mappings['contacts'], self.required_contacts_columns)
+        }
+    
+    def sheets_validator(self, files, required_roles=FILE_ROLES):
+        """
+        Validate and map the files of the required roles (see _validate_sheets),
+        reusing the result of a previous run on identical file contents.
+        
+        Returns:
+            tuple: (is_valid, error_messages, mapped_dataframes)
+        """
+        if self.result_cache is None:
+            return self._validate_sheets(files, required_roles)
+        key_parts = (tuple(required_roles), tuple(input_digest(files.get(role)) for role in required_roles))
+        return self._cached_run('validated', key_parts, lambda: self._validate_sheets(files, required_roles),
+                                lambda result: result[0])
     
-    def sheets_validator(self, files):
+    def _validate_sheets(self, files, required_roles=FILE_ROLES):
         """
         Comprehensive validation function for all uploaded CSV files.
         Validates headers, applies column mappings, and checks data integrity.
         
+        Args:
+            files: {file role: path or uploaded file}
+            required_roles: File roles to load and validate; other entries in
+                            files are skipped without being read
+        
         Returns:
             tuple: (is_valid, error_messages, mapped_dataframes)
         """
@@ -82,6 +166,9 @@ class DataProcessor:
         
         # Validate each file
         for file_key, file_obj in files.items():
+            if file_key not in required_roles:
+                continue  # Not needed by this entry point - don't read it
+            
             if file_obj is None:
                 error_messages.append(f"❌ **Missing File**: {file_definitions.get(file_key, {}).get('display_name', file_key)} is required but not uploaded.")
                 continue
@@ -92,50 +179,31 @@ class DataProcessor:
             file_def = file_definitions[file_key]
             
             try:
-                # Load the CSV - handle both file paths and uploaded files
-                if isinstance(file_obj, str):
-                    # File path (like 'data/contacts.csv')
-                    if not os.path.exists(file_obj):
-                        error_messages.append(f"❌ **File Not Found**: {file_def['display_name']} file not found at {file_obj}")
-                        continue
-                    df = pd.read_csv(file_obj)
-                    logger.info(f"Loaded {file_def['display_name']} from file path: {file_obj}")
-                else:
-                    # Uploaded file object
-                    df = pd.read_csv(file_obj)
-                    logger.info(f"Loaded {file_def['display_name']} from uploaded file")
-                logger.info(f"Validating {file_def['display_name']}: {len(df)} rows, {len(df.columns)} columns")
+                # File path (like 'data/contacts.csv') or uploaded file object
+                if isinstance(file_obj, str) and not os.path.exists(file_obj):
+                    error_messages.append(f"❌ **File Not Found**: {file_def['display_name']} file not found at {file_obj}")
+                    continue
+                
+                # Stage 1: header + a small sample only, so a wrong file is rejected
+                # before the full parse no matter how large it is
+                sniffed = sniff_encoding(file_obj)
+                sample_df = read_csv_sample(file_obj, sniffed[0])
                 
                 # Validation Rule 1: Check if file is empty
-                if len(df) == 0:
+                if len(sample_df) == 0:
                     error_messages.append(f"❌ **Empty File**: {file_def['display_name']} contains no data rows.")
                     continue
                 
                 # Validation Rule 2: Check available columns
-                available_columns = list(df.columns)
+                available_columns = list(sample_df.columns)
                 logger.info(f"Available columns in {file_def['display_name']}: {available_columns}")
                 
                 # Validation Rule 3: Apply column mapping and check for required columns
-                mapped_columns = {}
-                
-                for user_column, system_column in file_def['mapping'].items():
-                    if user_column in available_columns:
-                        mapped_columns[user_column] = system_column
-                        logger.info(f"✅ Mapped '{user_column}' → '{system_column}' in {file_def['display_name']}")
-                    elif system_column in available_columns:
-                        # Check if the system column exists directly (backward compatibility)
-                        mapped_columns[system_column] = system_column
-                        logger.info(f"✅ Found direct match '{system_column}' in {file_def['display_name']}")
-                
-                # Validation Rule 4: Apply the mapping to rename columns
-                df_mapped = df.copy()
-                rename_dict = {user_col: sys_col for user_col, sys_col in mapped_columns.items() if user_col != sys_col}
-                if rename_dict:
-                    df_mapped = df_mapped.rename(columns=rename_dict)
-                    logger.info(f"Applied column renaming in {file_def['display_name']}: {rename_dict}")
+                rename_dict = self._column_renames(available_columns, file_def['mapping'], file_def['display_name'])
+                sample_mapped = sample_df.rename(columns=rename_dict) if rename_dict else sample_df
                 
-                # Validation Rule 5: Check for required columns after mapping
-                final_columns = list(df_mapped.columns)
+                # Validation Rule 4: Check for required columns after mapping
+                final_columns = list(sample_mapped.columns)
                 missing_required = [col for col in file_def['required_columns'] if col not in final_columns]
                 if missing_required:
                     error_messages.append(f"❌ **Missing Required Columns** in {file_def['display_name']}: {', '.join(missing_required)}")
@@ -143,13 +211,37 @@ class DataProcessor:
                     error_messages.append(f"📋 **Original columns in file**: {', '.join(available_columns)}")
                     continue
                 
-                # Validation Rule 6: Data type and content validation
-                validation_result = self._validate_data_content(df_mapped, file_key, file_def['display_name'])
+                # Validation Rule 5: Data type and content validation (first rows)
+                validation_result = self._validate_data_content(sample_mapped, file_key, file_def['display_name'])
                 if not validation_result['is_valid']:
                     error_messages.extend(validation_result['errors'])
                     continue
                 
-                # Validation Rule 7: Apply file-specific filtering rules
+                # Stage 2: Header contract passed - parse the whole file (schema columns only)
+                read_schema = self.read_schemas[file_key]
+                df, self.last_load_stats[file_key] = read_csv_sniffed(file_obj, sniffed=sniffed, **read_schema.read_csv_kwargs(available_columns, rename_dict))
+                read_schema.parse_dates(df, rename_dict)
+                if isinstance(file_obj, str):
+                    logger.info(f"Loaded {file_def['display_name']} from file path: {file_obj}")
+                else:
+                    logger.info(f"Loaded {file_def['display_name']} from uploaded file")
+                logger.info(f"Validating {file_def['display_name']}: {len(df)} rows, {len(df.columns)} columns")
+                
+                # Validation Rule 6: Apply the mapping to rename columns (in place: the
+                # freshly parsed frame is not referenced anywhere else)
+                df_mapped = df
+                if rename_dict:
+                    df_mapped.rename(columns=rename_dict, inplace=True)
+                    logger.info(f"Applied column renaming in {file_def['display_name']}: {rename_dict}")
+                
+                # Validation Rule 7: Content rules over every row - the file was accepted on
+                # its first rows, so rows failing later are reported rather than silently dropped
+                content_report = self._validate_data_content(df_mapped, file_key, file_def['display_name'])
+                self.last_validation_report[file_key] = content_report
+                for message in content_report['errors']:
+                    logger.warning(message.replace('❌', '⚠️', 1))
+                
+                # Validation Rule 8: Apply file-specific filtering rules
                 df_filtered, filter_info = self._apply_filtering_rules(df_mapped, file_key, file_def['display_name'])
                 if filter_info['filtered_count'] > 0:
                     logger.info(f"📝 {file_def['display_name']}: {filter_info['message']}")
@@ -163,10 +255,9 @@ class DataProcessor:
                 logger.error(f"Error processing {file_def['display_name']}: {str(e)}")
         
         # Final validation: Check if all required files passed validation
-        required_files = ['send_mails', 'open_mails', 'contacts']  # Removed 'account_history'
         validated_files = list(mapped_dataframes.keys())
         
-        is_valid = len(error_messages) == 0 and all(f in validated_files for f in required_files)
+        is_valid = len(error_messages) == 0 and all(f in validated_files for f in required_roles)
         
         if is_valid:
             logger.info("🎉 All sheets validation passed successfully!")
@@ -175,91 +266,186 @@ class DataProcessor:
             
         return is_valid, error_messages, mapped_dataframes
     
-    def _validate_data_content(self, df, file_key, display_name):
+    def _column_renames(self, available_columns, mapping, display_name):
+        """
+        Resolve a file's user columns against its column mapping.
+        
+        Returns:
+            dict: {user_column: system_column} renames to apply (direct matches excluded)
+        """
+        mapped_columns = {}
+        
+        for user_column, system_column in mapping.items():
+            if user_column in available_columns:
+                mapped_columns[user_column] = system_column
+                logger.info(f"✅ Mapped '{user_column}' → '{system_column}' in {display_name}")
+            elif system_column in available_columns:
+                # Check if the system column exists directly (backward compatibility)
+                mapped_columns[system_column] = system_column
+                logger.info(f"✅ Found direct match '{system_column}' in {display_name}")
+        
+        return {user_col: sys_col for user_col, sys_col in mapped_columns.items() if user_col != sys_col}
+    
+    def _validate_data_content(self, df, file_key, display_name, row_offset=0):
         """
-        Validate the actual data content within each file
+        Validate the actual data content within each file, over every row of df
+        (vectorized date parsing, regex email checks, to_numeric coercion).
+        
+        Args:
+            row_offset: Data rows of the file before df (when df is a chunk)
+        
+        Returns:
+            dict: is_valid, errors, and rules - one entry per check with the
+                  offending row count, the first VALIDATION_REPORT_ROWS row
+                  numbers (spreadsheet numbering: header is row 1) and its message
         """
         errors = []
+        rules = []
+        
+        def record(rule, column, invalid, message):
+            invalid_pos = np.flatnonzero(np.asarray(invalid))
+            rows = (invalid_pos[:self.VALIDATION_REPORT_ROWS] + row_offset + 2).tolist()
+            entry = {'rule': rule, 'column': column, 'count': len(invalid_pos), 'rows': rows, 'message': message}
+            rules.append(entry)
+            if len(invalid_pos) > 0:
+                errors.append(self._rule_error(entry))
         
         try:
             # Date format validation for files with date columns
             if file_key in ['send_mails', 'open_mails']:
                 if 'sent_date' in df.columns:
                     # Check if sent_date can be parsed
-                    date_errors = 0
-                    for idx, date_val in df['sent_date'].head(10).items():  # Check first 10 rows
-                        if pd.isna(date_val):
-                            date_errors += 1
-                            continue
-                        try:
-                            pd.to_datetime(date_val, format='%d/%m/%Y %H:%M:%S', errors='raise')
-                        except:
-                            try:
-                                pd.to_datetime(date_val, errors='raise')  # Try general parsing
-                            except:
-                                date_errors += 1
-                    
-                    if date_errors > 0:
-                        errors.append(f"❌ **Date Format Error** in {display_name}: {date_errors} rows have invalid date format in 'sent_date'. Expected: DD/MM/YYYY HH:MM:SS")
+                    record('date_format', 'sent_date', self._invalid_dates(df['sent_date']),
+                           f"❌ **Date Format Error** in {display_name}: {{count}} rows have invalid date format in 'sent_date'. Expected: DD/MM/YYYY HH:MM:SS")
             
             # elif file_key == 'account_history':
             #     if 'Edit Date' in df.columns:
             #         # Check Edit Date format
-            #         date_errors = 0
-            #         for idx, date_val in df['Edit Date'].head(10).items():
-            #             if pd.isna(date_val):
-            #                 date_errors += 1
-            #                 continue
-            #             try:
-            #                 pd.to_datetime(date_val, format='%d/%m/%Y %H:%M:%S', errors='raise')
-            #             except:
-            #                 try:
-            #                     pd.to_datetime(date_val, errors='raise')
-            #                 except:
-            #                     date_errors += 1
-            #         
-            #         if date_errors > 0:
-            #             errors.append(f"❌ **Date Format Error** in {display_name}: {date_errors} rows have invalid date format in 'Edit Date'. Expected: DD/MM/YYYY HH:MM:SS")
+            #         record('date_format', 'Edit Date', self._invalid_dates(df['Edit Date']),
+            #                f"❌ **Date Format Error** in {display_name}: {{count}} rows have invalid date format in 'Edit Date'. Expected: DD/MM/YYYY HH:MM:SS")
             
             # Email format validation
-            if file_key == 'send_mails' and 'Recipient Email' in df.columns:
-                invalid_emails = 0
-                for idx, email_val in df['Recipient Email'].head(10).items():
-                    if pd.isna(email_val) or '@' not in str(email_val):
-                        invalid_emails += 1
-                
-                if invalid_emails > 0:
-                    errors.append(f"❌ **Email Format Error** in {display_name}: {invalid_emails} rows have invalid email format in 'Recipient Email'")
-            
-            elif file_key == 'contacts' and 'Email' in df.columns:
-                invalid_emails = 0
-                for idx, email_val in df['Email'].head(10).items():
-                    if pd.isna(email_val) or '@' not in str(email_val):
-                        invalid_emails += 1
-                
-                if invalid_emails > 0:
-                    errors.append(f"❌ **Email Format Error** in {display_name}: {invalid_emails} rows have invalid email format in 'Email'")
+            email_column = {'send_mails': 'Recipient Email', 'contacts': 'Email'}.get(file_key)
+            if email_column and email_column in df.columns:
+                # Regex per distinct address (recipients repeat across sends); missing → code -1
+                email_codes, distinct_emails = pd.factorize(df[email_column].to_numpy(dtype=object))
+                match_email = re.compile(self.EMAIL_PATTERN).match
+                distinct_valid = np.array([match_email(str(email)) is not None for email in distinct_emails] + [False])
+                valid_email = distinct_valid[email_codes]
+                record('email_format', email_column, ~valid_email,
+                       f"❌ **Email Format Error** in {display_name}: {{count}} rows have invalid email format in '{email_column}'")
             
             # Numeric validation for open_mails
             if file_key == 'open_mails':
                 for col in ['Views', 'Clicks']:
                     if col in df.columns:
-                        non_numeric = 0
-                        for idx, val in df[col].head(10).items():
-                            if pd.isna(val):
-                                continue
-                            try:
-                                float(val)
-                            except:
-                                non_numeric += 1
-                        
-                        if non_numeric > 0:
-                            errors.append(f"❌ **Numeric Format Error** in {display_name}: {non_numeric} rows have non-numeric values in '{col}'")
+                        non_numeric = df[col].notna() & pd.to_numeric(df[col], errors='coerce').isna()
+                        record('numeric_format', col, non_numeric,
+                               f"❌ **Numeric Format Error** in {display_name}: {{count}} rows have non-numeric values in '{col}'")
             
-            return {'is_valid': len(errors) == 0, 'errors': errors}
+            return {'is_valid': len(errors) == 0, 'errors': errors, 'rules': rules}
             
         except Exception as e:
-            return {'is_valid': False, 'errors': [f"❌ **Data Validation Error** in {display_name}: {str(e)}"]}
+            return {'is_valid': False, 'errors': [f"❌ **Data Validation Error** in {display_name}: {str(e)}"], 'rules': rules}
+    
+    def _rule_error(self, entry):
+        """Error message of a failed content rule, with its first row numbers"""
+        more = ', ...' if entry['count'] > len(entry['rows']) else ''
+        return f"{entry['message'].format(count=entry['count'])} (rows {', '.join(map(str, entry['rows']))}{more})"
+    
+    def _merge_validation_reports(self, reports):
+        """
+        Combine the content reports of consecutive chunks of one file (row numbers
+        already offset): counts add up, row numbers keep the first ones.
+        """
+        merged = {}
+        other_errors = []
+        for report in reports:
+            if report is None:
+                continue
+            for entry in report['rules']:
+                key = (entry['rule'], entry['column'])
+                if key not in merged:
+                    merged[key] = dict(entry, rows=list(entry['rows']))
+                else:
+                    merged[key]['count'] += entry['count']
+                    merged[key]['rows'] = (merged[key]['rows'] + entry['rows'])[:self.VALIDATION_REPORT_ROWS]
+            # A chunk whose checks raised has no failing rule behind its error
+            if not report['is_valid'] and not any(entry['count'] for entry in report['rules']):
+                other_errors.extend(report['errors'])
+        
+        rules = list(merged.values())
+        errors = [self._rule_error(entry) for entry in rules if entry['count'] > 0] + other_errors
+        return {'is_valid': len(errors) == 0, 'errors': errors, 'rules': rules}
+    
+    def _invalid_dates(self, dates):
+        """
+        Mask of values that parse neither as DD/MM/YYYY HH:MM:SS nor as a general
+        date (missing values count as invalid). Each step only sees the values the
+        cheaper ones rejected; the per-value parse runs on distinct leftovers only.
+        """
+        if pd.api.types.is_datetime64_any_dtype(dates):
+            return dates.isna().values
+        
+        values = dates.to_numpy(dtype=object)
+        missing = pd.isna(values)
+        strings = values[~missing]
+        remaining = ~matches_layout(strings, SEND_DATE_FORMAT)
+        for date_format in OPEN_DATE_FORMATS:
+            if remaining.any():
+                remaining[remaining] = ~matches_layout(strings[remaining], date_format)
+        if remaining.any():
+            remaining[remaining] = pd.to_datetime(pd.Series(strings[remaining]).astype(str), errors='coerce').isna().values
+        if remaining.any():
+            # Same per-value rule as before: the expected format, then general parsing
+            leftovers = pd.Series(strings[remaining]).astype(str)
+            unparseable = set()
+            for value in pd.unique(leftovers.values):
+                try:
+                    pd.to_datetime(value, format='%d/%m/%Y %H:%M:%S', errors='raise')
+                except Exception:
+                    try:
+                        pd.to_datetime(value, errors='raise')
+                    except Exception:
+                        unparseable.add(value)
+            remaining[remaining] = leftovers.isin(unparseable).values
+        
+        invalid = missing.copy()
+        invalid[~missing] = remaining
+        return invalid
+    
+    def _split_recipients(self, names, explode=False):
+        """
+        Split comma-separated recipient lists once per distinct value. Each row keeps
+        its first (stripped) name, or with explode one entry per distinct non-empty
+        name in its list; the entries are computed with numpy only, so the cost is
+        linear in their number. Callers expand the rows with a take on source rows.
+        
+        Returns:
+            tuple: (int32 source row per entry, object array of recipient names)
+        """
+        codes, uniques = pd.factorize(names.to_numpy(dtype=object))
+        
+        if not explode:
+            # Trailing NaN slot: code -1 (missing name) stays missing
+            first_names = [str(value).strip().split(',', 1)[0].strip() for value in uniques] + [np.nan]
+            return np.arange(len(codes), dtype=np.int32), np.array(first_names, dtype=object)[codes]
+        
+        name_lists = []
+        for value in uniques:
+            stripped = [part.strip() for part in str(value).split(',')]
+            name_lists.append(list(dict.fromkeys(part for part in stripped if part)) or stripped[:1])
+        name_lists.append([np.nan])
+        
+        counts = np.array([len(name_list) for name_list in name_lists], dtype=np.int64)
+        flat_names = np.array([name for name_list in name_lists for name in name_list], dtype=object)
+        offsets = np.cumsum(counts) - counts
+        
+        row_counts = counts[codes]
+        source_rows = np.repeat(np.arange(len(codes), dtype=np.int32), row_counts)
+        row_starts = np.cumsum(row_counts) - row_counts
+        within_row = np.arange(len(source_rows)) - np.repeat(row_starts, row_counts)
+        return source_rows, flat_names[np.repeat(offsets[codes], row_counts) + within_row]
     
     def _apply_filtering_rules(self, df, file_key, display_name):
         """
@@ -267,6 +453,7 @@ class DataProcessor:
         """
         original_count = len(df)
         filtered_count = 0
+        expanded_count = 0  # Rows added by exploding multi-recipient Opens
         filter_messages = []
         
         try:
@@ -275,8 +462,10 @@ class DataProcessor:
                 # Rule 1: Remove records with "loopwork.co" in Domain column
                 if 'Domain' in df.columns:
                     before_filter = len(df)
-                    # Case-insensitive filtering for "loopwork.co"
-                    df = df[~df['Domain'].str.lower().str.contains('loopwork.co', na=False)]
+                    # Case-insensitive filtering for "loopwork.co" (rows are only copied if any match)
+                    loopwork_rows = df['Domain'].str.lower().str.contains('loopwork.co', na=False)
+                    if loopwork_rows.any():
+                        df = df[~loopwork_rows]
                     after_filter = len(df)
                     loopwork_filtered = before_filter - after_filter
                     
@@ -290,8 +479,8 @@ class DataProcessor:
                 # Rule 2: Keep sent_date as-is (no time adjustment)
                 if 'sent_date' in df.columns:
                     try:
-                        # Convert to datetime if not already (for validation only)
-                        df['sent_date'] = pd.to_datetime(df['sent_date'], format='%d/%m/%Y %H:%M:%S', errors='coerce')
+                        # Convert to datetime if not already (already parsed by the read schema for clean files)
+                        df['sent_date'] = parse_datetimes(df['sent_date'], SEND_DATE_FORMAT)
                         
                         # Count valid dates
                         valid_dates = df['sent_date'].notna().sum()
@@ -328,33 +517,30 @@ class DataProcessor:
             
             # Open Mails CSV filtering rules
             elif file_key == 'open_mails':
-                # Rule 1: Split recipient_name by comma and take first value
+                # Rule 1: Split recipient_name by comma and take the first value
+                # (explode mode: one Open event per recipient instead)
+                # Example: "Breanna Hughes,Bailee Cooper,Harshit Gupta" -> "Breanna Hughes"
                 if 'recipient_name' in df.columns:
                     try:
                         # Store original values for comparison
                         original_sample = df['recipient_name'].dropna().head(3).tolist()
                         
-                        # Clean the recipient_name column by splitting on comma and taking first part
-                        def clean_recipient_comma_split(value):
-                            if pd.isna(value):
-                                return value
-                            
-                            value_str = str(value).strip()
-                            
-                            if ',' in value_str:
-                                # Split by ',' and take the first part
-                                # Example: "Breanna Hughes,Bailee Cooper,Harshit Gupta" -> "Breanna Hughes"
-                                first_part = value_str.split(',', 1)[0]
-                                # Trim spaces from the first part
-                                first_part = first_part.strip()
-                                return first_part
-                            else:
-                                # No ',' found, return the original value
-                                # Example: "John Doe" -> "John Doe"
-                                return value_str
-                        
-                        # Apply the cleaning function
-                        df['recipient_name'] = df['recipient_name'].apply(clean_recipient_comma_split)
+                        explode = self.open_recipient_mode == 'explode'
+                        source_rows, recipients = self._split_recipients(df['recipient_name'], explode=explode)
+                        if len(source_rows) != len(df):
+                            # Each event is a full copy of its Open row; the email's counters
+                            # stay on the first recipient's event so totals are not multiplied
+                            expanded_count = len(source_rows) - len(df)
+                            df = df.take(source_rows).reset_index(drop=True)
+                            extra_recipient = np.zeros(len(source_rows), dtype=bool)
+                            extra_recipient[1:] = source_rows[1:] == source_rows[:-1]
+                            for col in self.OPEN_COUNTER_COLUMNS:
+                                if col in df.columns:
+                                    df[col] = df[col].mask(extra_recipient & df[col].notna().values, 0)
+                            multi_recipient_rows = int((np.bincount(source_rows) > 1).sum())
+                            filter_messages.append(f"Expanded {multi_recipient_rows} multi-recipient opens into one open per recipient ({len(df)} opens)")
+                            logger.info(f"📝 {display_name}: Expanded {multi_recipient_rows} multi-recipient opens into {len(df)} open events")
+                        df['recipient_name'] = recipients
                         
                         # Get cleaned sample for comparison
                         cleaned_sample = df['recipient_name'].dropna().head(3).tolist()
@@ -362,11 +548,12 @@ class DataProcessor:
                         # Count how many values were processed
                         processed_count = df['recipient_name'].notna().sum()
                         
-                        filter_messages.append(f"Split and extracted first names from {processed_count} recipient_name values")
+                        if not explode:
+                            filter_messages.append(f"Split and extracted first names from {processed_count} recipient_name values")
                         logger.info(f"📝 {display_name}: Split {processed_count} recipient_name values by comma")
                         
                         # Log before/after examples for verification
-                        if len(original_sample) > 0 and len(cleaned_sample) > 0:
+                        if len(original_sample) > 0 and len(cleaned_sample) > 0 and not explode:
                             logger.info(f"📝 {display_name}: Recipient name comma-split examples:")
                             for i, (orig, cleaned) in enumerate(zip(original_sample, cleaned_sample)):
                                 # Check if value was changed
@@ -379,34 +566,20 @@ class DataProcessor:
                 else:
                     logger.warning(f"📝 {display_name}: 'recipient_name' column not found, skipping recipient name splitting")
                 
-                # Rule 2: Convert sent_date format from "Jul 3, 2025, 02:14:21" to "DD/MM/YYYY HH:MM:SS"
+                # Rule 2: Parse sent_date ("Jul 3, 2025, 02:14:21", ISO or any general date) once to datetime
                 if 'sent_date' in df.columns:
                     try:
                         # Store original values for comparison
                         original_sample = df['sent_date'].dropna().head(3).tolist()
                         
-                        # Convert date format
-                        def convert_date_format(value):
-                            if pd.isna(value):
-                                return value
-                            
-                            value_str = str(value).strip()
-                            
-                            try:
-                                # Parse the original format: "Jul 3, 2025, 02:14:21"
-                                # This handles various month name formats
-                                parsed_date = pd.to_datetime(value_str, errors='raise')
-                                
-                                # Convert to DD/MM/YYYY HH:MM:SS format
-                                formatted_date = parsed_date.strftime('%d/%m/%Y %H:%M:%S')
-                                return formatted_date
-                                
-                            except Exception as parse_error:
-                                logger.warning(f"📝 {display_name}: Could not parse date '{value_str}': {str(parse_error)}")
-                                return value_str  # Return original if parsing fails
-                        
-                        # Apply the conversion function
-                        df['sent_date'] = df['sent_date'].apply(convert_date_format)
+                        # Known export formats are decoded vectorized; other values are parsed one
+                        # distinct value at a time, kept in whole seconds as the DD/MM/YYYY HH:MM:SS
+                        # round-trip did
+                        df['sent_date'], unparsed = parse_general_datetimes(df['sent_date'], OPEN_DATE_FORMATS)
+                        for value in unparsed[:self.VALIDATION_REPORT_ROWS]:
+                            logger.warning(f"📝 {display_name}: Could not parse date '{value}'")
+                        if len(unparsed) > self.VALIDATION_REPORT_ROWS:
+                            logger.warning(f"📝 {display_name}: ... {len(unparsed) - self.VALIDATION_REPORT_ROWS} more unparseable sent_date values")
                         
                         # Get converted sample for comparison
                         converted_sample = df['sent_date'].dropna().head(3).tolist()
@@ -414,16 +587,14 @@ class DataProcessor:
                         # Count how many values were processed
                         processed_count = df['sent_date'].notna().sum()
                         
-                        filter_messages.append(f"Converted {processed_count} sent_date values to DD/MM/YYYY HH:MM:SS format")
-                        logger.info(f"📝 {display_name}: Converted {processed_count} sent_date values to standard format")
+                        filter_messages.append(f"Converted {processed_count} sent_date values to datetime")
+                        logger.info(f"📝 {display_name}: Converted {processed_count} sent_date values to datetime")
                         
                         # Log before/after examples for verification
                         if len(original_sample) > 0 and len(converted_sample) > 0:
                             logger.info(f"📝 {display_name}: Date format conversion examples:")
                             for i, (orig, converted) in enumerate(zip(original_sample, converted_sample)):
-                                # Check if value was changed
-                                change_indicator = " (🔄 CONVERTED)" if orig != converted else " (✅ ALREADY CORRECT)"
-                                logger.info(f"📝   Example {i+1}: '{orig}' → '{converted}'{change_indicator}")
+                                logger.info(f"📝   Example {i+1}: '{orig}' → '{converted:%d/%m/%Y %H:%M:%S}'")
                         
                     except Exception as e:
                         logger.error(f"📝 {display_name}: Error converting sent_date format: {str(e)}")
@@ -468,7 +639,7 @@ class DataProcessor:
             #     # Add Account History filtering rules
             
             # Prepare filter info
-            total_filtered = original_count - len(df)
+            total_filtered = original_count + expanded_count - len(df)
             if total_filtered > 0:
                 message = f"Filtered out {total_filtered} records total. Details: {'; '.join(filter_messages)}"
             else:
@@ -478,6 +649,7 @@ class DataProcessor:
                 'original_count': original_count,
                 'final_count': len(df),
                 'filtered_count': total_filtered,
+                'expanded_count': expanded_count,
                 'message': message,
                 'details': filter_messages
             }
@@ -499,6 +671,25 @@ class DataProcessor:
         """
         Process uploaded CSV files and return joined data with failed records and intermediate datasets
         """
+        if self.result_cache is None:
+            result = self._process_files(files)
+        else:
+            key_parts = tuple(input_digest(files.get(role)) for role in self.FILE_ROLES)
+            result = self._cached_run('email_pipeline', key_parts, lambda: self._process_files(files),
+                                      lambda result: result[0] is not None and not result[2])
+        
+        successful_df, final_failed_df = result[0], result[1]
+        if successful_df is not None and not result[2]:
+            try:
+                self._save_outputs(successful_df, final_failed_df)
+            except Exception as e:
+                logger.error(f"Error processing files: {str(e)}")
+                return None, None, [f"❌ **Processing Error**: {str(e)}"], 0, None, None
+        return result
+    
+    def _process_files(self, files):
+        """Validate, clean and join the Send, Open and contacts files (uncached, nothing written)"""
+        memory = MemoryReport()
         try:
             # Step 1: Comprehensive validation and column mapping
             is_valid, error_messages, mapped_dataframes = self.sheets_validator(files)
@@ -513,6 +704,7 @@ class DataProcessor:
             open_df = mapped_dataframes['open_mails']
             contacts_df = mapped_dataframes['contacts']
             # account_history_df = mapped_dataframes['account_history']
+            memory.record('loaded', send_df, open_df, contacts_df)
             
             # Store original Send Mails count for KPI calculations
             original_send_count = len(send_df)
@@ -526,9 +718,11 @@ class DataProcessor:
             contacts_df = self._clean_data(contacts_df, 'contacts')
             # account_history_df = self._clean_data(account_history_df, 'account_history')
             # opportunity_details_df = self._clean_data(opportunity_details_df, 'opportunity_details')
+            memory.record('cleaned', send_df, open_df, contacts_df)
             
             # Perform incremental datetime join (send + open)
             send_open_successful, send_open_failed = self._join_send_open(send_df, open_df)
+            memory.record('send_open_joined', send_df, open_df, contacts_df, send_open_successful)
             
             if send_open_successful is None:
                 return None, None, ["❌ **Join Error**: Failed to join Send Mails and Open Mails data"], original_send_count, None, None
@@ -546,13 +740,9 @@ class DataProcessor:
                 contacts_successful, contacts_failed = contacts_result
             
             # Combine all failed records
-            all_failed = []
-            if len(send_open_failed) > 0:
-                all_failed.extend(send_open_failed.to_dict('records'))
-            if len(contacts_failed) > 0:
-                all_failed.extend(contacts_failed.to_dict('records'))
-            
-            final_failed_df = pd.DataFrame(all_failed) if all_failed else pd.DataFrame()
+            all_failed = [failed for failed in (send_open_failed, contacts_failed) if len(failed) > 0]
+            final_failed_df = pd.concat(all_failed, ignore_index=True) if all_failed else pd.DataFrame()
+            memory.record('contacts_joined', send_df, open_df, contacts_df, send_open_successful, contacts_successful, final_failed_df)
             
             # Integrate Account History data - COMMENTED OUT
             # if len(contacts_successful) > 0:
@@ -564,25 +754,8 @@ class DataProcessor:
             
             successful_df = contacts_successful
             
-            # Save output files
-            timestamp = pd.Timestamp.now().strftime('%Y%m%d_%H%M%S')
-            
-            # Save successful matches
-            if len(successful_df) > 0:
-                successful_filename = f"successful_joins_{timestamp}.csv"
-                successful_path = os.path.join('outputs', successful_filename)
-                os.makedirs('outputs', exist_ok=True)
-                successful_df.to_csv(successful_path, index=False)
-                logger.info(f"Saved {len(successful_df)} successful matches to {successful_path}")
-            
-            # Save failed records
-            if len(final_failed_df) > 0:
-                failed_filename = f"failed_records_{timestamp}.csv"
-                failed_path = os.path.join('outputs', failed_filename)
-                os.makedirs('outputs', exist_ok=True)
-                final_failed_df.to_csv(failed_path, index=False)
-                logger.info(f"Saved {len(final_failed_df)} failed records to {failed_path}")
-            
+            self.last_memory_stats = memory.as_dict()
+            memory.log_summary('process_files')
             logger.info(f"Successfully processed files: {len(successful_df)} successful, {len(final_failed_df)} failed")
             # Return: successful_df, failed_df, validation_errors, original_send_count, send_df, send_open_successful
             return successful_df, final_failed_df, [], original_send_count, send_df, send_open_successful
@@ -591,13 +764,34 @@ class DataProcessor:
             logger.error(f"Error processing files: {str(e)}")
             return None, None, [f"❌ **Processing Error**: {str(e)}"], 0, None, None  # Return None for intermediate datasets on error
     
+    def _save_outputs(self, successful_df, final_failed_df):
+        """Save successful matches and failed records to timestamped CSVs in outputs/"""
+        timestamp = pd.Timestamp.now().strftime('%Y%m%d_%H%M%S')
+        
+        # Save successful matches
+        if len(successful_df) > 0:
+            successful_filename = f"successful_joins_{timestamp}.csv"
+            successful_path = os.path.join('outputs', successful_filename)
+            os.makedirs('outputs', exist_ok=True)
+            successful_df.to_csv(successful_path, index=False)
+            logger.info(f"Saved {len(successful_df)} successful matches to {successful_path}")
+        
+        # Save failed records
+        if len(final_failed_df) > 0:
+            failed_filename = f"failed_records_{timestamp}.csv"
+            failed_path = os.path.join('outputs', failed_filename)
+            os.makedirs('outputs', exist_ok=True)
+            final_failed_df.to_csv(failed_path, index=False)
+            logger.info(f"Saved {len(final_failed_df)} failed records to {failed_path}")
+    
     def _load_csv(self, file, file_type):
         """Load CSV file with error handling"""
         try:
             if file is None:
                 return None
             
-            df = pd.read_csv(file)
+            schema = self.read_schemas.get(self.FILE_TYPE_ROLES.get(file_type))
+            df, _ = read_csv_with_schema(file, schema) if schema else read_csv_sniffed(file)
             logger.info(f"Loaded {file_type} CSV: {len(df)} rows, {len(df.columns)} columns")
             return df
             
@@ -616,18 +810,20 @@ class DataProcessor:
         return True
     
     def _clean_data(self, df, file_type):
-        """Clean and standardize data"""
-        df = df.copy()
-        
-        # Convert date columns with correct format DD/MM/YYYY HH:MM:SS
+        """
+        Clean and standardize data. Columns are replaced on the given frame, which
+        callers own (freshly parsed or filtered), instead of copying it first.
+        """
+        # Convert date columns with correct format DD/MM/YYYY HH:MM:SS (columns already
+        # parsed by the read schema or the filtering rules are kept as they are)
         if 'sent_date' in df.columns:
-            df['sent_date'] = pd.to_datetime(df['sent_date'], format='%d/%m/%Y %H:%M:%S', errors='coerce')
+            df['sent_date'] = parse_datetimes(df['sent_date'], SEND_DATE_FORMAT)
         
         # if 'Edit Date' in df.columns:
         #     df['Edit Date'] = pd.to_datetime(df['Edit Date'], format='%d/%m/%Y %H:%M:%S', errors='coerce')
             
         if 'Created Date' in df.columns:
-            df['Created Date'] = pd.to_datetime(df['Created Date'], format='%d/%m/%Y %H:%M:%S', errors='coerce')
+            df['Created Date'] = parse_datetimes(df['Created Date'], SEND_DATE_FORMAT)
         
         # Clean recipient names
         if 'recipient_name' in df.columns:
@@ -651,17 +847,16 @@ class DataProcessor:
             if 'Amount' in df.columns:
                 df['Amount'] = pd.to_numeric(df['Amount'], errors='coerce').fillna(0)
         
-        # Remove rows with null key columns
-        if file_type == 'send':
-            df = df.dropna(subset=['recipient_name', 'sent_date'])
-        elif file_type == 'open':
-            df = df.dropna(subset=['recipient_name', 'sent_date'])
-        # elif file_type == 'account_history':
-        #     df = df.dropna(subset=['Edit Date', 'Company URL'])
-        elif file_type == 'contacts':
-            df = df.dropna(subset=['Email'])
-        elif file_type == 'opportunity_details':
-            df = df.dropna(subset=['Company URL', 'Amount', 'Created Date'])
+        # Remove rows with null key columns (rows are only copied if any are null)
+        key_columns = {
+            'send': ['recipient_name', 'sent_date'],
+            'open': ['recipient_name', 'sent_date'],
+            # 'account_history': ['Edit Date', 'Company URL'],
+            'contacts': ['Email'],
+            'opportunity_details': ['Company URL', 'Amount', 'Created Date']
+        }.get(file_type)
+        if key_columns and df[key_columns].isna().values.any():
+            df = df.dropna(subset=key_columns)
         
         logger.info(f"Cleaned {file_type} data: {len(df)} rows remaining")
         return df
@@ -676,13 +871,23 @@ class DataProcessor:
             
         Returns: (final_successful_df, failed_df, errors)
         """
+        if self.result_cache is None:
+            return self._process_multi_sdr_combined(combined_send_open_df, contacts_file)
+        key_parts = (frame_digest(combined_send_open_df), input_digest(contacts_file))
+        return self._cached_run('contacts_join', key_parts,
+                                lambda: self._process_multi_sdr_combined(combined_send_open_df, contacts_file),
+                                lambda result: not result[2])
+    
+    def _process_multi_sdr_combined(self, combined_send_open_df, contacts_file):
+        """Contacts join of the combined Send-Open data (uncached)"""
+        memory = MemoryReport()
         try:
-            # Load and validate contacts
-            contacts_df = pd.read_csv(contacts_file)
-            contacts_df = self._clean_data(contacts_df, 'contacts')
+            # Load cleaned contacts and their email index (cached across runs)
+            contacts_df, contacts_index, contacts_first_pos = self._load_contacts(contacts_file)
+            memory.record('contacts_loaded', combined_send_open_df, contacts_df)
             
             # Join combined Send-Open data with contacts
-            contacts_result = self._join_with_contacts(combined_send_open_df, contacts_df)
+            contacts_result = self._join_with_contacts(combined_send_open_df, contacts_df, (contacts_index, contacts_first_pos))
             
             # Check if contacts join returned an error
             if len(contacts_result) == 3:
@@ -691,6 +896,9 @@ class DataProcessor:
             else:
                 # Success case
                 contacts_successful, contacts_failed = contacts_result
+                memory.record('contacts_joined', combined_send_open_df, contacts_df, contacts_successful, contacts_failed)
+                self.last_memory_stats = memory.as_dict()
+                memory.log_summary('Contacts join')
                 return contacts_successful, contacts_failed, []
                 
         except Exception as e:
@@ -701,24 +909,32 @@ class DataProcessor:
         """
         Process a single SDR's Send and Open files, performing just the Send-Open join.
         This is used for multi-SDR processing where each SDR is joined individually.
+        Identical Send and Open contents reuse the cached result (not with
+        incremental join state, whose runs depend on earlier ones).
         
         Returns: (send_open_joined_df, failed_df, errors)
         """
+        if self.result_cache is None or self.join_state_dir:
+            return self._process_single_sdr(send_file, open_file, sdr_name)
+        key_parts = (input_digest(send_file), input_digest(open_file), sdr_name)
+        return self._cached_run('send_open_join', key_parts,
+                                lambda: self._process_single_sdr(send_file, open_file, sdr_name),
+                                lambda result: not result[2])
+    
+    def _process_single_sdr(self, send_file, open_file, sdr_name):
+        """Validate, clean and Send-Open join one SDR's files (uncached)"""
+        memory = MemoryReport()
         try:
-            # Step 1: Validate Send and Open files only
+            # Step 1: Validate Send and Open files only (contacts are joined later, once)
             files = {
                 'send_mails': send_file,
-                'open_mails': open_file,
-                'contacts': 'data/contacts.csv'  # Dummy, just for validation to pass
+                'open_mails': open_file
             }
             
-            is_valid, error_messages, mapped_dataframes = self.sheets_validator(files)
+            is_valid, error_messages, mapped_dataframes = self.sheets_validator(files, required_roles=self.SDR_FILE_ROLES)
             
             if not is_valid:
-                # Filter out contacts-related errors since we're not using it here
-                relevant_errors = [e for e in error_messages if 'Contacts' not in e]
-                if relevant_errors:
-                    return None, None, relevant_errors
+                return None, None, error_messages
             
             # Step 2: Extract Send and Open dataframes
             send_df = mapped_dataframes.get('send_mails')
@@ -726,13 +942,18 @@ class DataProcessor:
             
             if send_df is None or open_df is None:
                 return None, None, ["Missing Send or Open data after validation"]
+            memory.record('loaded', send_df, open_df)
             
             # Step 3: Clean data
             send_df = self._clean_data(send_df, 'send')
             open_df = self._clean_data(open_df, 'open')
+            memory.record('cleaned', send_df, open_df)
             
-            # Step 4: Perform Send-Open join
-            send_open_successful, send_open_failed = self._join_send_open(send_df, open_df)
+            # Step 4: Perform Send-Open join (delta only when incremental state is enabled)
+            if self.join_state_dir and sdr_name:
+                send_open_successful, send_open_failed = self._ingest_send_open_delta(send_df, open_df, sdr_name)
+            else:
+                send_open_successful, send_open_failed = self._join_send_open(send_df, open_df)
             
             if send_open_successful is None:
                 return None, None, ["Failed to join Send and Open data"]
@@ -743,12 +964,63 @@ class DataProcessor:
                 if len(send_open_failed) > 0:
                     send_open_failed['SDR_Name'] = sdr_name
             
+            memory.record('send_open_joined', send_df, open_df, send_open_successful, send_open_failed)
+            self.last_memory_stats = memory.as_dict()
+            memory.log_summary(f"SDR {sdr_name}" if sdr_name else "Send-Open join")
             return send_open_successful, send_open_failed, []
             
         except Exception as e:
             logger.error(f"Error processing single SDR: {str(e)}")
             return None, None, [f"Error: {str(e)}"]
     
+    def process_single_sdr_streaming(self, send_file, open_file, output_file, sdr_name=None, chunk_size=100000, bucket_seconds=86400):
+        """
+        Stream a single SDR's Send-Open join to a CSV without loading either file
+        fully. Peak memory is bounded by chunk_size and the rows in one time
+        bucket (plus a 60-71s overlap) rather than by file size.
+        
+        Args:
+            output_file: CSV path the joined rows are appended to
+            chunk_size: Rows read per CSV chunk
+            bucket_seconds: Width of the on-disk time buckets (at least 71s)
+        
+        Returns: (stats, errors)
+        """
+        try:
+            streaming_join = StreamingSendOpenJoin(self, chunk_size=chunk_size, bucket_seconds=bucket_seconds)
+            stats = streaming_join.run(send_file, open_file, output_file, sdr_name)
+            self.last_join_stats = {'backend': 'streaming', **stats}
+            return stats, []
+            
+        except Exception as e:
+            logger.error(f"Error streaming Send-Open join: {str(e)}")
+            return None, [f"Error: {str(e)}"]
+    
+    def _cached_run(self, stage, key_parts, compute, cacheable):
+        """
+        compute() through the result cache. Keys add the settings that change
+        results; a hit also restores the CACHED_STATS of the run that stored it.
+        
+        Args:
+            stage: Stage name ('validated', 'send_open_join', 'contacts_join')
+            key_parts: Input digests and arguments identifying the run
+            compute: Callable producing the stage result
+            cacheable: Callable(result) → bool; failed runs are not stored
+        """
+        if self.result_cache is None:
+            return compute()
+        key = self.result_cache.key(stage, self.join_backend, self.open_recipient_mode, *key_parts)
+        entry = self.result_cache.get(key)
+        if entry is not None:
+            for name, value in entry['stats'].items():
+                setattr(self, name, value)
+            return entry['result']
+        
+        result = compute()
+        if cacheable(result):
+            self.result_cache.put(key, {'result': result, 'stats': {name: getattr(self, name) for name in self.CACHED_STATS}})
+        return result
+    
     def _join_send_open(self, send_df, open_df):
         """Join send and open dataframes with incremental datetime matching"""
         try:
@@ -758,70 +1030,261 @@ class DataProcessor:
             logger.error(f"Error joining send and open data: {str(e)}")
             return None
     
-    def _incremental_datetime_join(self, send_df, open_df):
+    def _ingest_send_open_delta(self, send_df, open_df, sdr_name):
         """
-        Two-phase incremental datetime matching:
-        Phase 1: 0-11 seconds (fast & safe)
-        Phase 2: 12-60 seconds (on failed records only)
+        Stateful Send-Open join: only rows not seen in earlier runs are matched.
+        
+        Sends are new when their full row was not ingested yet. Opens are keyed
+        on their identity (recipient, sent_date, Subject), because cumulative
+        exports bump Views / Clicks / last_opened on every export: a known Open
+        with new counters updates the stored row in place, which never changes
+        the match (it only reads recipient and sent_date).
+        
+        New rows are re-matched in a time window per recipient, starting
+        OPEN_OVERLAP_SECONDS before its earliest new row (just before the
+        watermark, unless Opens arrive late); earlier Sends keep their stored
+        plan entries (see _windowed_rematch). The state file only grows by this
+        run's delta. The output equals a full join of all ingested rows, with
+        Sends in ingestion order.
+        
+        Returns:
+            tuple: (successful_df, failed_df)
         """
-        logger.info("Starting two-phase incremental datetime matching")
+        start_time = time.time()
+        state = SdrJoinState.load(self.join_state_dir, sdr_name)
+        
+        if not state.is_empty() and not state.is_compatible(send_df, open_df):
+            logger.warning(f"⚠️ Columns changed for {sdr_name}; rebuilding join state from scratch")
+            state = SdrJoinState(sdr_name)
+        
+        # Step 1: Full join on first ingest
+        if state.is_empty():
+            logger.info(f"🆕 No join state for {sdr_name}; running full join")
+            join_plan, backend = self._plan_join(send_df, open_df, self.join_backend, self.join_shards)
+            self.last_join_stats = {'backend': backend, **join_plan['stats']}
+            
+            state.reset(send_df, open_df, join_plan)
+            state.save(self.join_state_dir)
+            
+            self.last_join_stats['incremental'] = {
+                'new_send_rows': len(send_df),
+                'new_open_rows': len(open_df),
+                'updated_open_rows': 0,
+                'late_open_rows': 0,
+                'rematched_recipients': int(send_df['recipient_name'].nunique()),
+                'rematched_sends': 0,
+                'window_send_rows': len(send_df),
+                'watermark': str(state.watermark),
+                'elapsed_seconds': time.time() - start_time
+            }
+            return self._assemble_join(state.send_df, state.open_df, join_plan)
+        
+        # Step 2: Split the export into new Sends, new Opens and Opens with changed counters
+        changes = state.diff(send_df, open_df)
+        new_send = changes['new_send']
+        new_open = changes['new_open']
+        updated_opens = len(changes['open_update_pos'])
+        
+        late_opens = int((new_open['sent_date'] <= state.watermark).sum()) if state.watermark is not None else 0
+        logger.info(f"📥 {sdr_name}: {len(new_send)} new sends, {len(new_open)} new opens ({late_opens} dated before "
+                    f"watermark {state.watermark}), {updated_opens} opens with updated counters")
+        
+        # Step 3: Re-match the window the new rows can affect (new Sends start unmatched)
+        key_columns = ['recipient_name', 'sent_date']
+        n_old_send = len(state.send_df)
+        send_keys = pd.concat([state.send_df[key_columns], new_send[key_columns]], ignore_index=True)
+        open_keys = pd.concat([state.open_df[key_columns], new_open[key_columns]], ignore_index=True)
+        
+        join_plan = new_join_plan(len(send_keys))
+        for field in JOIN_PLAN_FIELDS:
+            join_plan[field][:n_old_send] = state.join_plan[field]
+        was_null = join_plan['phase'][:n_old_send] == 0
+        
+        send_rows, touched, phase_breakdowns, backend = self._rematch_delta(send_keys, open_keys, join_plan, n_old_send,
+                                                                            len(state.open_df), new_send, new_open)
+        rematched_sends = int((was_null & (join_plan['phase'][:n_old_send] > 0)).sum())
+        
+        # Step 4: Apply the delta and append it to the state file
+        state.ingest(changes, send_rows, {field: join_plan[field][send_rows] for field in JOIN_PLAN_FIELDS})
+        state.save(self.join_state_dir)
+        
+        elapsed = time.time() - start_time
+        join_plan['stats'] = join_plan_stats(join_plan, len(open_keys), phase_breakdowns[0], phase_breakdowns[1], elapsed)
+        self.last_join_stats = {'backend': backend, **join_plan['stats']}
+        self.last_join_stats['incremental'] = {
+            'new_send_rows': len(new_send),
+            'new_open_rows': len(new_open),
+            'updated_open_rows': updated_opens,
+            'late_open_rows': late_opens,
+            'rematched_recipients': len(touched),
+            'rematched_sends': rematched_sends,
+            'window_send_rows': len(send_rows),
+            'watermark': str(state.watermark),
+            'elapsed_seconds': elapsed
+        }
+        logger.info(f"🔁 {sdr_name}: re-matched {len(send_rows)} sends of {len(touched)} recipients, "
+                    f"{rematched_sends} NULL-filled sends now matched in {elapsed:.3f}s")
         
-        # Phase 1: 0-11 seconds matching
-        logger.info("Phase 1: Attempting 0-11 second matches")
-        phase1_successful, phase1_failed, used_open_indices = self._phase1_matching(send_df, open_df)
+        return self._assemble_join(state.send_df, state.open_df, state.join_plan)
+    
+    def _rematch_delta(self, send_keys, open_keys, join_plan, n_old_send, n_old_open, new_send, new_open):
+        """
+        Re-match the Sends new rows can affect and scatter the result into join_plan.
         
-        phase1_success_count = len(phase1_successful)
-        phase1_fail_count = len(phase1_failed)
-        phase1_success_rate = (phase1_success_count / len(send_df) * 100) if len(send_df) > 0 else 0
+        Uses the windowed asof match when possible; the iterrows backend and
+        sub-second timestamps re-match the touched recipients' full history.
         
-        logger.info(f"Phase 1 Results: {phase1_success_count} successful ({phase1_success_rate:.1f}%), {phase1_fail_count} failed")
+        Returns:
+            tuple: (re-matched Send positions, touched recipients,
+                    (phase1_breakdown, phase2_breakdown), backend used)
+        """
+        delta_dates = pd.concat([new_send[['recipient_name', 'sent_date']], new_open[['recipient_name', 'sent_date']]])
+        window_start = delta_dates.dropna().groupby('recipient_name')['sent_date'].min()
+        touched = window_start.index
+        
+        if self.join_backend == 'asof':
+            window_start = window_start - pd.Timedelta(seconds=OPEN_OVERLAP_SECONDS)
+            rematch = self._windowed_rematch(send_keys, open_keys, join_plan, n_old_send, n_old_open, window_start)
+            if rematch is not None:
+                send_rows, sub_plan = rematch
+                return send_rows, touched, (sub_plan['stats']['phase1_breakdown'], sub_plan['stats']['phase2_breakdown']), 'asof'
+            logger.warning("Sub-second timestamps found; re-matching touched recipients in full")
+        
+        send_rows = np.flatnonzero(send_keys['recipient_name'].isin(touched).values)
+        open_rows = np.flatnonzero(open_keys['recipient_name'].isin(touched).values)
+        sub_plan, backend = self._plan_join(send_keys.take(send_rows), open_keys.take(open_rows), self.join_backend, self.join_shards)
+        self._scatter_join_plan(join_plan, send_rows, open_rows, sub_plan)
+        return send_rows, touched, (sub_plan['stats']['phase1_breakdown'], sub_plan['stats']['phase2_breakdown']), backend
+    
+    def _windowed_rematch(self, send_keys, open_keys, join_plan, n_old_send, n_old_open, window_start):
+        """
+        Asof re-match of each touched recipient's rows from window_start onwards.
         
-        # Phase 2: 12-60 seconds matching on failed records only
-        phase2_successful = []
-        final_failed = phase1_failed.copy()
+        A new Open changes Phase 1 of Sends up to 11s before it, and so the Opens
+        left for Phase 2 of Sends up to 71s before it; a new Send at most
+        reaches 60s back. Sends before window_start therefore keep their plan
+        entries, and their Phase 1 matches stay consumed inside the window.
+        Whether a recipient has any Opens, or any left after Phase 1, depends on
+        its whole history: recipients where either flips are re-matched in full.
         
-        if phase1_fail_count > 0:
-            logger.info(f"Phase 2: Attempting 12-60 second matches on {phase1_fail_count} failed records")
-            phase2_successful, final_failed = self._phase2_matching(phase1_failed, open_df, used_open_indices)
-            
-            phase2_success_count = len(phase2_successful)
-            logger.info(f"Phase 2 Results: {phase2_success_count} additional successful matches")
+        Returns:
+            tuple: (re-matched Send positions, sub-plan aligned with them),
+                   None if the timestamps are not whole seconds
+        """
+        touched = window_start.index
+        send_touched = send_keys['recipient_name'].isin(touched).values
+        open_touched = open_keys['recipient_name'].isin(touched).values
+        
+        # Opens per recipient, and distinct Opens consumed by Phase 1, before and after the delta
+        old_phase1 = np.flatnonzero((join_plan['phase'][:n_old_send] == 1) & send_touched[:n_old_send])
+        old_usage = self._recipient_open_usage(open_keys['recipient_name'][:n_old_open], open_touched[:n_old_open],
+                                               join_plan['open_pos'][old_phase1])
+        
+        send_rows, open_rows, open_index = self._rematch_window(send_keys, open_keys, join_plan, window_start)
+        window_sends = send_keys.take(send_rows)
+        send_ns = to_int64_ns(window_sends['sent_date'])
+        if not open_index.whole_seconds or (send_ns % NANOS_PER_SECOND).any():
+            return None
         
-        # Combine results from both phases
-        all_successful = phase1_successful + phase2_successful
+        codes = open_index.lookup(window_sends['recipient_name'])
+        found, count, _, open_pos = open_index.search(codes, send_ns, PHASE1_WINDOW)
+        window_phase1 = open_rows[open_pos[found & (count == 1)]]
+        kept_phase1 = join_plan['open_pos'][old_phase1[~np.isin(old_phase1, send_rows)]]
+        usage = self._recipient_open_usage(open_keys['recipient_name'], open_touched, np.concatenate([kept_phase1, window_phase1]))
+        
+        old_usage = old_usage.reindex(usage.index, fill_value=0)
+        flipped = usage.index[((old_usage['total'] > 0) != (usage['total'] > 0))
+                              | ((old_usage['total'] > old_usage['used']) != (usage['total'] > usage['used']))]
+        if len(flipped) > 0:
+            window_start = window_start.copy()
+            window_start[window_start.index.isin(flipped)] = pd.Timestamp.min
+            send_rows, open_rows, open_index = self._rematch_window(send_keys, open_keys, join_plan, window_start)
+            window_sends = send_keys.take(send_rows)
+        
+        recipient_usage = usage.reindex(window_sends['recipient_name'], fill_value=0)
+        recipient_opens = (recipient_usage['total'].values > 0, (recipient_usage['total'] > recipient_usage['used']).values)
+        sub_plan = self.join_engine.match(window_sends, open_index, recipient_opens)
+        self._scatter_join_plan(join_plan, send_rows, open_rows, sub_plan)
+        return send_rows, sub_plan
+    
+    def _rematch_window(self, send_keys, open_keys, join_plan, window_start):
+        """
+        Send / Open positions of touched recipients dated from their window_start
+        on, and an Open index over the window with earlier Sends' Phase 1
+        matches marked consumed.
+        """
+        send_start = window_start.reindex(send_keys['recipient_name']).values
+        open_start = window_start.reindex(open_keys['recipient_name']).values
+        send_rows = np.flatnonzero(send_keys['sent_date'].values >= send_start)
+        open_rows = np.flatnonzero(open_keys['sent_date'].values >= open_start)
+        
+        open_index = OpenIndex(open_keys.take(open_rows))
+        kept = np.ones(len(send_keys), dtype=bool)
+        kept[send_rows] = False
+        consumed = pd.Index(open_rows).get_indexer(join_plan['open_pos'][kept & (join_plan['phase'] == 1)])
+        open_index.mark_consumed(consumed[consumed >= 0])
+        return send_rows, open_rows, open_index
+    
+    def _recipient_open_usage(self, open_recipients, open_touched, consumed_pos):
+        """Per touched recipient: total Opens and distinct Opens consumed (DataFrame with total / used)"""
+        total = open_recipients[open_touched].value_counts()
+        used = open_recipients.take(np.unique(consumed_pos)).value_counts()
+        return pd.DataFrame({'total': total, 'used': used}).fillna(0).astype(np.int64)
+    
+    def _incremental_datetime_join(self, send_df, open_df, backend=None, shards=None):
+        """
+        Two-phase incremental datetime matching:
+        Phase 1: 0-11 seconds (fast & safe)
+        Phase 2: 12-60 seconds (on failed records only)
         
-        # Add ALL unmatched Send records with NULL Open values (Complete LEFT JOIN)
-        unmatched_with_nulls = []
-        for failed_record in final_failed:
-            # Include ALL failed Send records regardless of failure reason
-            # This ensures complete LEFT JOIN: ALL Send records are preserved
-            
-            # Create record with Send data + NULL Open fields
-            record_with_nulls = failed_record.copy()
-            # Remove failure tracking fields
-            record_with_nulls.pop('failure_reason', None)
-            record_with_nulls.pop('match_count', None)
-            
-            # Add NULL Open fields
-            open_fields_to_add = [col for col in open_df.columns if col not in ['recipient_name', 'sent_date']]
-            for field in open_fields_to_add:
-                record_with_nulls[field] = None  # NULL value
-            
-            unmatched_with_nulls.append(record_with_nulls)
+        Both backends produce a join plan (Send row → Open row mapping plus
+        failure_reason codes); the output frame is assembled from it with a
+        single take per source.
+        
+        Args:
+            backend: 'asof' (vectorized sorted-timestamp engine) or 'iterrows'
+                     (per-row scan). Defaults to self.join_backend.
+            shards: Number of recipient hash shards to match in parallel.
+                    Defaults to self.join_shards; 1 matches in-process.
+        """
+        backend = backend or self.join_backend
+        shards = shards or self.join_shards
+        if backend not in self.JOIN_BACKENDS:
+            raise ValueError(f"Unknown join backend '{backend}'. Expected one of: {', '.join(self.JOIN_BACKENDS)}")
+        
+        logger.info(f"Starting two-phase incremental datetime matching ({backend} backend)")
+        
+        join_plan, backend = self._plan_join(send_df, open_df, backend, shards)
+        self.last_join_stats = {'backend': backend, **join_plan['stats']}
         
-        # Combine successful matches + unmatched with NULLs
-        all_records_with_nulls = all_successful + unmatched_with_nulls
+        return self._assemble_join(send_df, open_df, join_plan)
+    
+    def _plan_join(self, send_df, open_df, backend, shards):
+        """Build the join plan in-process or across recipient hash shards"""
+        if shards > 1:
+            return self._sharded_join_plan(send_df, open_df, backend, shards)
+        return self._build_join_plan(send_df, open_df, backend)
+    
+    def _assemble_join(self, send_df, open_df, join_plan):
+        """
+        Build the Send-Open output frames from a join plan aligned with send_df.
         
-        # Update final failed to exclude ALL records we moved to successful (Complete LEFT JOIN)
-        # Since we're including ALL failed Send records in successful with NULLs,
-        # the failed dataset should be empty (true LEFT JOIN behavior)
-        final_failed_excluding_nulls = []
+        Returns:
+            tuple: (successful_df, failed_df)
+        """
+        # Complete LEFT JOIN: ALL Send records are preserved - Phase 1 matches,
+        # then Phase 2 matches, then unmatched records with NULL Open fields
+        phase = join_plan['phase']
+        row_order = np.concatenate([np.flatnonzero(phase == 1), np.flatnonzero(phase == 2), np.flatnonzero(phase == 0)])
         
-        # Create final DataFrames
-        successful_df = pd.DataFrame(all_records_with_nulls) if all_records_with_nulls else pd.DataFrame()
-        failed_df = pd.DataFrame(final_failed_excluding_nulls) if final_failed_excluding_nulls else pd.DataFrame()
+        open_fields_to_add = [col for col in open_df.columns if col not in ['recipient_name', 'sent_date']]
         
-        # Views column is already correct, no renaming needed
+        # Create final DataFrames (failed stays empty: true LEFT JOIN behavior)
+        if len(send_df) > 0:
+            successful_df = self._take_join(send_df, row_order, open_df, join_plan['open_pos'][row_order], open_fields_to_add)
+        else:
+            successful_df = pd.DataFrame()
+        failed_df = pd.DataFrame()
         
         # Log final statistics - Complete LEFT JOIN results
         total_processed = len(send_df)
@@ -829,8 +1292,8 @@ class DataProcessor:
         total_failed = len(failed_df)
         
         # Calculate how many records actually matched with Open data
-        total_matched_with_opens = len(all_successful)  # Records with actual Open data
-        total_with_nulls = len(unmatched_with_nulls)   # Records with NULL Open data
+        total_matched_with_opens = int((phase > 0).sum())  # Records with actual Open data
+        total_with_nulls = int((phase == 0).sum())         # Records with NULL Open data
         match_rate = (total_matched_with_opens / total_processed * 100) if total_processed > 0 else 0
         
         logger.info(f"Complete LEFT JOIN Results:")
@@ -842,84 +1305,238 @@ class DataProcessor:
         
         return successful_df, failed_df
     
-    def _phase1_matching(self, send_df, open_df):
-        """Phase 1: 0-11 second incremental matching"""
-        successful_matches = []
-        failed_records = []
-        used_open_indices = set()  # Track which open records were matched
-        match_stats = {0: 0, 1: 0, 2: 0, 3: 0, 4: 0, 5: 0, 6: 0, 7: 0, 8: 0, 9: 0, 10: 0, 11: 0, 'no_match': 0, 'multiple_match': 0}
+    def _take_join(self, left_df, left_pos, right_df, right_pos, right_columns=None):
+        """
+        Assemble a joined frame with one take per source, keeping column dtypes.
         
-        # Get fields to add from open_df (exclude join keys)
-        open_fields_to_add = [col for col in open_df.columns 
-                            if col not in ['recipient_name', 'sent_date']]
+        Output row i combines left_df row left_pos[i] with right_df row right_pos[i]
+        (right_pos -1 → NULL right fields). Right columns (default: all) overwrite
+        same-named left columns in place, like the previous dict.update() record
+        merging. Both takes produce owned frames, so the right columns are set on
+        the left take instead of concatenating and reordering copies.
+        """
+        right_columns = list(right_df.columns) if right_columns is None else list(right_columns)
+        left = left_df.take(left_pos)
+        left.index = pd.RangeIndex(len(left))
+        
+        if not isinstance(right_df.index, pd.RangeIndex) or right_df.index.start != 0 or right_df.index.step != 1:
+            right_df = right_df.reset_index(drop=True)
+        right = right_df.reindex(index=right_pos, columns=right_columns)
+        right.index = left.index
+        
+        for column in right_columns:
+            left[column] = right[column]
+        return left
+    
+    def _build_join_plan(self, send_df, open_df, backend):
+        """
+        Match Send rows to Open rows with the given backend.
+        
+        Returns:
+            tuple: (join_plan, backend actually used)
+        """
+        # Build the per-recipient Open index once; both phases query it
+        open_index = OpenIndex(open_df)
+        
+        join_plan = None
+        if backend == 'asof':
+            join_plan = self.join_engine.match(send_df, open_index)
+            if join_plan is None:
+                logger.warning("Falling back to iterrows join backend")
+                backend = 'iterrows'
+        
+        if join_plan is None:
+            join_plan = self._iterrows_matching(send_df, open_index)
+        else:
+            self._log_join_plan_stats(join_plan['stats'])
         
-        # Create email-based lookup for performance
-        open_by_email = {}
-        for email in open_df['recipient_name'].unique():
-            open_by_email[email] = open_df[open_df['recipient_name'] == email].copy()
+        return join_plan, backend
+    
+    def _sharded_join_plan(self, send_df, open_df, backend, shards):
+        """
+        Hash-partition Send and Open rows by recipient_name and match each shard
+        in a worker, then merge the shard plans back into one global join plan.
+        
+        Matching never crosses recipients, so every shard is independent and the
+        merged plan is identical to an unsharded run (row order included, since
+        the output is assembled from global Send positions).
+        
+        Returns:
+            tuple: (join_plan, backend actually used)
+        """
+        start_time = time.time()
+        
+        # Step 1: Assign every row to a shard with a stable hash of the recipient
+        send_shard = self._recipient_shards(send_df['recipient_name'], shards)
+        open_shard = self._recipient_shards(open_df['recipient_name'], shards)
+        
+        # Step 2: Ship only the join keys to the workers
+        key_columns = ['recipient_name', 'sent_date']
+        tasks = []
+        shard_rows = []
+        for shard in range(shards):
+            send_rows = np.flatnonzero(send_shard == shard)
+            open_rows = np.flatnonzero(open_shard == shard)
+            shard_rows.append((send_rows, open_rows))
+            tasks.append((shard, backend, send_df[key_columns].take(send_rows), open_df[key_columns].take(open_rows)))
+        
+        results = map_tasks(_join_shard, tasks, executor=self.join_shard_executor, jobs=self.join_shard_jobs, label='join shards')
+        
+        # Step 3: Scatter shard-local plans back to global Send/Open positions
+        join_plan = new_join_plan(len(send_df))
+        phase1_breakdown = {}
+        phase2_breakdown = {}
+        shard_stats = []
+        for (send_rows, open_rows), result in zip(shard_rows, results):
+            shard_plan = result['join_plan']
+            self._scatter_join_plan(join_plan, send_rows, open_rows, shard_plan)
+            
+            for merged, breakdown in ((phase1_breakdown, shard_plan['stats']['phase1_breakdown']),
+                                      (phase2_breakdown, shard_plan['stats']['phase2_breakdown'])):
+                for key, count in breakdown.items():
+                    merged[key] = merged.get(key, 0) + count
+            
+            shard_stats.append({
+                'shard': result['shard'],
+                'backend': result['backend'],
+                'send_rows': len(send_rows),
+                'open_rows': len(open_rows),
+                'elapsed_seconds': result['elapsed_seconds']
+            })
+        
+        if any(stat['backend'] == 'iterrows' for stat in shard_stats):
+            backend = 'iterrows'
+        
+        join_plan['stats'] = join_plan_stats(join_plan, len(open_df), phase1_breakdown, phase2_breakdown, time.time() - start_time)
+        join_plan['stats']['shards'] = shard_stats
+        
+        slowest = max(stat['elapsed_seconds'] for stat in shard_stats)
+        logger.info(f"⚡ Sharded join: {shards} shards matched in {join_plan['stats']['elapsed_seconds']:.3f}s (slowest shard {slowest:.3f}s)")
+        return join_plan, backend
+    
+    def _scatter_join_plan(self, join_plan, send_rows, open_rows, sub_plan):
+        """
+        Copy a join plan computed on a row subset (send_df.take(send_rows) against
+        open_df.take(open_rows)) into the global plan, mapping Open positions back.
+        """
+        matched = sub_plan['open_pos'] >= 0
+        join_plan['open_pos'][send_rows] = -1
+        join_plan['open_pos'][send_rows[matched]] = open_rows[sub_plan['open_pos'][matched]]
+        for field in ('phase', 'increment', 'failure_reason', 'match_count'):
+            join_plan[field][send_rows] = sub_plan[field]
+    
+    def _recipient_shards(self, recipient_names, shards):
+        """Stable shard number per row: hash(recipient_name) mod shards"""
+        hashes = pd.util.hash_pandas_object(recipient_names, index=False).values
+        return (hashes % np.uint64(shards)).astype(np.int64)
+    
+    def _iterrows_matching(self, send_df, open_index):
+        """Run Phase 1 and Phase 2 with the per-row scan backend, returning a join plan"""
+        start_time = time.time()
+        join_plan = new_join_plan(len(send_df))
+        
+        # Phase 1: 0-11 seconds matching
+        logger.info("Phase 1: Attempting 0-11 second matches")
+        phase1_stats = self._phase1_matching(send_df, open_index, join_plan)
+        
+        phase1_success_count = int((join_plan['phase'] == 1).sum())
+        phase1_fail_count = len(send_df) - phase1_success_count
+        phase1_success_rate = (phase1_success_count / len(send_df) * 100) if len(send_df) > 0 else 0
+        
+        logger.info(f"Phase 1 Results: {phase1_success_count} successful ({phase1_success_rate:.1f}%), {phase1_fail_count} failed")
+        
+        # Phase 2: 12-60 seconds matching on failed records only
+        phase2_stats = {}
+        if phase1_fail_count > 0:
+            logger.info(f"Phase 2: Attempting 12-60 second matches on {phase1_fail_count} failed records")
+            phase2_stats = self._phase2_matching(send_df, open_index, join_plan)
+            
+            phase2_success_count = int((join_plan['phase'] == 2).sum())
+            logger.info(f"Phase 2 Results: {phase2_success_count} additional successful matches")
+        
+        join_plan['stats'] = join_plan_stats(join_plan, open_index.n_opens, phase1_stats, phase2_stats, time.time() - start_time)
+        return join_plan
+    
+    def _log_join_plan_stats(self, stats):
+        """Log the match breakdown of a vectorized join plan"""
+        phase1_rate = (stats['phase1_matches'] / stats['send_rows'] * 100) if stats['send_rows'] > 0 else 0
+        logger.info(f"Phase 1 Results: {stats['phase1_matches']} successful ({phase1_rate:.1f}%), {stats['send_rows'] - stats['phase1_matches']} failed")
+        
+        logger.info(f"Phase 1 match breakdown by time increment:")
+        for key, count in stats['phase1_breakdown'].items():
+            if isinstance(key, int) and count > 0:
+                logger.info(f"  +{key} seconds: {count} matches")
+        if stats['phase1_breakdown'].get('no_match', 0) > 0:
+            logger.info(f"  No matches: {stats['phase1_breakdown']['no_match']}")
+        if stats['phase1_breakdown'].get('multiple_match', 0) > 0:
+            logger.info(f"  Multiple matches: {stats['phase1_breakdown']['multiple_match']}")
+        
+        logger.info(f"Phase 2 Results: {stats['phase2_matches']} additional successful matches")
+        if stats['phase2_breakdown']:
+            logger.info(f"Phase 2 match breakdown by time increment:")
+            for increment, count in stats['phase2_breakdown'].items():
+                logger.info(f"  +{increment} seconds: {count} matches")
+        
+        logger.info(f"Vectorized join completed in {stats['elapsed_seconds']:.3f}s")
+    
+    def _phase1_matching(self, send_df, open_index, join_plan):
+        """
+        Phase 1: 0-11 second incremental matching
+        
+        Fills join_plan for every Send row and marks matched Opens in the
+        Open index consumed bitmask. Returns the match breakdown.
+        """
+        match_stats = {0: 0, 1: 0, 2: 0, 3: 0, 4: 0, 5: 0, 6: 0, 7: 0, 8: 0, 9: 0, 10: 0, 11: 0, 'no_match': 0, 'multiple_match': 0}
+        
+        # Per-recipient lookups go through the Open index (no DataFrame slicing)
+        send_codes = open_index.lookup(send_df['recipient_name'])
+        send_times = to_int64_ns(send_df['sent_date'])
         
         logger.info(f"Phase 1: Processing {len(send_df)} send records (0-11 seconds)")
         
         # Process each send record individually
-        for idx, send_record in send_df.iterrows():
-            email = send_record['recipient_name']
-            base_datetime = send_record['sent_date']
-            
+        for send_pos, (code, base_datetime) in enumerate(zip(send_codes, send_times)):
             # Get open records for this email
-            if email not in open_by_email:
+            if code < 0:
                 # No open records for this email at all
-                failed_records.append({
-                    **send_record.to_dict(),
-                    'failure_reason': 'no_open_records_for_email'
-                })
+                join_plan['failure_reason'][send_pos] = 'no_open_records_for_email'
                 match_stats['no_match'] += 1
                 continue
             
-            email_opens = open_by_email[email]
+            email_open_times, email_open_positions = open_index.group(code)
             match_found = False
             
             # Try incremental matching: 0, +1, +2, +3, +4, +5, +6, +7, +8, +9, +10, +11 seconds
             for increment in range(12):
-                search_datetime = base_datetime + pd.Timedelta(seconds=increment)
+                search_datetime = base_datetime + increment * NANOS_PER_SECOND
                 
-                # Find matches for this datetime
-                matches = email_opens[email_opens['sent_date'] == search_datetime]
+                # Find matches for this datetime (timestamps are sorted per recipient)
+                first = np.searchsorted(email_open_times, search_datetime, side='left')
+                match_count = np.searchsorted(email_open_times, search_datetime, side='right') - first
                 
-                if len(matches) == 1:
-                    # Successful unique match
-                    matched_record = matches.iloc[0]
-                    matched_index = matches.index[0]
+                if match_count == 1:
+                    # Successful unique match - track which open record was used
+                    matched_position = email_open_positions[first]
+                    open_index.mark_consumed(matched_position)
                     
-                    # Track which open record was used
-                    used_open_indices.add(matched_index)
-                    
-                    # Create final record: send_record + open_fields
-                    final_record = send_record.to_dict()
-                    for field in open_fields_to_add:
-                        final_record[field] = matched_record[field]
-                    
-                    successful_matches.append(final_record)
+                    join_plan['open_pos'][send_pos] = matched_position
+                    join_plan['phase'][send_pos] = 1
+                    join_plan['increment'][send_pos] = increment
                     match_stats[increment] += 1
                     match_found = True
                     break
                     
-                elif len(matches) > 1:
+                elif match_count > 1:
                     # Multiple matches - add to failed records
-                    failed_records.append({
-                        **send_record.to_dict(),
-                        'failure_reason': f'multiple_matches_at_plus_{increment}_seconds',
-                        'match_count': len(matches)
-                    })
+                    join_plan['failure_reason'][send_pos] = f'multiple_matches_at_plus_{increment}_seconds'
+                    join_plan['match_count'][send_pos] = match_count
                     match_stats['multiple_match'] += 1
                     match_found = True
                     break
             
             # No matches found in any increment
             if not match_found:
-                failed_records.append({
-                    **send_record.to_dict(),
-                    'failure_reason': 'no_match_within_11_seconds'
-                })
+                join_plan['failure_reason'][send_pos] = 'no_match_within_11_seconds'
                 match_stats['no_match'] += 1
         
         # Log Phase 1 statistics
@@ -933,68 +1550,55 @@ class DataProcessor:
         if match_stats['multiple_match'] > 0:
             logger.info(f"  Multiple matches: {match_stats['multiple_match']}")
         
-        return successful_matches, failed_records, used_open_indices
+        return match_stats
     
-    def _phase2_matching(self, failed_records, open_df, used_open_indices):
-        """Phase 2: 12-60 second matching on failed records with unused open records"""
-        phase2_successful = []
-        final_failed = []
+    def _phase2_matching(self, send_df, open_index, join_plan):
+        """
+        Phase 2: 12-60 second matching on failed records with unused open records
+        
+        Updates join_plan for Send rows left unmatched by Phase 1. Returns the
+        match breakdown.
+        """
         match_stats = {}
         
-        # Create subset of unused open records
-        unused_open_df = open_df[~open_df.index.isin(used_open_indices)].copy()
+        # Restrict the Open index to records not consumed in Phase 1
+        unused_index = open_index.available()
         
-        if len(unused_open_df) == 0:
+        if len(unused_index) == 0:
             logger.info("Phase 2: No unused open records available")
-            return [], failed_records
-        
-        logger.info(f"Phase 2: Using {len(unused_open_df)} unused open records")
+            return match_stats
         
-        # Get fields to add from open_df (exclude join keys)
-        open_fields_to_add = [col for col in open_df.columns 
-                            if col not in ['recipient_name', 'sent_date']]
+        logger.info(f"Phase 2: Using {len(unused_index)} unused open records")
         
-        # Create email-based lookup for unused opens
-        unused_opens_by_email = {}
-        for email in unused_open_df['recipient_name'].unique():
-            unused_opens_by_email[email] = unused_open_df[unused_open_df['recipient_name'] == email].copy()
+        failed_positions = np.flatnonzero(join_plan['phase'] == 0)
+        unused_group_sizes = unused_index.group_sizes()
+        failed_codes = unused_index.lookup(send_df['recipient_name'].iloc[failed_positions])
+        failed_times = to_int64_ns(send_df['sent_date'].iloc[failed_positions])
         
         # Process each failed record
-        for failed_record in failed_records:
-            email = failed_record['recipient_name']
-            base_datetime = pd.to_datetime(failed_record['sent_date'])
-            
+        for send_pos, code, base_datetime in zip(failed_positions, failed_codes, failed_times):
             # Skip if this email has no unused open records
-            if email not in unused_opens_by_email:
-                final_failed.append(failed_record)
+            if code < 0 or unused_group_sizes[code] == 0:
                 continue
             
-            email_opens = unused_opens_by_email[email]
+            email_open_times, email_open_positions = unused_index.group(code)
             match_found = False
             
             # Try incremental matching: +12, +13, ..., +60 seconds
             for increment in range(12, 61):
-                search_datetime = base_datetime + pd.Timedelta(seconds=increment)
+                search_datetime = base_datetime + increment * NANOS_PER_SECOND
                 
                 # Find matches for this datetime
-                matches = email_opens[email_opens['sent_date'] == search_datetime]
+                first = np.searchsorted(email_open_times, search_datetime, side='left')
+                match_count = np.searchsorted(email_open_times, search_datetime, side='right') - first
                 
-                if len(matches) == 1:
-                    # Successful unique match
-                    matched_record = matches.iloc[0]
-                    
-                    # Create final record: failed_record + open_fields
-                    final_record = failed_record.copy()
-                    
-                    # Remove failure-related fields
-                    final_record.pop('failure_reason', None)
-                    final_record.pop('match_count', None)
-                    
-                    # Add open fields
-                    for field in open_fields_to_add:
-                        final_record[field] = matched_record[field]
-                    
-                    phase2_successful.append(final_record)
+                if match_count == 1:
+                    # Successful unique match - clear failure-related fields
+                    join_plan['open_pos'][send_pos] = email_open_positions[first]
+                    join_plan['phase'][send_pos] = 2
+                    join_plan['increment'][send_pos] = increment
+                    join_plan['failure_reason'][send_pos] = None
+                    join_plan['match_count'][send_pos] = 0
                     
                     # Track statistics
                     if increment not in match_stats:
@@ -1004,18 +1608,16 @@ class DataProcessor:
                     match_found = True
                     break
                     
-                elif len(matches) > 1:
+                elif match_count > 1:
                     # Multiple matches - keep as failed (as per requirement)
-                    failed_record['failure_reason'] = f'multiple_matches_at_plus_{increment}_seconds_phase2'
-                    failed_record['match_count'] = len(matches)
-                    final_failed.append(failed_record)
+                    join_plan['failure_reason'][send_pos] = f'multiple_matches_at_plus_{increment}_seconds_phase2'
+                    join_plan['match_count'][send_pos] = match_count
                     match_found = True
                     break
             
             # No matches found in Phase 2
             if not match_found:
-                failed_record['failure_reason'] = 'no_match_within_60_seconds'
-                final_failed.append(failed_record)
+                join_plan['failure_reason'][send_pos] = 'no_match_within_60_seconds'
         
         # Log Phase 2 statistics
         if match_stats:
@@ -1023,50 +1625,56 @@ class DataProcessor:
             for increment in sorted(match_stats.keys()):
                 logger.info(f"  +{increment} seconds: {match_stats[increment]} matches")
         
-        return phase2_successful, final_failed
+        return match_stats
     
-    def _join_with_contacts(self, send_open_df, contacts_df):
-        """Join send-open data with contacts on recipient_email = Email (one-to-one)"""
+    def _load_contacts(self, contacts_file):
+        """
+        Load cleaned contacts with their email index, from the cache when possible.
+        
+        Returns:
+            tuple: (contacts_df, contacts_index, contacts_first_pos)
+        """
+        if self.contacts_cache is not None:
+            return self.contacts_cache.load(contacts_file, self)
+        
+        contacts_df = self._clean_data(read_csv_with_schema(contacts_file, self.read_schemas['contacts'])[0], 'contacts')
+        return (contacts_df, *self._build_contacts_index(contacts_df))
+    
+    def _join_with_contacts(self, send_open_df, contacts_df, contacts_lookup=None):
+        """
+        Join send-open data with contacts on recipient_email = Email (one-to-one)
+        
+        Args:
+            contacts_lookup: Optional prebuilt (contacts_index, contacts_first_pos)
+                             from _build_contacts_index, e.g. from the contacts cache
+        """
         logger.info(f"Joining {len(send_open_df)} send-open records with contacts data")
         
-        # Create lookup dictionary for faster contact matching
-        contacts_lookup = {}
-        for idx, contact_record in contacts_df.iterrows():
-            email = contact_record['Email']
-            if pd.notna(email) and email not in contacts_lookup:
-                # Take first occurrence of each email
-                contacts_lookup[email] = contact_record
+        # Hash index over the first occurrence of each email (email → contact row position)
+        if contacts_lookup is None:
+            contacts_lookup = self._build_contacts_index(contacts_df)
+        contacts_index, contacts_first_pos = contacts_lookup
+        logger.info(f"Created contacts lookup with {len(contacts_index)} unique emails")
         
-        logger.info(f"Created contacts lookup with {len(contacts_lookup)} unique emails")
+        # Map each send-open record to its contact row (-1 = no matching contact)
+        contact_pos = self._lookup_contacts(send_open_df['Recipient Email'], contacts_index, contacts_first_pos)
         
-        successful_records = []
-        failed_records = []
+        matched_rows = np.flatnonzero(contact_pos >= 0)
+        unmatched_rows = np.flatnonzero(contact_pos < 0)
         
-        # Iterate through each send-open record
-        for idx, send_record in send_open_df.iterrows():
-            recipient_email = send_record['Recipient Email']
-            
-            if pd.notna(recipient_email) and recipient_email in contacts_lookup:
-                # Found matching contact - merge all contact fields
-                contact_record = contacts_lookup[recipient_email]
-                
-                # Create merged record: send_record + contact fields
-                merged_record = send_record.to_dict()
-                
-                # Add all contact fields
-                for col in contacts_df.columns:
-                    merged_record[col] = contact_record[col]
-                
-                successful_records.append(merged_record)
-            else:
-                # No matching contact found
-                failed_record = send_record.to_dict()
-                failed_record['failure_reason'] = 'Send email not found in contacts'
-                failed_records.append(failed_record)
+        # Found matching contact - merge all contact fields (send_record + contact fields)
+        if len(matched_rows) > 0:
+            successful_df = self._take_join(send_open_df, matched_rows, contacts_df, contact_pos[matched_rows])
+        else:
+            successful_df = pd.DataFrame()
         
-        # Convert to DataFrames
-        successful_df = pd.DataFrame(successful_records) if successful_records else pd.DataFrame()
-        failed_df = pd.DataFrame(failed_records) if failed_records else pd.DataFrame()
+        # No matching contact found
+        if len(unmatched_rows) > 0:
+            failed_df = send_open_df.take(unmatched_rows)
+            failed_df.index = pd.RangeIndex(len(failed_df))
+            failed_df['failure_reason'] = 'Send email not found in contacts'
+        else:
+            failed_df = pd.DataFrame()
         
         # Add unique IDs to Company URL values in successful records
         if len(successful_df) > 0 and 'Company URL' in successful_df.columns:
@@ -1092,6 +1700,26 @@ class DataProcessor:
         
         return successful_df, failed_df
     
+    def _build_contacts_index(self, contacts_df):
+        """
+        Index the first occurrence of every non-null Email.
+        
+        Returns:
+            tuple: (pd.Index of unique emails, contact row position of each)
+        """
+        emails = contacts_df['Email']
+        first_pos = np.flatnonzero((~emails.duplicated(keep='first') & emails.notna()).values)
+        return pd.Index(emails.values[first_pos]), first_pos
+    
+    def _lookup_contacts(self, recipient_emails, contacts_index, contacts_first_pos):
+        """Contact row position for each email (-1 where there is no contact)"""
+        index_pos = contacts_index.get_indexer(recipient_emails)
+        found = index_pos >= 0
+        
+        contact_pos = np.full(len(index_pos), -1, dtype=np.int64)
+        contact_pos[found] = contacts_first_pos[index_pos[found]]
+        return contact_pos
+    
     def _add_company_url_ids(self, df):
         """Add unique incremental IDs to Company URL values"""
         logger.info(f"Adding unique IDs to Company URL values")
@@ -1276,4 +1904,20 @@ class DataProcessor:
     def _join_account(self, merged_df, account_df):
         """Join account data (placeholder for future implementation)"""
         logger.info("Account data processing not yet implemented")
-        return merged_df
\ No newline at end of file
+        return merged_df
+
+
+def _join_shard(task):
+    """
+    Build the join plan for one recipient shard (module-level so process pools
+    can pickle it).
+    """
+    shard, backend, send_df, open_df = task
+    start_time = time.time()
+    join_plan, backend = DataProcessor(join_backend=backend)._build_join_plan(send_df, open_df, backend)
+    return {
+        'shard': shard,
+        'backend': backend,
+        'join_plan': join_plan,
+        'elapsed_seconds': time.time() - start_time
+    }
@@ -0,0 +1,220 @@
+import pandas as pd
+import numpy as np
+
+# Fixed-width layouts parsed with numpy instead of strptime:
+# format → [(width, {field: (start, end)}, {position: separator}), ...]
+# Formats with a variable-width field have one layout per width.
+_DAY_FIRST_DATE = {'day': (0, 2), 'month': (3, 5), 'year': (6, 10)}
+_ISO_DATE = {'year': (0, 4), 'month': (5, 7), 'day': (8, 10)}
+_TIME = {'hour': (11, 13), 'minute': (14, 16), 'second': (17, 19)}
+_TIME_SEPARATORS = {10: ' ', 13: ':', 16: ':'}
+
+
+def _month_name_layout(day_digits):
+    """Layout of "Jul 3, 2025, 02:14:21" with a day_digits-wide day"""
+    day_end = 4 + day_digits
+    year = day_end + 2
+    hour = year + 6
+    fields = {
+        'month_name': (0, 3), 'day': (4, day_end), 'year': (year, year + 4),
+        'hour': (hour, hour + 2), 'minute': (hour + 3, hour + 5), 'second': (hour + 6, hour + 8)
+    }
+    separators = {3: ' ', day_end: ',', day_end + 1: ' ', year + 4: ',', year + 5: ' ', hour + 2: ':', hour + 5: ':'}
+    return hour + 8, fields, separators
+
+
+FIXED_WIDTH_LAYOUTS = {
+    '%d/%m/%Y %H:%M:%S': [(19, {**_DAY_FIRST_DATE, **_TIME}, {2: '/', 5: '/', **_TIME_SEPARATORS})],
+    '%Y-%m-%d %H:%M:%S': [(19, {**_ISO_DATE, **_TIME}, {4: '-', 7: '-', **_TIME_SEPARATORS})],
+    '%d/%m/%Y': [(10, _DAY_FIRST_DATE, {2: '/', 5: '/'})],
+    '%Y-%m-%d': [(10, _ISO_DATE, {4: '-', 7: '-'})],
+    # Open exports ("Jul 3, 2025, 02:14:21")
+    '%b %d, %Y, %H:%M:%S': [_month_name_layout(1), _month_name_layout(2)],
+}
+
+MONTH_ABBREVIATIONS = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+
+NANOS_PER_SECOND = 10 ** 9
+NAT = np.datetime64('NaT', 'ns')
+# Years datetime64[ns] can hold in full; pandas >= 2 keeps later dates in coarser units instead of NaT
+MIN_YEAR, MAX_YEAR = 1678, 2261
+# Bits per character code when packing a month name into one integer (covers all of Unicode)
+_CODE_BITS = 21
+_MONTH_KEYS = np.array([
+    (ord(name[0]) << 2 * _CODE_BITS) | (ord(name[1]) << _CODE_BITS) | ord(name[2]) for name in MONTH_ABBREVIATIONS
+], dtype=np.int64)
+_MONTH_KEY_ORDER = np.argsort(_MONTH_KEYS)
+
+
+def parse_datetimes(values, date_format):
+    """
+    pd.to_datetime(values, format=date_format, errors='coerce'), with fixed-width
+    layouts (FIXED_WIDTH_LAYOUTS) decoded as character codes in numpy. Values off
+    the layouts (e.g. single-digit DD/MM days, other widths) go through pandas as before.
+
+    Returns:
+        Series: datetime64[ns], NaT where a value is missing or does not match
+    """
+    series = values if isinstance(values, pd.Series) else pd.Series(values)
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series
+
+    result = np.full(len(series), NAT, dtype='datetime64[ns]')
+    present = series.notna().values
+    strings = series.to_numpy(dtype=object)[present]
+
+    parsed, matched = _parse_layouts(strings, [date_format])
+    rest = ~matched
+    if rest.any():
+        parsed[rest] = _as_nanoseconds(pd.to_datetime(pd.Series(strings[rest]).astype(str), format=date_format, errors='coerce'))
+
+    result[present] = parsed
+    return pd.Series(result, index=series.index, name=series.name)
+
+
+def parse_general_datetimes(values, fast_formats=()):
+    """
+    pd.to_datetime on each (whitespace-stripped) value on its own, kept as
+    wall-clock time in whole seconds. Values following one of fast_formats'
+    layouts are decoded in numpy; only the distinct remaining values go through
+    pandas, one at a time.
+
+    Only pass formats that general parsing reads the same way (not day-first ones).
+
+    Returns:
+        tuple: (datetime64[ns] Series, list of distinct values that did not parse)
+    """
+    series = values if isinstance(values, pd.Series) else pd.Series(values)
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series, []
+
+    result = np.full(len(series), NAT, dtype='datetime64[ns]')
+    present = series.notna().values
+    strings = series.to_numpy(dtype=object)[present]
+
+    parsed, matched = _parse_layouts(strings, fast_formats)
+    unparsed = []
+    rest = ~matched
+    if rest.any():
+        leftovers = pd.Series(strings[rest]).astype(str).str.strip()
+        distinct = {}
+        for value in pd.unique(leftovers.values):
+            distinct[value] = _parse_general(value)
+            if pd.isna(distinct[value]):
+                unparsed.append(value)
+        parsed[rest] = leftovers.map(distinct).values.astype('datetime64[ns]')
+
+    result[present] = parsed
+    return pd.Series(result, index=series.index, name=series.name), unparsed
+
+
+def _parse_general(value):
+    """General parse of one value as wall-clock time in whole seconds, NaT if it does not parse"""
+    try:
+        parsed = pd.Timestamp(pd.to_datetime(value, errors='raise'))
+    except Exception:
+        return pd.NaT
+    if pd.isna(parsed):
+        return pd.NaT
+    if parsed.tzinfo is not None:
+        parsed = parsed.tz_localize(None)
+    if not MIN_YEAR <= parsed.year <= MAX_YEAR:
+        return pd.NaT
+    return parsed.replace(microsecond=0, nanosecond=0)
+
+
+def _as_nanoseconds(parsed):
+    """datetime64[ns] values of a parsed Series, NaT where the date is outside MIN_YEAR-MAX_YEAR"""
+    values = parsed.values
+    in_range = (values >= np.datetime64(f'{MIN_YEAR}-01-01')) & (values < np.datetime64(f'{MAX_YEAR + 1}-01-01'))
+    return np.where(in_range, values, NAT.astype(values.dtype)).astype('datetime64[ns]')
+
+
+def matches_layout(strings, date_format):
+    """Mask of (non-null) strings that exactly follow one of date_format's fixed-width layouts"""
+    return _parse_layouts(strings, [date_format])[1]
+
+
+def _parse_layouts(strings, date_formats):
+    """
+    Decode strings against each fixed-width layout of date_formats in turn; each
+    layout only sees the strings the earlier ones rejected.
+
+    Returns:
+        tuple: (datetime64[ns] array, bool array of strings that matched a layout)
+    """
+    parsed = np.full(len(strings), NAT, dtype='datetime64[ns]')
+    matched = np.zeros(len(strings), dtype=bool)
+    for date_format in date_formats:
+        for layout in FIXED_WIDTH_LAYOUTS.get(date_format, []):
+            rest = ~matched
+            if not rest.any():
+                return parsed, matched
+            if rest.all():
+                parsed, matched = _parse_fixed_width(strings, layout)
+                continue
+            layout_parsed, layout_matched = _parse_fixed_width(strings[rest], layout)
+            parsed[rest] = layout_parsed
+            matched[rest] = layout_matched
+    return parsed, matched
+
+
+def _parse_fixed_width(strings, layout):
+    """
+    Decode strings that follow a fixed-width layout exactly.
+
+    Returns:
+        tuple: (datetime64[ns] array, bool array of strings that matched the layout)
+    """
+    width, fields, separators = layout
+    n = len(strings)
+    # One spare character: longer strings spill into it, shorter ones are zero-padded
+    try:
+        codes = np.asarray(strings, dtype=f'S{width + 1}').view(np.uint8)
+    except UnicodeEncodeError:
+        # Non-ASCII text never matches a layout, but needs the wider code units
+        codes = np.asarray(strings, dtype=f'U{width + 1}').view(np.uint32)
+    # Transposed so each character position is one contiguous array
+    codes = codes.reshape(n, width + 1).T.copy()
+
+    matched = codes[width] == 0
+    for position, separator in separators.items():
+        matched &= codes[position] == ord(separator)
+    if not matched.any():
+        return np.full(n, NAT, dtype='datetime64[ns]'), matched
+
+    # Unsigned wrap-around: anything below '0' becomes a large value too
+    digits = codes[:width] - codes.dtype.type(ord('0'))
+    numbers = {}
+    for field, (start, end) in fields.items():
+        if field == 'month_name':
+            numbers['month'] = _decode_month_names(codes[start:end])
+            continue
+        value = np.zeros(n, dtype=np.int64)
+        for position in range(start, end):
+            matched &= digits[position] <= 9
+            value = value * 10 + digits[position]
+        numbers[field] = value
+
+    year, month, day = numbers['year'], numbers['month'], numbers['day']
+    hour, minute, second = (numbers.get(field, np.zeros(n, dtype=np.int64)) for field in ('hour', 'minute', 'second'))
+    matched &= (year >= MIN_YEAR) & (year <= MAX_YEAR) & (month >= 1) & (month <= 12) & (day >= 1)
+    matched &= (hour < 24) & (minute < 60) & (second < 60)
+
+    months = np.where(matched, (year - 1970) * 12 + month - 1, 0).astype('datetime64[M]')
+    days = months.astype('datetime64[D]') + np.where(matched, day - 1, 0).astype('timedelta64[D]')
+    # Day past the end of its month (e.g. 31/02) rolls into the next month
+    matched &= days.astype('datetime64[M]') == months
+
+    seconds = (hour * 3600 + minute * 60 + second) * NANOS_PER_SECOND
+    parsed = days.astype('datetime64[ns]') + seconds.astype('timedelta64[ns]')
+    parsed[~matched] = NAT
+    return parsed, matched
+
+
+def _decode_month_names(codes):
+    """Month numbers (1-12) of three-letter English month names, 0 where not one"""
+    keys = (codes[0].astype(np.int64) << 2 * _CODE_BITS) | (codes[1].astype(np.int64) << _CODE_BITS) | codes[2].astype(np.int64)
+    sorted_keys = _MONTH_KEYS[_MONTH_KEY_ORDER]
+    positions = np.searchsorted(sorted_keys, keys).clip(max=len(sorted_keys) - 1)
+    return np.where(sorted_keys[positions] == keys, _MONTH_KEY_ORDER[positions] + 1, 0)
@@ -0,0 +1,238 @@
+import copy
+import os
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+from .result_cache import input_digest
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+EXECUTOR_MODES = ('serial', 'thread', 'process')
+
+
+def _run_single_sdr(task):
+    """
+    Run one SDR's Send-Open join (module-level so process pools can pickle it).
+
+    Each task works on its own shallow copy of the processor so per-run
+    attributes such as last_join_stats never leak between concurrent SDRs.
+    An SDR with an 'output_file' is streamed to that CSV instead (see
+    DataProcessor.process_single_sdr_streaming) and returns no frames.
+    """
+    processor, sdr_config = task
+    processor = copy.copy(processor)
+
+    start_time = time.time()
+    if sdr_config.get('output_file'):
+        _, errors = processor.process_single_sdr_streaming(
+            sdr_config['send_file'],
+            sdr_config['open_file'],
+            sdr_config['output_file'],
+            sdr_config['name']
+        )
+        send_open_successful = send_open_failed = None
+    else:
+        send_open_successful, send_open_failed, errors = processor.process_single_sdr(
+            sdr_config['send_file'],
+            sdr_config['open_file'],
+            sdr_config['name']
+        )
+
+    return {
+        'name': sdr_config['name'],
+        'successful': send_open_successful,
+        'failed': send_open_failed,
+        'errors': errors,
+        'join_stats': processor.last_join_stats,
+        'memory_stats': processor.last_memory_stats,
+        'output_file': sdr_config.get('output_file'),
+        'elapsed_seconds': time.time() - start_time
+    }
+
+
+def resolve_jobs(jobs):
+    """Number of workers to use: jobs if given, otherwise one per CPU"""
+    if jobs is None or jobs <= 0:
+        return os.cpu_count() or 1
+    return jobs
+
+
+def run_sdr_joins(processor, sdr_configs, executor='serial', jobs=None):
+    """
+    Run DataProcessor.process_single_sdr for every SDR with a pluggable executor.
+
+    SDRs are independent until the contacts join, so they can run in a thread
+    or process pool. Results are always returned in sdr_configs order, so the
+    downstream concat (and SDR_Name tagging) is identical to a serial run.
+
+    Args:
+        processor: DataProcessor used as the template for every SDR
+        sdr_configs: List of dicts with 'name', 'send_file', 'open_file' (and
+                     optionally 'output_file', to stream the join to that CSV)
+        executor: 'serial', 'thread' or 'process'
+        jobs: Worker count (None or <= 0 → one per CPU); 1 always runs serially
+
+    Returns:
+        list: One dict per SDR (same order as sdr_configs) with
+              name, successful, failed, errors, join_stats, memory_stats, output_file, elapsed_seconds
+    """
+    tasks = [(processor, sdr_config) for sdr_config in sdr_configs]
+    return map_tasks(_run_single_sdr, tasks, executor=executor, jobs=jobs, label='SDR joins')
+
+
+def iter_sdr_joins(processor, sdr_configs, executor='process', jobs=None):
+    """
+    run_sdr_joins for progress reporting: yields (position in sdr_configs, result)
+    as each SDR finishes, in completion order.
+
+    Args:
+        processor, sdr_configs, executor, jobs: As run_sdr_joins (file paths are
+            required for the process executor, which pickles every task)
+    """
+    if executor not in EXECUTOR_MODES:
+        raise ValueError(f"Unknown executor '{executor}'. Expected one of: {', '.join(EXECUTOR_MODES)}")
+
+    tasks = [(processor, sdr_config) for sdr_config in sdr_configs]
+    workers = min(resolve_jobs(jobs), len(tasks))
+    if executor == 'serial' or workers <= 1:
+        logger.info(f"Running {len(tasks)} SDR joins serially")
+        for position, task in enumerate(tasks):
+            yield position, _run_single_sdr(task)
+        return
+
+    logger.info(f"Running {len(tasks)} SDR joins with {workers} {executor} workers")
+    pool_class = ThreadPoolExecutor if executor == 'thread' else ProcessPoolExecutor
+    with pool_class(max_workers=workers) as pool:
+        futures = {pool.submit(_run_single_sdr, task): position for position, task in enumerate(tasks)}
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+
+
+class SdrResultStore:
+    """
+    Per-card Send-Open join results kept between runs of the multi-SDR upload.
+
+    Entries are keyed by card and hold the fingerprint (name plus Send and
+    Open content digests) they were computed for, so a run only joins cards
+    that are new or whose name or files changed; removed cards are dropped.
+    Failed joins are not kept and run again next time.
+    """
+
+    def __init__(self):
+        self.entries = {}
+
+    def fingerprint(self, sdr_config):
+        """What a card's result depends on: its name and file contents"""
+        return (sdr_config['name'], input_digest(sdr_config['send_file']), input_digest(sdr_config['open_file']))
+
+    def run(self, processor, sdr_configs, executor='serial', jobs=None, on_result=None):
+        """
+        run_sdr_joins for the new or changed cards only, the rest reused.
+
+        Args:
+            processor, executor, jobs: As run_sdr_joins
+            sdr_configs: List of card dicts with 'name', 'send_file', 'open_file'
+                         (and 'index', the card key; the name is used without it)
+            on_result: Optional callback(position, result) for progress reporting,
+                       called for reused cards first, then as each join finishes
+
+        Returns:
+            list: run_sdr_joins results in sdr_configs order, each with 'reused' (bool)
+        """
+        card_keys = [sdr_config.get('index', sdr_config['name']) for sdr_config in sdr_configs]
+        fingerprints = [self.fingerprint(sdr_config) for sdr_config in sdr_configs]
+
+        # Drop removed cards, then join the cards without a current result
+        self.entries = {card_key: entry for card_key, entry in self.entries.items() if card_key in card_keys}
+        stale = [position for position, card_key in enumerate(card_keys)
+                 if self.entries.get(card_key, {}).get('fingerprint') != fingerprints[position]]
+
+        results = [None] * len(sdr_configs)
+        stale_positions = set(stale)
+        for position, card_key in enumerate(card_keys):
+            if position not in stale_positions:
+                results[position] = {**self.entries[card_key]['result'], 'reused': True}
+                if on_result is not None:
+                    on_result(position, results[position])
+
+        stale_configs = [sdr_configs[position] for position in stale]
+        for stale_position, result in iter_sdr_joins(processor, stale_configs, executor=executor, jobs=jobs):
+            position = stale[stale_position]
+            results[position] = {**result, 'reused': False}
+            if result['successful'] is not None and not result['errors']:
+                self.entries[card_keys[position]] = {'fingerprint': fingerprints[position], 'result': result}
+            else:
+                self.entries.pop(card_keys[position], None)
+            if on_result is not None:
+                on_result(position, results[position])
+
+        logger.info(f"♻️ SDR joins: {len(sdr_configs) - len(stale)} reused, {len(stale)} processed")
+        return results
+
+
+def map_tasks(func, tasks, executor='serial', jobs=None, label='tasks'):
+    """
+    Apply func to every task with the chosen executor, preserving task order.
+
+    Args:
+        func: Module-level callable (must be picklable for the process executor)
+        tasks: List of task arguments
+        executor: 'serial', 'thread' or 'process'
+        jobs: Worker count (None or <= 0 → one per CPU); 1 always runs serially
+        label: Name used in log messages
+
+    Returns:
+        list: func(task) for every task, in task order
+    """
+    if executor not in EXECUTOR_MODES:
+        raise ValueError(f"Unknown executor '{executor}'. Expected one of: {', '.join(EXECUTOR_MODES)}")
+
+    workers = min(resolve_jobs(jobs), len(tasks))
+
+    if executor == 'serial' or workers <= 1:
+        logger.info(f"Running {len(tasks)} {label} serially")
+        return [func(task) for task in tasks]
+
+    logger.info(f"Running {len(tasks)} {label} with {workers} {executor} workers")
+    pool_class = ThreadPoolExecutor if executor == 'thread' else ProcessPoolExecutor
+
+    # map() yields results in submission order regardless of completion order
+    with pool_class(max_workers=workers) as pool:
+        return list(pool.map(func, tasks))
+
+
+def _run_timed(task):
+    """Call func(*args) and time it (module-level so process pools can pickle it)"""
+    name, func, args = task
+    start_time = time.time()
+    result = func(*args)
+    return name, result, time.time() - start_time
+
+
+def run_concurrently(calls, executor='thread', jobs=None, label='loads'):
+    """
+    Run independent calls (file loads, whole pipelines) side by side and time
+    each one. Threads suit I/O-bound parsing; 'process' sidesteps the GIL for
+    CPU-bound work at the cost of pickling arguments and results.
+
+    Args:
+        calls: Dict {name: (func, args tuple)}; funcs must be module-level for the process executor
+        executor: 'serial', 'thread' or 'process'
+        jobs: Worker count (None or <= 0 → one per call)
+
+    Returns:
+        tuple: ({name: result}, {name: seconds}, wall-clock seconds), in calls order
+    """
+    start_time = time.time()
+    tasks = [(name, func, args) for name, (func, args) in calls.items()]
+    if jobs is None or jobs <= 0:
+        jobs = len(tasks)
+    outcomes = map_tasks(_run_timed, tasks, executor=executor, jobs=jobs, label=label)
+
+    results = {name: result for name, result, _ in outcomes}
+    timings = {name: elapsed for name, _, elapsed in outcomes}
+    wall_seconds = time.time() - start_time
+    per_call = ', '.join(f"{name} {elapsed:.3f}s" for name, elapsed in timings.items())
+    logger.info(f"⏱️ {label}: {per_call} (wall {wall_seconds:.3f}s)")
+    return results, timings, wall_seconds
@@ -0,0 +1,144 @@
+import hashlib
+import json
+import os
+import pickle
+import logging
+from .contacts_cache import file_content_hash
+from .result_cache import frame_digest
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Bump whenever a stage's output changes, so outputs of older code are never reused
+MANIFEST_VERSION = 2
+MANIFEST_FILE = 'input_manifest.json'
+STAGE_DIR = 'stages'
+
+
+def stage_key(*parts):
+    """Digest of what a stage's output depends on (input hashes, upstream output digests, settings)"""
+    digest = hashlib.blake2b(digest_size=20)
+    digest.update(repr(parts).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def output_digest(*frames):
+    """Content digest of a stage output's frames (None frames allowed)"""
+    return stage_key(*[frame_digest(df) if df is not None else None for df in frames])
+
+
+class InputManifest:
+    """
+    Fingerprints of the preprocessing inputs and the stage outputs built from them.
+
+    The manifest (input_manifest.json next to preprocessing_metadata.json)
+    records every input file's size, mtime and content hash, and for every
+    stage the key it was computed for plus a digest of its output. Stage
+    outputs are pickled under stages/, so a stage whose key is unchanged is
+    loaded instead of recomputed; downstream keys include upstream output
+    digests, so a stage only re-runs when its inputs or an upstream output
+    changed. Files whose size and mtime match are not re-hashed.
+
+    Args:
+        output_dir: Processed files folder holding the manifest and stages/
+        settings: Output settings (e.g. the output format) compared between runs
+        reuse: False to recompute every stage (the new outputs are still stored)
+    """
+
+    def __init__(self, output_dir, settings=None, reuse=True):
+        self.output_dir = output_dir
+        self.path = os.path.join(output_dir, MANIFEST_FILE)
+        self.stage_dir = os.path.join(output_dir, STAGE_DIR)
+        self.settings = settings or {}
+        self.files = {}
+        self.stages = {}
+        self.reused = []
+        self.computed = []
+        self.previous = self._load() if reuse else {'files': {}, 'stages': {}, 'settings': {}}
+
+    def _load(self):
+        """Previous manifest, or an empty one if missing, unreadable or from another version"""
+        empty = {'files': {}, 'stages': {}, 'settings': {}}
+        try:
+            with open(self.path) as f:
+                manifest = json.load(f)
+        except FileNotFoundError:
+            return empty
+        except Exception as e:
+            logger.warning(f"⚠️ Ignoring unreadable input manifest {self.path}: {str(e)}")
+            return empty
+        if manifest.get('version') != MANIFEST_VERSION:
+            logger.info(f"Input manifest version {manifest.get('version')} is outdated, reprocessing every stage")
+            return empty
+        return manifest
+
+    def file_hash(self, path):
+        """Content hash of an input file, recorded in the manifest"""
+        stat = os.stat(path)
+        fingerprint = self.previous['files'].get(path)
+        if fingerprint is None or fingerprint['size'] != stat.st_size or fingerprint['mtime_ns'] != stat.st_mtime_ns:
+            fingerprint = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'hash': file_content_hash(path)}
+        self.files[path] = fingerprint
+        return fingerprint['hash']
+
+    def stage_path(self, stage):
+        return os.path.join(self.stage_dir, f"{stage}.pkl")
+
+    def load(self, stage, key):
+        """
+        Stored output of a stage computed for key, None if the stage must re-run.
+
+        Returns:
+            tuple: (output, output_digest) or None
+        """
+        entry = self.previous['stages'].get(stage)
+        if entry is None or entry['key'] != key:
+            return None
+        try:
+            with open(self.stage_path(stage), 'rb') as f:
+                output = pickle.load(f)
+        except Exception as e:
+            if not isinstance(e, FileNotFoundError):
+                logger.warning(f"⚠️ Ignoring unreadable stage output {self.stage_path(stage)}: {str(e)}")
+            return None
+        self.stages[stage] = entry
+        self.reused.append(stage)
+        logger.info(f"⏭️ {stage}: inputs unchanged, reusing stored output")
+        return output, entry['output_digest']
+
+    def store(self, stage, key, output, digest):
+        """Persist a freshly computed stage output (atomically) and record it"""
+        os.makedirs(self.stage_dir, exist_ok=True)
+        stage_file = self.stage_path(stage)
+        tmp_file = f"{stage_file}.{os.getpid()}.tmp"
+        with open(tmp_file, 'wb') as f:
+            pickle.dump(output, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_file, stage_file)
+        self.stages[stage] = {'key': key, 'output_digest': digest}
+        self.computed.append(stage)
+
+    def digest(self, stage):
+        """Output digest of a stage run (or reused) in this run, None if it has none"""
+        entry = self.stages.get(stage)
+        return entry['output_digest'] if entry is not None else None
+
+    def unchanged_since_last_run(self, stage):
+        """True if a stage's output is identical to the one the previous run saved"""
+        entry = self.previous['stages'].get(stage)
+        return (entry is not None and stage in self.stages
+                and entry['output_digest'] == self.stages[stage]['output_digest']
+                and self.previous['settings'] == self.settings)
+
+    def save(self):
+        """Write the manifest for this run and drop stored outputs of stages that no longer exist"""
+        for name in os.listdir(self.stage_dir) if os.path.isdir(self.stage_dir) else []:
+            if name.endswith('.pkl') and name[:-len('.pkl')] not in self.stages:
+                os.remove(os.path.join(self.stage_dir, name))
+                logger.info(f"🧹 Removed stored output of stage {name[:-len('.pkl')]}")
+
+        manifest = {'version': MANIFEST_VERSION, 'settings': self.settings, 'files': self.files, 'stages': self.stages}
+        tmp_file = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_file, 'w') as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_file, self.path)
+        logger.info(f"📒 Saved input manifest to {self.path} ({len(self.computed)} stages computed, {len(self.reused)} reused)")
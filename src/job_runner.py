@@ -0,0 +1,145 @@
+import itertools
+import threading
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+JOB_STATUSES = ('queued', 'running', 'done', 'failed')
+ACTIVE_STATUSES = ('queued', 'running')
+# Finished jobs kept for sessions that have not collected their result yet
+MAX_FINISHED_JOBS = 50
+
+
+class Job:
+    """
+    One background pipeline run and its progress: the current stage, rows
+    processed, units done out of total (e.g. SDRs) and optional per-item rows
+    for a progress table. Job functions report through update / set_item.
+    """
+
+    def __init__(self, job_id, label):
+        self.job_id = job_id
+        self.label = label
+        self.status = 'queued'
+        self.stage = 'Queued'
+        self.rows_processed = 0
+        self.done = 0
+        self.total = None
+        self.items = {}
+        self.result = None
+        self.error = None
+        self.submitted_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self._lock = threading.Lock()
+
+    def update(self, stage=None, rows_processed=None, add_rows=0, done=None, add_done=0, total=None):
+        """Report progress (absolute values, or add_* increments)"""
+        with self._lock:
+            if stage is not None:
+                self.stage = stage
+            if rows_processed is not None:
+                self.rows_processed = rows_processed
+            self.rows_processed += add_rows
+            if done is not None:
+                self.done = done
+            self.done += add_done
+            if total is not None:
+                self.total = total
+
+    def set_item(self, item_key, **fields):
+        """Create or update one row of the job's progress table"""
+        with self._lock:
+            self.items.setdefault(item_key, {}).update(fields)
+
+    @property
+    def finished(self):
+        return self.status not in ACTIVE_STATUSES
+
+    def snapshot(self):
+        """Consistent copy of the job's state for display (result excluded)"""
+        with self._lock:
+            end_time = self.finished_at or time.time()
+            return {
+                'job_id': self.job_id,
+                'label': self.label,
+                'status': self.status,
+                'stage': self.stage,
+                'rows_processed': self.rows_processed,
+                'done': self.done,
+                'total': self.total,
+                'items': [dict(item) for item in self.items.values()],
+                'error': self.error,
+                'elapsed_seconds': end_time - self.started_at if self.started_at else 0.0
+            }
+
+
+class JobRunner:
+    """
+    Runs pipeline functions on background worker threads.
+
+    The runner lives for the whole process, so jobs keep running across
+    Streamlit reruns; sessions only keep job ids, poll the jobs' progress and
+    collect their results when done. A job function is called as
+    func(job, *args, **kwargs), its return value becomes job.result and an
+    exception marks the job failed.
+    """
+
+    def __init__(self, workers=2):
+        self.workers = workers
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='pipeline-job')
+        self._jobs = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def submit(self, label, func, *args, **kwargs):
+        """Queue a job; returns its id"""
+        with self._lock:
+            job_id = f"job-{next(self._ids)}"
+            job = Job(job_id, label)
+            self._jobs[job_id] = job
+            self._prune()
+        self._pool.submit(self._run, job, func, args, kwargs)
+        logger.info(f"🧵 Queued {job_id}: {label}")
+        return job_id
+
+    def get(self, job_id):
+        """The Job for an id, None if unknown or pruned"""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _run(self, job, func, args, kwargs):
+        job.status, job.stage, job.started_at = 'running', 'Starting', time.time()
+        try:
+            job.result = func(job, *args, **kwargs)
+            job.status = 'done'
+            job.update(stage='Done')
+            logger.info(f"✅ {job.job_id} finished in {time.time() - job.started_at:.2f}s: {job.label}")
+        except Exception as e:
+            job.error = str(e)
+            job.status = 'failed'
+            logger.exception(f"❌ {job.job_id} failed: {job.label}")
+        finally:
+            job.finished_at = time.time()
+
+    def _prune(self):
+        """Forget the oldest finished jobs beyond MAX_FINISHED_JOBS (caller holds the lock)"""
+        finished = [job for job in self._jobs.values() if job.finished]
+        for job in sorted(finished, key=lambda job: job.finished_at or 0)[:max(0, len(finished) - MAX_FINISHED_JOBS)]:
+            del self._jobs[job.job_id]
+
+
+_runner = None
+_runner_lock = threading.Lock()
+
+
+def get_job_runner(workers=2):
+    """The process-wide JobRunner (workers only applies when it is first created)"""
+    global _runner
+    with _runner_lock:
+        if _runner is None:
+            _runner = JobRunner(workers)
+        return _runner
@@ -0,0 +1,287 @@
+import pandas as pd
+import numpy as np
+import time
+import logging
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Matching windows (seconds after the Send timestamp) for the two-phase join
+PHASE1_WINDOW = (0, 11)
+PHASE2_WINDOW = (12, 60)
+
+NANOS_PER_SECOND = 10 ** 9
+
+
+def to_int64_ns(dates):
+    """Convert a datetime column to int64 nanoseconds since epoch"""
+    return np.asarray(pd.to_datetime(dates).values.astype('datetime64[ns]').astype(np.int64))
+
+
+def new_join_plan(n_send):
+    """
+    Empty join plan: one entry per Send row (positional), all unmatched.
+
+    - open_pos: matched Open row position, -1 if unmatched
+    - phase: 1 or 2 for matches, 0 if unmatched
+    - increment: matched seconds offset, -1 if unmatched
+    - failure_reason: legacy failure_reason code (None if matched)
+    - match_count: number of tied Opens for multiple-match failures (0 otherwise)
+    """
+    return {
+        'open_pos': np.full(n_send, -1, dtype=np.int64),
+        'phase': np.zeros(n_send, dtype=np.int8),
+        'increment': np.full(n_send, -1, dtype=np.int64),
+        'failure_reason': np.full(n_send, None, dtype=object),
+        'match_count': np.zeros(n_send, dtype=np.int64),
+        'stats': {}
+    }
+
+
+def join_plan_stats(join_plan, n_opens, phase1_breakdown, phase2_breakdown, elapsed_seconds):
+    """Summarize a completed join plan for logging and DataProcessor.last_join_stats"""
+    phase = join_plan['phase']
+    return {
+        'send_rows': len(phase),
+        'open_rows': n_opens,
+        'phase1_matches': int((phase == 1).sum()),
+        'phase2_matches': int((phase == 2).sum()),
+        'unmatched': int((phase == 0).sum()),
+        'phase1_breakdown': phase1_breakdown,
+        'phase2_breakdown': phase2_breakdown,
+        'elapsed_seconds': elapsed_seconds
+    }
+
+
+class OpenIndex:
+    """
+    Per-recipient index over Open events, built once per Open file and shared
+    by both matching phases.
+
+    - recipient_names: distinct recipient values; a recipient's code is its position here
+    - order: Open row positions sorted by (recipient code, timestamp)
+    - timestamps: int64 nanosecond timestamps in `order`, sorted within each recipient
+    - offsets: recipient code c owns order[offsets[c]:offsets[c + 1]]
+    - consumed: bitmask over Open row positions (Opens already matched in Phase 1)
+    """
+
+    def __init__(self, open_df):
+        start_time = time.time()
+
+        codes, names = pd.factorize(open_df['recipient_name'])
+        codes = codes.astype(np.int64)
+        timestamps = to_int64_ns(open_df['sent_date'])
+
+        valid_pos = np.flatnonzero(codes >= 0)
+        order = valid_pos[np.lexsort((timestamps[valid_pos], codes[valid_pos]))]
+
+        self.recipient_names = pd.Index(names)
+        self.n_opens = len(open_df)
+        self._init_arrays(order, timestamps[order], codes[order])
+        self.consumed = np.zeros(self.n_opens, dtype=bool)
+        self.whole_seconds = not (timestamps % NANOS_PER_SECOND).any()
+
+        logger.info(f"Built Open index: {self.n_opens} opens, {len(self.recipient_names)} recipients in {time.time() - start_time:.3f}s")
+
+    def _init_arrays(self, order, timestamps, sorted_codes):
+        """Set the sorted arrays and derive recipient group offsets"""
+        self.order = order
+        self.timestamps = timestamps
+        self.sorted_codes = sorted_codes
+        self.offsets = np.zeros(len(self.recipient_names) + 1, dtype=np.int64)
+        self.offsets[1:] = np.cumsum(np.bincount(sorted_codes, minlength=len(self.recipient_names)))
+        self._search_keys = None
+
+    def __len__(self):
+        return len(self.order)
+
+    def lookup(self, recipient_names):
+        """Map recipient names to codes (-1 where the recipient has no Opens)"""
+        return self.recipient_names.get_indexer(recipient_names).astype(np.int64)
+
+    def group_sizes(self):
+        """Number of indexed Opens per recipient code"""
+        return np.diff(self.offsets)
+
+    def group(self, code):
+        """Return (sorted timestamps, Open row positions) for one recipient code"""
+        start, end = self.offsets[code], self.offsets[code + 1]
+        return self.timestamps[start:end], self.order[start:end]
+
+    def mark_consumed(self, open_positions):
+        """Flag Open rows as used so later phases skip them"""
+        self.consumed[open_positions] = True
+
+    def available(self):
+        """
+        Index restricted to Opens that are not consumed, sharing recipient codes
+        with this index (consumed Opens stay flagged in the new index)
+        """
+        keep = ~self.consumed[self.order]
+
+        view = OpenIndex.__new__(OpenIndex)
+        view.recipient_names = self.recipient_names
+        view.n_opens = self.n_opens
+        view._init_arrays(self.order[keep], self.timestamps[keep], self.sorted_codes[keep])
+        view.consumed = self.consumed.copy()
+        view.whole_seconds = self.whole_seconds
+        return view
+
+    def search(self, codes, anchors_ns, window):
+        """
+        Vectorized window lookup: for each (recipient code, Send timestamp) find the
+        first Open at anchor + window[0] .. anchor + window[1] seconds and how many
+        Opens of that recipient share that exact timestamp.
+
+        Requires whole-second timestamps (see whole_seconds).
+
+        Returns:
+            tuple: (found, count, increment_seconds, open_pos) arrays aligned with codes
+        """
+        lo, hi = window
+        n_queries = len(codes)
+
+        if len(self.order) == 0 or n_queries == 0:
+            missing = np.full(n_queries, -1, dtype=np.int64)
+            return np.zeros(n_queries, dtype=bool), np.zeros(n_queries, dtype=np.int64), missing, missing.copy()
+
+        keys, base, span = self._composite_keys()
+        anchors = anchors_ns // NANOS_PER_SECOND
+
+        # Clamp into this recipient's key range so searches never leak into a neighbouring group
+        relative = np.clip(anchors + lo - base, 0, span - 1)
+        left = np.searchsorted(keys, codes * span + relative, side='left')
+        group_end = self.offsets[codes + 1]
+
+        clipped = np.minimum(left, len(keys) - 1)
+        candidate = self.timestamps[clipped] // NANOS_PER_SECOND
+        found = (left < group_end) & (candidate <= anchors + hi)
+
+        right = np.searchsorted(keys, keys[clipped], side='right')
+        count = np.where(found, right - left, 0)
+        increment = np.where(found, candidate - anchors, -1)
+        open_pos = np.where(found, self.order[clipped], -1)
+
+        return found, count, increment, open_pos
+
+    def _composite_keys(self):
+        """Sorted code * span + (seconds - base) keys over the whole index (built lazily)"""
+        if self._search_keys is None:
+            seconds = self.timestamps // NANOS_PER_SECOND
+            base = seconds.min()
+            span = seconds.max() - base + 2
+            self._search_keys = (self.sorted_codes * span + (seconds - base), base, span)
+        return self._search_keys
+
+
+class AsofJoinEngine:
+    """
+    Vectorized Send ↔ Open matcher built on sorted int64 timestamps.
+
+    Produces exactly the same result as DataProcessor._phase1_matching and
+    _phase2_matching, but instead of scanning every recipient's opens once per
+    second of the window, each Send row is resolved with a single searchsorted
+    over the OpenIndex:
+
+    - Phase 1: first Open at +0..+11s; unique → match, several → multiple-match failure
+    - Phase 2: failed Sends only, against Opens not used in Phase 1, at +12..+60s
+    """
+
+    def match(self, send_df, open_index, recipient_opens=None):
+        """
+        Match Send rows to Open rows.
+
+        Args:
+            send_df: Cleaned Send DataFrame (recipient_name, sent_date)
+            open_index: OpenIndex built from the cleaned Open DataFrame
+            recipient_opens: Optional (has_opens, has_unused_opens) bool arrays aligned
+                             with send_df, for when open_index covers only a time
+                             window of the Open file (streaming join). They decide
+                             'no_open_records_for_email' and Phase 2 eligibility,
+                             which depend on the recipient's Opens across the whole file.
+
+        Returns:
+            dict: Join plan (see new_join_plan) with match stats,
+                  None if the timestamps are not whole seconds (caller should fall back)
+        """
+        start_time = time.time()
+        n_send = len(send_df)
+
+        send_ns = to_int64_ns(send_df['sent_date'])
+
+        # Legacy matching probes whole-second offsets only; the sorted-key search
+        # is exact only when every timestamp sits on a whole second
+        if not open_index.whole_seconds or (send_ns % NANOS_PER_SECOND).any():
+            logger.warning("Sub-second timestamps found; vectorized join engine not applicable")
+            return None
+
+        send_codes = open_index.lookup(send_df['recipient_name'])
+
+        join_plan = new_join_plan(n_send)
+        open_pos = join_plan['open_pos']
+        phase = join_plan['phase']
+        increment = join_plan['increment']
+        failure_reason = join_plan['failure_reason']
+        match_count = join_plan['match_count']
+
+        # Phase 1: 0-11 seconds against all Opens
+        if recipient_opens is None:
+            has_opens = send_codes >= 0
+        else:
+            has_opens, has_unused_opens = recipient_opens
+        failure_reason[~has_opens] = 'no_open_records_for_email'
+
+        rows = np.flatnonzero(has_opens)
+        found, count, inc, pos = open_index.search(send_codes[rows], send_ns[rows], PHASE1_WINDOW)
+
+        matched = found & (count == 1)
+        multiple = found & (count > 1)
+
+        open_pos[rows[matched]] = pos[matched]
+        phase[rows[matched]] = 1
+        increment[rows[matched]] = inc[matched]
+        open_index.mark_consumed(pos[matched])
+
+        failure_reason[rows[multiple]] = [f'multiple_matches_at_plus_{i}_seconds' for i in inc[multiple]]
+        match_count[rows[multiple]] = count[multiple]
+        failure_reason[rows[~found]] = 'no_match_within_11_seconds'
+
+        phase1_stats = self._increment_breakdown(inc[matched])
+        phase1_stats['no_match'] = int((~has_opens).sum() + (~found).sum())
+        phase1_stats['multiple_match'] = int(multiple.sum())
+
+        # Phase 2: 12-60 seconds, failed Sends against Opens unused in Phase 1
+        unused_index = open_index.available()
+
+        # A Send keeps its Phase 1 failure when its recipient has no unused Opens at all
+        eligible = (phase == 0) & has_opens
+        if recipient_opens is None:
+            eligible[eligible] = unused_index.group_sizes()[send_codes[eligible]] > 0
+        else:
+            eligible &= has_unused_opens
+
+        rows = np.flatnonzero(eligible)
+        found, count, inc, pos = unused_index.search(send_codes[rows], send_ns[rows], PHASE2_WINDOW)
+
+        matched = found & (count == 1)
+        multiple = found & (count > 1)
+
+        open_pos[rows[matched]] = pos[matched]
+        phase[rows[matched]] = 2
+        increment[rows[matched]] = inc[matched]
+        failure_reason[rows[matched]] = None
+        match_count[rows[matched]] = 0
+
+        failure_reason[rows[multiple]] = [f'multiple_matches_at_plus_{i}_seconds_phase2' for i in inc[multiple]]
+        match_count[rows[multiple]] = count[multiple]
+        failure_reason[rows[~found]] = 'no_match_within_60_seconds'
+
+        phase2_stats = self._increment_breakdown(inc[matched])
+
+        join_plan['stats'] = join_plan_stats(join_plan, open_index.n_opens, phase1_stats, phase2_stats, time.time() - start_time)
+        return join_plan
+
+    def _increment_breakdown(self, increments):
+        """Count matches per seconds offset"""
+        values, counts = np.unique(increments, return_counts=True)
+        return {int(v): int(c) for v, c in zip(values, counts)}
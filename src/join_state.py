@@ -0,0 +1,274 @@
+import pandas as pd
+import numpy as np
+import os
+import pickle
+import logging
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+STATE_VERSION = 2
+
+# Open rows are the same Open across cumulative exports when these match; the
+# other columns (Views, Clicks, last_opened, ...) are counters updated in place
+OPEN_IDENTITY_COLUMNS = ['recipient_name', 'sent_date', 'Subject']
+
+# Delta records appended to a state file before it is rewritten as one snapshot
+COMPACT_AFTER_DELTAS = 16
+
+JOIN_PLAN_FIELDS = ('open_pos', 'phase', 'increment', 'failure_reason', 'match_count')
+
+
+def row_hashes(df):
+    """Stable uint64 hash per row over all columns (index ignored)"""
+    if len(df) == 0:
+        return np.empty(0, dtype=np.uint64)
+    return pd.util.hash_pandas_object(df, index=False).to_numpy(copy=True)
+
+
+def occurrence_keys(hashes):
+    """
+    Make row hashes unique by their occurrence number, so the k-th of several
+    identical rows in one export lines up with the k-th stored copy.
+    """
+    if len(hashes) == 0:
+        return np.empty(0, dtype=np.uint64)
+    keys = pd.Series(hashes)
+    occurrence = keys.groupby(keys).cumcount().values
+    return pd.util.hash_pandas_object(pd.DataFrame({'hash': hashes, 'occurrence': occurrence}), index=False).to_numpy(copy=True)
+
+
+def open_identity_keys(open_df):
+    """Occurrence keys over the Open identity columns present in open_df"""
+    identity = [col for col in OPEN_IDENTITY_COLUMNS if col in open_df.columns]
+    return occurrence_keys(row_hashes(open_df[identity]))
+
+
+class SdrJoinState:
+    """
+    Persisted Send-Open join state for one SDR, used by incremental ingestion.
+
+    - send_df / open_df: every cleaned Send / Open row ingested so far
+    - join_plan: join plan aligned with send_df positions (see new_join_plan)
+    - send_keys: occurrence keys of send_df row hashes, used to find new Sends
+    - open_keys / open_hashes: occurrence keys of open_df identities and full-row
+      hashes, used to find new Opens and Opens whose counters changed
+    - watermark: latest sent_date seen in either file
+
+    The state file holds a snapshot followed by one pickled delta record per
+    run (new rows, updated Open rows, changed join plan entries), so a run
+    writes only what it changed. Every COMPACT_AFTER_DELTAS runs the file is
+    rewritten as a single snapshot.
+    """
+
+    def __init__(self, sdr_name):
+        self.sdr_name = sdr_name
+        self.send_df = None
+        self.open_df = None
+        self.join_plan = None
+        self.send_keys = np.empty(0, dtype=np.uint64)
+        self.open_keys = np.empty(0, dtype=np.uint64)
+        self.open_hashes = np.empty(0, dtype=np.uint64)
+        self.watermark = None
+        self._pending = None
+        self._delta_count = 0
+        self._log_size = None
+
+    @staticmethod
+    def path(state_dir, sdr_name):
+        """State file for an SDR inside state_dir"""
+        safe_name = "".join(c if c.isalnum() or c in '._-' else '_' for c in sdr_name)
+        return os.path.join(state_dir, f"{safe_name}.join_state.pkl")
+
+    @classmethod
+    def load(cls, state_dir, sdr_name):
+        """
+        Load an SDR's state (snapshot plus delta records), or an empty state if
+        none exists or its snapshot cannot be read. A torn trailing delta is
+        dropped; its rows are ingested again on the next run.
+        """
+        state_file = cls.path(state_dir, sdr_name)
+        if not os.path.exists(state_file):
+            return cls(sdr_name)
+
+        try:
+            state = cls(sdr_name)
+            with open(state_file, 'rb') as f:
+                payload = pickle.load(f)
+                if payload.get('version') != STATE_VERSION:
+                    logger.warning(f"⚠️ Ignoring join state with unsupported version: {state_file}")
+                    return cls(sdr_name)
+                for key in ('send_df', 'open_df', 'join_plan', 'send_keys', 'open_keys', 'open_hashes', 'watermark'):
+                    setattr(state, key, payload[key])
+                state._log_size = f.tell()
+
+                while True:
+                    try:
+                        delta = pickle.load(f)
+                    except EOFError:
+                        break
+                    except Exception as e:
+                        logger.warning(f"⚠️ Dropping unreadable trailing delta in {state_file}: {str(e)}")
+                        break
+                    state._apply(delta)
+                    state._delta_count += 1
+                    state._log_size = f.tell()
+
+            logger.info(f"📂 Loaded join state for {sdr_name}: {len(state.send_df)} sends, {len(state.open_df)} opens, "
+                        f"{state._delta_count} deltas, watermark {state.watermark}")
+            return state
+
+        except Exception as e:
+            logger.warning(f"⚠️ Could not read join state {state_file}, starting fresh: {str(e)}")
+            return cls(sdr_name)
+
+    def save(self, state_dir):
+        """
+        Append this run's delta record, or write a fresh snapshot atomically
+        (temp file + rename) on first ingest and when compaction is due.
+        """
+        os.makedirs(state_dir, exist_ok=True)
+        state_file = self.path(state_dir, self.sdr_name)
+
+        if self._pending is None or self._log_size is None or self._delta_count >= COMPACT_AFTER_DELTAS:
+            payload = {
+                'version': STATE_VERSION,
+                'send_df': self.send_df,
+                'open_df': self.open_df,
+                'join_plan': self.join_plan,
+                'send_keys': self.send_keys,
+                'open_keys': self.open_keys,
+                'open_hashes': self.open_hashes,
+                'watermark': self.watermark
+            }
+            tmp_file = state_file + '.tmp'
+            with open(tmp_file, 'wb') as f:
+                pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+                log_size = f.tell()
+            os.replace(tmp_file, state_file)
+            self._delta_count = 0
+        else:
+            with open(state_file, 'r+b') as f:
+                # Overwrite a torn record left by an interrupted run
+                f.seek(self._log_size)
+                f.truncate()
+                pickle.dump(self._pending, f, protocol=pickle.HIGHEST_PROTOCOL)
+                log_size = f.tell()
+            self._delta_count += 1
+
+        self._log_size = log_size
+        self._pending = None
+
+    def is_empty(self):
+        return self.send_df is None or self.open_df is None or self.join_plan is None
+
+    def is_compatible(self, send_df, open_df):
+        """Row keys only line up when the cleaned columns are unchanged"""
+        return list(send_df.columns) == list(self.send_df.columns) and list(open_df.columns) == list(self.open_df.columns)
+
+    def reset(self, send_df, open_df, join_plan):
+        """Replace the state with a full join of send_df and open_df (written as a snapshot)"""
+        self.send_df = send_df.reset_index(drop=True)
+        self.open_df = open_df.reset_index(drop=True)
+        self.join_plan = join_plan
+        self.send_keys = occurrence_keys(row_hashes(self.send_df))
+        self.open_keys = open_identity_keys(self.open_df)
+        self.open_hashes = row_hashes(self.open_df)
+        self.watermark = None
+        self.advance_watermark(self.send_df['sent_date'], self.open_df['sent_date'])
+        self._pending = None
+
+    def diff(self, send_df, open_df):
+        """
+        Compare an export with the stored rows.
+
+        Sends are new when their full row was not stored yet. Opens are matched
+        on their identity (OPEN_IDENTITY_COLUMNS): an unknown identity is a new
+        Open, a known one whose other columns changed is an update.
+
+        Returns:
+            dict: new_send / new_open frames, open_update_pos (stored positions)
+                  with open_updates (their new rows), plus the keys and hashes
+                  of those rows
+        """
+        send_keys = occurrence_keys(row_hashes(send_df))
+        new_send_pos = np.flatnonzero(~pd.Index(send_keys).isin(self.send_keys))
+
+        open_keys = open_identity_keys(open_df)
+        open_hashes = row_hashes(open_df)
+        stored_pos = pd.Index(self.open_keys).get_indexer(open_keys)
+        new_open_pos = np.flatnonzero(stored_pos < 0)
+        known = np.flatnonzero(stored_pos >= 0)
+        changed = known[open_hashes[known] != self.open_hashes[stored_pos[known]]]
+
+        return {
+            'new_send': send_df.take(new_send_pos).reset_index(drop=True),
+            'send_keys': send_keys[new_send_pos],
+            'new_open': open_df.take(new_open_pos).reset_index(drop=True),
+            'open_keys': open_keys[new_open_pos],
+            'open_hashes': open_hashes[new_open_pos],
+            'open_update_pos': stored_pos[changed],
+            'open_updates': open_df.take(changed).reset_index(drop=True),
+            'open_update_hashes': open_hashes[changed]
+        }
+
+    def ingest(self, changes, plan_rows, plan_values):
+        """
+        Apply a diff plus the join plan entries re-matched for it, advance the
+        watermark, and queue all of it as this run's delta record for save().
+
+        Args:
+            changes: dict from diff()
+            plan_rows: Send positions (after appending new_send) whose plan entries changed
+            plan_values: {join plan field: values aligned with plan_rows}
+        """
+        self.advance_watermark(changes['new_send']['sent_date'], changes['new_open']['sent_date'])
+        delta = dict(changes, plan_rows=plan_rows, plan_values=plan_values, watermark=self.watermark)
+        self._apply(delta)
+        self._pending = delta
+
+    def _apply(self, delta):
+        """Apply one delta record to the in-memory state"""
+        n_old_send = len(self.send_df)
+        if len(delta['new_send']) > 0:
+            self.send_df = pd.concat([self.send_df, delta['new_send']], ignore_index=True)
+            self.send_keys = np.concatenate([self.send_keys, delta['send_keys']])
+
+        update_pos = delta['open_update_pos']
+        if len(update_pos) > 0:
+            updates = delta['open_updates']
+            identity = [col for col in OPEN_IDENTITY_COLUMNS if col in self.open_df.columns]
+            for col in self.open_df.columns.drop(identity):
+                if isinstance(self.open_df[col].dtype, pd.CategoricalDtype):
+                    new_categories = pd.Index(updates[col].dropna().unique()).difference(self.open_df[col].cat.categories)
+                    self.open_df[col] = self.open_df[col].cat.add_categories(new_categories)
+                self.open_df.loc[update_pos, col] = updates[col].values
+            self.open_hashes[update_pos] = delta['open_update_hashes']
+
+        if len(delta['new_open']) > 0:
+            self.open_df = pd.concat([self.open_df, delta['new_open']], ignore_index=True)
+            self.open_keys = np.concatenate([self.open_keys, delta['open_keys']])
+            self.open_hashes = np.concatenate([self.open_hashes, delta['open_hashes']])
+
+        # New Sends start unmatched; re-matched entries overwrite the stored plan
+        n_send = len(self.send_df)
+        if n_send > n_old_send:
+            for field in JOIN_PLAN_FIELDS:
+                stored = self.join_plan[field]
+                extended = np.empty(n_send, dtype=stored.dtype)
+                extended[:n_old_send] = stored
+                extended[n_old_send:] = {'open_pos': -1, 'phase': 0, 'increment': -1, 'failure_reason': None, 'match_count': 0}[field]
+                self.join_plan[field] = extended
+        for field in JOIN_PLAN_FIELDS:
+            self.join_plan[field][delta['plan_rows']] = delta['plan_values'][field]
+
+        self.watermark = delta['watermark']
+
+    def advance_watermark(self, *date_columns):
+        """Move the watermark to the latest timestamp in the given columns"""
+        latest = [dates.max() for dates in date_columns if len(dates) > 0]
+        latest = [value for value in latest if pd.notna(value)]
+        if self.watermark is not None:
+            latest.append(self.watermark)
+        if latest:
+            self.watermark = max(latest)
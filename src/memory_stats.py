@@ -0,0 +1,83 @@
+import sys
+import logging
+
+try:
+    import resource
+except ImportError:  # Not available on Windows: peak RSS is then reported as None
+    resource = None
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Values per object column whose deep size is measured; the rest is extrapolated
+MEMORY_SAMPLE_ROWS = 10000
+
+
+def frame_bytes(df, sample_rows=MEMORY_SAMPLE_ROWS):
+    """
+    Approximate deep memory of a DataFrame: exact for numeric, datetime and
+    categorical columns; object (string) columns are measured on an evenly
+    spaced sample and scaled to their length, since df.memory_usage(deep=True)
+    costs a Python call per value.
+    """
+    if df is None:
+        return 0
+    total = int(df.index.memory_usage(deep=False))
+    n_rows = len(df)
+    step = max(1, n_rows // sample_rows)
+    for position, dtype in enumerate(df.dtypes):
+        column = df.iloc[:, position]
+        if dtype != object or step == 1:
+            total += int(column.memory_usage(index=False, deep=True))
+            continue
+        sample = column.iloc[::step]
+        object_bytes = sample.memory_usage(index=False, deep=True) - sample.memory_usage(index=False, deep=False)
+        total += int(column.memory_usage(index=False, deep=False)) + int(object_bytes * n_rows / len(sample))
+    return total
+
+
+def peak_rss_bytes():
+    """Peak resident set size of this process so far (None where getrusage is unavailable)"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return int(peak if sys.platform == 'darwin' else peak * 1024)
+
+
+class MemoryReport:
+    """
+    Memory accounting across pipeline stages: bytes held by the frames alive
+    after each stage plus the process peak RSS at that point, for sizing
+    containers.
+    """
+
+    def __init__(self):
+        self.stages = []
+
+    def record(self, stage, *frames):
+        """Record the frames alive after a stage (None entries are skipped)"""
+        self.stages.append({
+            'stage': stage,
+            'bytes': sum(frame_bytes(frame) for frame in frames),
+            'peak_rss_bytes': peak_rss_bytes()
+        })
+
+    def as_dict(self):
+        """JSON-serializable report: per-stage entries plus the largest stage and peak RSS"""
+        if not self.stages:
+            return {'stages': [], 'peak_stage': None, 'peak_bytes': 0, 'peak_rss_bytes': peak_rss_bytes()}
+        peak = max(self.stages, key=lambda entry: entry['bytes'])
+        return {
+            'stages': list(self.stages),
+            'peak_stage': peak['stage'],
+            'peak_bytes': peak['bytes'],
+            'peak_rss_bytes': peak_rss_bytes()
+        }
+
+    def log_summary(self, label):
+        """One log line with the bytes per stage"""
+        stages = ', '.join(f"{entry['stage']} {entry['bytes'] / 2**20:.1f} MiB" for entry in self.stages)
+        rss = peak_rss_bytes()
+        rss_text = f", peak RSS {rss / 2**20:.1f} MiB" if rss is not None else ""
+        logger.info(f"🧮 {label} memory: {stages}{rss_text}")
@@ -0,0 +1,140 @@
+import pandas as pd
+import shutil
+import logging
+from .executors import iter_sdr_joins
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def multi_sdr_job(job, processor, sdr_configs, executor='thread', jobs=None, result_store=None, work_dir=None):
+    """
+    Multi-SDR pipeline as a background job: per-SDR Send-Open joins, concat,
+    then the contacts join, reporting the stage, SDRs done and Send rows
+    joined, with one progress row per SDR.
+
+    Args:
+        job: job_runner.Job to report progress to
+        processor: DataProcessor used as the template for every SDR
+        sdr_configs: List of dicts with 'name', 'send_file', 'open_file'
+        executor, jobs: As iter_sdr_joins
+        result_store: Optional SdrResultStore (unchanged cards reuse their result)
+        work_dir: Optional directory holding the input files (an extracted
+                  archive), removed when the job ends
+
+    Returns:
+        dict: successful_data, failed_data, original_send_count, sdr_count,
+              processing_log and error (None on success)
+    """
+    try:
+        return _multi_sdr_pipeline(job, processor, sdr_configs, executor, jobs, result_store)
+    finally:
+        if work_dir is not None:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def _multi_sdr_pipeline(job, processor, sdr_configs, executor, jobs, result_store):
+    """Body of multi_sdr_job"""
+    job.update(stage='Send-Open joins', done=0, total=len(sdr_configs))
+    for position, sdr_config in enumerate(sdr_configs):
+        job.set_item(position, **{'SDR': sdr_config['name'], 'Status': '⏳ Queued', 'Send-Open Joined': 0,
+                                  'Failed': 0, 'Seconds': 0.0, 'Errors': ''})
+
+    sdr_results = [None] * len(sdr_configs)
+
+    def on_result(position, result):
+        sdr_results[position] = result
+        succeeded = result['successful'] is not None
+        joined = len(result['successful']) if succeeded else 0
+        failed = len(result['failed']) if result['failed'] is not None else 0
+        status = ('♻️ Reused' if result.get('reused') else '✅ Done') if succeeded else '❌ Failed'
+        job.set_item(position, **{'Status': status, 'Send-Open Joined': joined, 'Failed': failed,
+                                  'Seconds': round(result['elapsed_seconds'], 2), 'Errors': ', '.join(result['errors'])})
+        job.update(add_done=1, add_rows=joined + failed)
+
+    # Step 1: Send-Open join per SDR; unchanged cards reuse their previous result
+    if result_store is not None:
+        result_store.run(processor, sdr_configs, executor=executor, jobs=jobs, on_result=on_result)
+    else:
+        for position, result in iter_sdr_joins(processor, sdr_configs, executor=executor, jobs=jobs):
+            on_result(position, result)
+
+    all_send_open_successful = []
+    all_send_open_failed = []
+    processing_log = []
+    for idx, sdr_result in enumerate(sdr_results):
+        sdr_name = sdr_result['name']
+        send_open_successful = sdr_result['successful']
+        send_open_failed = sdr_result['failed']
+        processing_log.append(f"Processing SDR {idx + 1}: {sdr_name}...")
+
+        if send_open_successful is not None:
+            all_send_open_successful.append(send_open_successful)
+            if send_open_failed is not None and len(send_open_failed) > 0:
+                all_send_open_failed.append(send_open_failed)
+
+            reused_note = " (unchanged, reused)" if sdr_result.get('reused') else ""
+            processing_log.append(f"✅ {sdr_name}: {len(send_open_successful)} Send-Open joined, {len(send_open_failed) if send_open_failed is not None else 0} failed{reused_note}")
+        else:
+            processing_log.append(f"❌ {sdr_name}: Failed - {', '.join(sdr_result['errors'])}")
+
+    outcome = {'successful_data': None, 'failed_data': None, 'original_send_count': 0,
+               'sdr_count': len(all_send_open_successful), 'processing_log': processing_log, 'error': None}
+    if not all_send_open_successful:
+        outcome['error'] = "No SDR Send-Open joins were successful"
+        return outcome
+
+    # Step 2: Combine all SDRs' Send-Open data
+    job.update(stage='Combining SDRs')
+    combined_send_open = pd.concat(all_send_open_successful, ignore_index=True)
+    combined_send_open_failed = pd.concat(all_send_open_failed, ignore_index=True) if all_send_open_failed else pd.DataFrame()
+    processing_log.append(f"📊 Combined {len(all_send_open_successful)} SDRs: {len(combined_send_open)} total Send-Open records")
+
+    # Step 3: Join combined data with contacts
+    job.update(stage='Contacts join')
+    final_successful, contacts_failed, errors = processor.process_multi_sdr_combined(combined_send_open)
+    if final_successful is None:
+        outcome['error'] = f"Failed to join with contacts: {', '.join(errors)}"
+        return outcome
+
+    all_failed_list = []
+    if len(combined_send_open_failed) > 0:
+        all_failed_list.append(combined_send_open_failed)
+    if contacts_failed is not None and len(contacts_failed) > 0:
+        all_failed_list.append(contacts_failed)
+    all_failed = pd.concat(all_failed_list, ignore_index=True) if all_failed_list else pd.DataFrame()
+
+    processing_log.append(f"✅ Final: {len(final_successful)} records with contacts, {len(all_failed)} total failed")
+    outcome.update({
+        'successful_data': final_successful,
+        'failed_data': all_failed,
+        'original_send_count': len(combined_send_open) + len(combined_send_open_failed)
+    })
+    return outcome
+
+
+def calls_job(job, calls_processor, calls_file):
+    """
+    Calls file validation and processing as a background job.
+
+    Returns:
+        dict: is_valid, error_messages, calls_data (as process_calls_file)
+    """
+    job.update(stage='Validating and processing calls file', done=0, total=1)
+    is_valid, error_messages, calls_data = calls_processor.process_calls_file(calls_file)
+    job.update(done=1, rows_processed=len(calls_data) if calls_data is not None else 0)
+    return {'is_valid': is_valid, 'error_messages': error_messages, 'calls_data': calls_data}
+
+
+def combined_join_job(job, combined_processor, email_data, calls_data):
+    """
+    Email-calls join of the data processed in the other tabs as a background job.
+
+    Returns:
+        dict: joined_data, email_only_data, calls_only_data, join_stats (as join_email_calls)
+    """
+    job.update(stage='Email-calls join', done=0, total=1)
+    joined_data, email_only_data, calls_only_data, join_stats = combined_processor.join_email_calls(email_data, calls_data)
+    job.update(done=1, rows_processed=len(email_data) + len(calls_data))
+    return {'joined_data': joined_data, 'email_only_data': email_only_data,
+            'calls_only_data': calls_only_data, 'join_stats': join_stats}
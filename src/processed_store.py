@@ -0,0 +1,142 @@
+import os
+import time
+import logging
+import pandas as pd
+from .read_schema import read_csv_with_schema
+from .executors import run_concurrently
+
+try:
+    import pyarrow  # noqa: F401  (Parquet / Feather support in pandas)
+except ImportError:  # Optional: without pyarrow the processed outputs are written as CSV
+    pyarrow = None
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Storage formats for data/processed_files: Parquet and Feather keep dates,
+# categoricals and numbers typed; CSV is the plain-text export
+OUTPUT_FORMATS = ('parquet', 'feather', 'csv')
+TYPED_FORMATS = ('parquet', 'feather')
+FORMAT_EXTENSIONS = {'parquet': '.parquet', 'feather': '.feather', 'csv': '.csv'}
+
+
+def default_output_format():
+    """Parquet when pyarrow is installed, CSV otherwise"""
+    return 'parquet' if pyarrow is not None else 'csv'
+
+
+def resolve_output_format(output_format=None):
+    """
+    Validate an output format; typed formats fall back to CSV (with a warning)
+    when pyarrow is missing.
+    """
+    if output_format is None:
+        return default_output_format()
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"Unknown output format '{output_format}'. Expected one of: {', '.join(OUTPUT_FORMATS)}")
+    if output_format in TYPED_FORMATS and pyarrow is None:
+        logger.warning(f"⚠️ pyarrow is not installed, writing CSV instead of {output_format}")
+        return 'csv'
+    return output_format
+
+
+def processed_file_name(name, output_format):
+    """File name of a processed dataset in a format, e.g. processed_email_data.parquet"""
+    return f"{name}{FORMAT_EXTENSIONS[output_format]}"
+
+
+def write_processed(df, output_dir, name, output_format, schema):
+    """
+    Write a processed dataset. CSV gets the frame as is; typed formats get it
+    as the dashboard uses it: the schema's date columns as datetime64 and its
+    categoricals as category, so loading needs no conversion.
+
+    Args:
+        df: Processed DataFrame
+        output_dir: Output folder (data/processed_files)
+        name: Dataset name without extension (e.g. 'processed_email_data')
+        output_format: One of OUTPUT_FORMATS
+        schema: ReadSchema the dashboard reads the dataset with
+
+    Returns:
+        str: Path of the written file
+    """
+    path = os.path.join(output_dir, processed_file_name(name, output_format))
+    if output_format == 'csv':
+        df.to_csv(path, index=False)
+        return path
+
+    typed_df = _typed_frame(df, schema).reset_index(drop=True)
+    if output_format == 'parquet':
+        typed_df.to_parquet(path, index=False)
+    else:
+        typed_df.to_feather(path)
+    return path
+
+
+def find_processed_file(output_dir, name):
+    """
+    Path of a processed dataset in any format (None if missing). When several
+    formats exist, the most recently written one is current.
+    """
+    candidates = [os.path.join(output_dir, processed_file_name(name, output_format)) for output_format in OUTPUT_FORMATS]
+    candidates = [path for path in candidates if os.path.exists(path)]
+    if not candidates:
+        return None
+    return max(candidates, key=os.path.getmtime)
+
+
+def read_processed(path, schema):
+    """
+    Load a processed dataset as the dashboard uses it, whatever its format:
+    typed files are read natively; CSVs are parsed with the schema and their
+    date columns coerced to datetime (unparseable values become NaT).
+
+    Args:
+        path: Processed file (.parquet, .feather or .csv)
+        schema: ReadSchema for CSV parsing (dates and categoricals)
+
+    Returns:
+        DataFrame
+    """
+    start_time = time.time()
+    extension = os.path.splitext(path)[1]
+    if extension == FORMAT_EXTENSIONS['parquet']:
+        df = pd.read_parquet(path)
+    elif extension == FORMAT_EXTENSIONS['feather']:
+        df = pd.read_feather(path)
+    else:
+        df = read_csv_with_schema(path, schema)[0]
+        for column in df.columns:
+            if column in schema.date_formats and not pd.api.types.is_datetime64_any_dtype(df[column]):
+                df[column] = pd.to_datetime(df[column], errors='coerce')
+    logger.info(f"📂 Loaded {len(df)} rows from {path} in {time.time() - start_time:.3f}s")
+    return df
+
+
+def load_processed_files(files, executor='thread', jobs=None):
+    """
+    Load several processed datasets concurrently (they share nothing), so a
+    cold load takes about as long as the largest file.
+
+    Args:
+        files: Dict {key: (path, schema)}; entries with a None path are skipped
+        executor: 'serial', 'thread' or 'process' (see run_concurrently)
+        jobs: Worker count (None → one per file)
+
+    Returns:
+        tuple: ({key: DataFrame}, {key: seconds}, wall-clock seconds)
+    """
+    calls = {key: (read_processed, (path, schema)) for key, (path, schema) in files.items() if path is not None}
+    return run_concurrently(calls, executor=executor, jobs=jobs, label='processed file loads')
+
+
+def _typed_frame(df, schema):
+    """The frame with the schema's date and categorical columns converted (input left untouched)"""
+    converted = {}
+    for column in df.columns:
+        if column in schema.date_formats and not pd.api.types.is_datetime64_any_dtype(df[column]):
+            converted[column] = pd.to_datetime(df[column], errors='coerce')
+        elif column in schema.categoricals and not isinstance(df[column].dtype, pd.CategoricalDtype):
+            converted[column] = df[column].astype('category')
+    return df.assign(**converted) if converted else df
@@ -0,0 +1,151 @@
+import pandas as pd
+import logging
+from .csv_loader import read_csv_sniffed, read_csv_sample, sniff_encoding
+from .date_parsing import parse_datetimes
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Date format of Send exports and of the DD/MM/YYYY dates used across the app
+SEND_DATE_FORMAT = '%d/%m/%Y %H:%M:%S'
+CALLS_DATE_FORMAT = '%d/%m/%Y'
+# Dates as pandas writes them to the processed output files
+PROCESSED_DATETIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+PROCESSED_DATE_FORMAT = '%Y-%m-%d'
+# Open export timestamps ("Jul 3, 2025, 02:14:21" or ISO), decoded without per-value parsing
+OPEN_DATE_FORMATS = ['%b %d, %Y, %H:%M:%S', '%Y-%m-%d %H:%M:%S']
+
+# Read specs per file role, keyed by system column names (after column mapping):
+# - passthrough: columns loaded besides the mapped and required ones; roles without
+#   it load every column. The upload roles have none: the joins and processed
+#   outputs carry every Send, Open, contacts and calls column, so none is unused
+# - dtypes: explicit parse dtypes instead of per-chunk inference
+# - categoricals: low-cardinality columns loaded as category
+# - date_formats: columns parsed to datetime right after reading, with an explicit format
+ROLE_READ_SPECS = {
+    'send_mails': {
+        'dtypes': {'recipient_name': 'str', 'Recipient Email': 'str', 'thread_id': 'str', 'message_id': 'str'},
+        'categoricals': ['Domain'],
+        'date_formats': {'sent_date': SEND_DATE_FORMAT}
+    },
+    'open_mails': {
+        'dtypes': {'recipient_name': 'str', 'sent_date': 'str', 'last_opened': 'str'},
+        'categoricals': ['Subject']
+    },
+    'contacts': {
+        'dtypes': {'Email': 'str', 'Company URL': 'str', 'Assigned Date (Marketing)': 'str'}
+    },
+    'calls': {
+        'dtypes': {'Company / Account': 'str', 'Contact': 'str', 'Email': 'str', 'Full Comments': 'str'},
+        'categoricals': ['Assigned', 'Call Disposition'],
+        'date_formats': {'Date': CALLS_DATE_FORMAT}
+    },
+    # Processed outputs read back by the dashboard (every column is shown)
+    'processed_email': {
+        'dtypes': {'recipient_name': 'str', 'Recipient Email': 'str', 'Email': 'str', 'Company URL': 'str'},
+        'categoricals': ['SDR_Name', 'Subject'],
+        'date_formats': {'sent_date': PROCESSED_DATETIME_FORMAT, 'last_opened': PROCESSED_DATETIME_FORMAT}
+    },
+    'processed_calls': {
+        'dtypes': {'Company / Account': 'str', 'Contact': 'str', 'Email': 'str', 'Full Comments': 'str'},
+        'categoricals': ['Assigned', 'Call Disposition'],
+        'date_formats': {'Date': PROCESSED_DATE_FORMAT}
+    }
+}
+
+
+class ReadSchema:
+    """
+    Which columns of a CSV to load and how to type them at parse time.
+
+    Entries are keyed by system column names and resolved against a file's
+    actual header (through its column renames), so the same schema serves every
+    accepted header variant. Columns outside `columns` are never parsed.
+    """
+
+    def __init__(self, columns=None, dtypes=None, categoricals=(), date_formats=None):
+        self.columns = None if columns is None else list(dict.fromkeys(columns))
+        self.dtypes = dict(dtypes or {})
+        self.categoricals = list(categoricals)
+        self.date_formats = dict(date_formats or {})
+
+    def read_csv_kwargs(self, header, renames=None):
+        """
+        pd.read_csv keyword arguments for a file with the given header row.
+
+        Args:
+            header: Column names as they appear in the file
+            renames: {file column: system column} from the column mapping
+
+        Returns:
+            dict: usecols / dtype for the present columns (dates: see parse_dates)
+        """
+        renames = renames or {}
+        system_names = {column: renames.get(column, column) for column in header}
+
+        if self.columns is None:
+            usecols = list(header)
+        else:
+            keep = set(self.columns)
+            usecols = [column for column in header if column in keep or system_names[column] in keep]
+
+        dtype = {}
+        for column in usecols:
+            system_name = system_names[column]
+            if system_name in self.date_formats:
+                continue  # Read as text, converted by parse_dates
+            elif system_name in self.categoricals:
+                dtype[column] = 'category'
+            elif system_name in self.dtypes:
+                dtype[column] = self.dtypes[system_name]
+
+        kwargs = {}
+        if self.columns is not None and len(usecols) < len(header):
+            kwargs['usecols'] = usecols
+        if dtype:
+            kwargs['dtype'] = dtype
+        return kwargs
+
+    def parse_dates(self, df, renames=None):
+        """
+        Convert the schema's date columns of a freshly read frame in place. A column
+        with any value off its format is left as text for the existing coercing
+        conversions downstream.
+        """
+        renames = renames or {}
+        for column in df.columns:
+            date_format = self.date_formats.get(renames.get(column, column))
+            if date_format is None or pd.api.types.is_datetime64_any_dtype(df[column]):
+                continue
+            parsed = parse_datetimes(df[column], date_format)
+            if parsed.notna().sum() == df[column].notna().sum():
+                df[column] = parsed
+        return df
+
+
+def build_read_schema(role, mapping=None, required_columns=()):
+    """
+    ReadSchema for a file role: the mapped (either header variant) and required
+    columns plus the role's passthrough columns, typed per ROLE_READ_SPECS.
+    """
+    spec = ROLE_READ_SPECS[role]
+    mapping = mapping or {}
+    columns = None
+    if 'passthrough' in spec:
+        columns = list(mapping) + list(mapping.values()) + list(required_columns) + spec['passthrough']
+    return ReadSchema(columns, spec.get('dtypes'), spec.get('categoricals', ()), spec.get('date_formats'))
+
+
+def read_csv_with_schema(file, schema, renames=None, sniffed=None):
+    """
+    Parse a CSV with a ReadSchema: the header row is read first so the schema
+    can be resolved against the columns actually present.
+
+    Returns:
+        tuple: (DataFrame, load_info dict) as read_csv_sniffed
+    """
+    if sniffed is None:
+        sniffed = sniff_encoding(file)
+    header = list(read_csv_sample(file, sniffed[0], sample_rows=0).columns)
+    df, load_info = read_csv_sniffed(file, sniffed=sniffed, **schema.read_csv_kwargs(header, renames))
+    return schema.parse_dates(df, renames), load_info
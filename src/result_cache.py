@@ -0,0 +1,135 @@
+import hashlib
+import os
+import pickle
+import threading
+import time
+import logging
+import pandas as pd
+from .contacts_cache import file_content_hash
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Pipeline version folded into every key: bump it whenever a cached stage's
+# output changes, so entries from older code are never returned
+RESULT_CACHE_VERSION = 2
+RESULT_CACHE_MAX_BYTES = 512 * 1024 * 1024
+
+# Content hashes of files on disk, keyed by (path, mtime, size)
+_path_digests = {}
+
+
+def input_digest(file):
+    """
+    Content hash of an input: a path (re-hashed only when its mtime or size
+    changes) or an uploaded / open file, read without moving its position.
+    """
+    if file is None:
+        return None
+    if isinstance(file, (str, os.PathLike)):
+        abs_path = os.path.abspath(file)
+        stat = os.stat(abs_path)
+        stat_key = (abs_path, stat.st_mtime_ns, stat.st_size)
+        if stat_key not in _path_digests:
+            _path_digests[stat_key] = file_content_hash(abs_path)
+        return _path_digests[stat_key]
+
+    digest = hashlib.blake2b(digest_size=20)
+    if hasattr(file, 'getvalue'):
+        digest.update(file.getvalue())
+    else:
+        start = file.tell()
+        file.seek(0)
+        for block in iter(lambda: file.read(1 << 20), b''):
+            digest.update(block)
+        file.seek(start)
+    return digest.hexdigest()
+
+
+def frame_digest(df):
+    """Content hash of a DataFrame: column names, dtypes and row values (index ignored)"""
+    digest = hashlib.blake2b(digest_size=20)
+    digest.update(repr([(str(column), str(dtype)) for column, dtype in df.dtypes.items()]).encode('utf-8'))
+    digest.update(pd.util.hash_pandas_object(df, index=False).values.tobytes())
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """
+    Content-addressed on-disk cache of pipeline stage results.
+
+    Keys hash the stage name, RESULT_CACHE_VERSION and the stage inputs
+    (content digests of files and frames plus the settings that change the
+    output), so identical inputs map to the same pickle whatever their file
+    names. The directory is bounded to max_bytes: reads refresh an entry's
+    mtime and the least recently used entries are evicted after each write.
+    """
+
+    def __init__(self, cache_dir, max_bytes=RESULT_CACHE_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+
+    def key(self, stage, *parts):
+        """Cache key for a stage and its inputs (digests, settings: anything with a stable repr)"""
+        digest = hashlib.blake2b(digest_size=20)
+        digest.update(repr((RESULT_CACHE_VERSION, stage, parts)).encode('utf-8'))
+        return f"{stage}_{digest.hexdigest()}"
+
+    def cache_path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.pkl")
+
+    def get(self, key):
+        """Stored value for a key, None if missing or unreadable"""
+        start_time = time.time()
+        cache_file = self.cache_path(key)
+        try:
+            with open(cache_file, 'rb') as f:
+                value = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"⚠️ Ignoring unreadable result cache entry {cache_file}: {str(e)}")
+            return None
+        try:
+            os.utime(cache_file)  # Most recently used
+        except OSError:
+            pass
+        logger.info(f"⚡ Result cache hit for {key.rsplit('_', 1)[0]} in {time.time() - start_time:.3f}s")
+        return value
+
+    def put(self, key, value):
+        """Store a value atomically, then evict down to max_bytes; a failed write only costs a recompute"""
+        cache_file = self.cache_path(key)
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_file = f"{cache_file}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_file, 'wb') as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_file, cache_file)
+        except Exception as e:
+            logger.warning(f"⚠️ Could not write result cache entry {cache_file}: {str(e)}")
+            return
+        self._evict()
+
+    def _evict(self):
+        """Remove least recently used entries until the directory fits in max_bytes"""
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith('.pkl'):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.cache_dir, name))
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, name))
+
+        total_bytes = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total_bytes <= self.max_bytes:
+                break
+            try:
+                os.remove(os.path.join(self.cache_dir, name))
+                logger.info(f"🧹 Evicted result cache entry {name} ({size / 2**20:.1f} MiB)")
+            except FileNotFoundError:
+                pass
+            total_bytes -= size
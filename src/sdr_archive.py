@@ -0,0 +1,75 @@
+import os
+import shutil
+import tempfile
+import zipfile
+import logging
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# File names of one SDR's exports, as in data/ for preprocess_data.scan_sdr_files
+SEND_SUFFIX = '_send.csv'
+OPEN_SUFFIX = '_open.csv'
+
+
+def extract_sdr_archive(archive, target_dir=None):
+    """
+    Extract the {sdr}_send.csv / {sdr}_open.csv pairs of a zip archive to disk,
+    streaming each entry so no file is held in memory. Folders inside the
+    archive are ignored (entries are matched and written by base name).
+
+    Args:
+        archive: Path or binary file object of the zip
+        target_dir: Directory to extract into (default: a new temporary directory)
+
+    Returns:
+        tuple: (sdr_configs, warnings, target_dir) where sdr_configs is a list of
+               {'name', 'send_file', 'open_file'} dicts with file paths, sorted by name
+    """
+    created_dir = target_dir is None
+    target_dir = target_dir or tempfile.mkdtemp(prefix='sdr_archive_')
+    try:
+        sdr_configs, warnings = _extract_pairs(archive, target_dir)
+    except Exception:
+        if created_dir:
+            shutil.rmtree(target_dir, ignore_errors=True)
+        raise
+    logger.info(f"🗜️ Extracted {len(sdr_configs)} SDR file pairs to {target_dir} ({len(warnings)} warnings)")
+    return sdr_configs, warnings, target_dir
+
+
+def _extract_pairs(archive, target_dir):
+    """Write the archive's SDR files to target_dir and pair them by SDR name"""
+    warnings = []
+    send_files, open_files = {}, {}
+
+    with zipfile.ZipFile(archive) as zf:
+        for entry in zf.infolist():
+            filename = os.path.basename(entry.filename)
+            if entry.is_dir() or filename.startswith('.') or '__MACOSX' in entry.filename:
+                continue
+            if filename.endswith(SEND_SUFFIX):
+                sdr_files, sdr_name = send_files, filename[:-len(SEND_SUFFIX)]
+            elif filename.endswith(OPEN_SUFFIX):
+                sdr_files, sdr_name = open_files, filename[:-len(OPEN_SUFFIX)]
+            else:
+                warnings.append(f"Skipped {entry.filename}: not a {{sdr}}{SEND_SUFFIX} or {{sdr}}{OPEN_SUFFIX} file")
+                continue
+            if not sdr_name or sdr_name in sdr_files:
+                warnings.append(f"Skipped {entry.filename}: {'missing SDR name' if not sdr_name else 'duplicate file name'}")
+                continue
+
+            # Base names only, so entries cannot escape target_dir
+            path = os.path.join(target_dir, filename)
+            with zf.open(entry) as source, open(path, 'wb') as target:
+                shutil.copyfileobj(source, target, 1 << 20)
+            sdr_files[sdr_name] = path
+
+    sdr_configs = []
+    for sdr_name in sorted(set(send_files) | set(open_files)):
+        if sdr_name in send_files and sdr_name in open_files:
+            sdr_configs.append({'name': sdr_name, 'send_file': send_files[sdr_name], 'open_file': open_files[sdr_name]})
+        else:
+            missing = f"{sdr_name}{OPEN_SUFFIX}" if sdr_name in send_files else f"{sdr_name}{SEND_SUFFIX}"
+            warnings.append(f"Skipped SDR {sdr_name}: missing {missing}")
+    return sdr_configs, warnings
@@ -0,0 +1,286 @@
+import pandas as pd
+import numpy as np
+import os
+import pickle
+import shutil
+import tempfile
+import time
+import logging
+from .csv_loader import sniff_encoding, read_csv_sample, HEADER_SAMPLE_ROWS
+from .read_schema import PROCESSED_DATETIME_FORMAT
+from .join_engine import AsofJoinEngine, OpenIndex, PHASE1_WINDOW, PHASE2_WINDOW, NANOS_PER_SECOND, to_int64_ns
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Later Sends that can consume a bucket's Opens before its Phase 2 (60s)
+SEND_OVERLAP_SECONDS = PHASE2_WINDOW[1]
+# Opens those overlapping Sends can still match in Phase 1 (60s + 11s)
+OPEN_OVERLAP_SECONDS = PHASE2_WINDOW[1] + PHASE1_WINDOW[1]
+
+KEY_COLUMNS = ['recipient_name', 'sent_date']
+
+
+class StreamingSendOpenJoin:
+    """
+    Send-Open join for files larger than memory.
+
+    Pass 1 reads each CSV in chunks, applies DataProcessor's mapping, filtering
+    and cleaning rules per chunk, and spills the rows to on-disk time buckets
+    (exports are not time-ordered, so this is the external sort). It also keeps
+    per-recipient Open counts.
+
+    Pass 2 walks the buckets in time order. Phase 1 only needs Opens 0-11s after
+    a Send, and an Open can only be consumed by Sends up to 11s before it, so a
+    bucket plus an 11s overlap gives every recipient's Phase 1 consumption.
+    A bucket is then joined together with the next 60s of Sends and 71s of Opens
+    (everything that can influence its Phase 2) and its rows are appended to the
+    output CSV. Only three buckets are held in memory at a time.
+
+    The matched/NULL-filled rows equal DataProcessor._incremental_datetime_join;
+    rows are written bucket by bucket (Phase 1, Phase 2, unmatched within each).
+    """
+
+    def __init__(self, processor, chunk_size=100000, bucket_seconds=86400, work_dir=None):
+        if bucket_seconds < OPEN_OVERLAP_SECONDS:
+            raise ValueError(f"bucket_seconds must be at least {OPEN_OVERLAP_SECONDS}, got {bucket_seconds}")
+        self.processor = processor
+        self.engine = AsofJoinEngine()
+        self.chunk_size = chunk_size
+        self.bucket_seconds = bucket_seconds
+        self.work_dir = work_dir
+
+    def run(self, send_file, open_file, output_file, sdr_name=None):
+        """
+        Stream the Send-Open join of two CSV files into output_file.
+
+        Returns:
+            dict: Row counts, match counts, peak rows held in memory and timings
+        """
+        start_time = time.time()
+        self._spill_dir = tempfile.mkdtemp(prefix='send_open_stream_', dir=self.work_dir)
+        self._columns = {}
+        self._cache = {}
+        self.stats = {'send_rows': 0, 'open_rows': 0, 'buckets': 0, 'phase1_matches': 0,
+                      'phase2_matches': 0, 'unmatched': 0, 'peak_window_rows': 0}
+
+        try:
+            # Pass 1: chunked read + clean, spilled to time buckets
+            send_buckets, _ = self._spill(send_file, 'send_mails', 'send')
+            open_buckets, open_counts = self._spill(open_file, 'open_mails', 'open')
+            self.stats['spill_seconds'] = time.time() - start_time
+
+            buckets = sorted(send_buckets | open_buckets)
+            self.stats['buckets'] = len(buckets)
+
+            # Pass 2a: Phase 1 consumption per recipient across the whole file
+            consumed_counts = self._phase1_consumption(buckets)
+
+            # Pass 2b: join bucket by bucket and append to disk
+            self._cache = {}
+            tmp_output = output_file + '.tmp'
+            header = True
+            for bucket in sorted(send_buckets):
+                joined = self._join_bucket(bucket, open_counts, consumed_counts)
+                if sdr_name:
+                    joined['SDR_Name'] = sdr_name
+                # Explicit format: a bucket of midnight-only timestamps would otherwise be written date-only
+                joined.to_csv(tmp_output, mode='w' if header else 'a', header=header, index=False,
+                              date_format=PROCESSED_DATETIME_FORMAT)
+                header = False
+                self._evict(bucket)
+
+            if header:
+                raise ValueError("No Send rows left after cleaning")
+            os.replace(tmp_output, output_file)
+
+        finally:
+            shutil.rmtree(self._spill_dir, ignore_errors=True)
+
+        self.stats['elapsed_seconds'] = time.time() - start_time
+        logger.info(f"🌊 Streaming join wrote {self.stats['send_rows']} rows to {output_file}: "
+                    f"{self.stats['phase1_matches']} Phase 1, {self.stats['phase2_matches']} Phase 2, "
+                    f"{self.stats['unmatched']} NULL-filled ({self.stats['buckets']} buckets, "
+                    f"peak {self.stats['peak_window_rows']} rows in memory) in {self.stats['elapsed_seconds']:.2f}s")
+        return self.stats
+
+    def _spill(self, file, file_key, file_type):
+        """
+        Read, validate and clean a CSV chunk by chunk, appending rows to bucket files.
+
+        Returns:
+            tuple: (set of bucket ids, per-recipient row counts Series)
+        """
+        processor = self.processor
+        display_name = 'Send Mails CSV' if file_key == 'send_mails' else 'Open Mails CSV'
+        required_columns = processor.required_send_columns if file_key == 'send_mails' else processor.required_open_columns
+
+        bucket_ids = set()
+        recipient_counts = pd.Series(dtype=np.int64)
+        content_report = None
+        rows_read = 0
+
+        encoding, _ = sniff_encoding(file)
+        sample_df = read_csv_sample(file, encoding, sample_rows=1)
+        if len(sample_df) == 0:
+            raise ValueError(f"❌ **Empty File**: {display_name} contains no data rows.")
+        header = list(sample_df.columns)
+        rename_dict = processor._column_renames(header, processor.column_mappings[file_key], display_name)
+        read_schema = processor.read_schemas[file_key]
+        read_kwargs = read_schema.read_csv_kwargs(header, rename_dict)
+        for chunk in pd.read_csv(file, chunksize=self.chunk_size, encoding=encoding, **read_kwargs):
+            chunk = read_schema.parse_dates(chunk.rename(columns=rename_dict))
+            if rows_read == 0:
+                # Header contract and first-rows content checks reject the file, as in sheets_validator
+                missing_required = [col for col in required_columns if col not in chunk.columns]
+                if missing_required:
+                    raise ValueError(f"❌ **Missing Required Columns** in {display_name}: {', '.join(missing_required)}")
+
+                validation_result = processor._validate_data_content(chunk.head(HEADER_SAMPLE_ROWS), file_key, display_name)
+                if not validation_result['is_valid']:
+                    raise ValueError(' '.join(validation_result['errors']))
+
+            # Content rules over every row, reported for the whole file
+            chunk_report = processor._validate_data_content(chunk, file_key, display_name, row_offset=rows_read)
+            content_report = processor._merge_validation_reports([content_report, chunk_report])
+            rows_read += len(chunk)
+
+            chunk, _ = processor._apply_filtering_rules(chunk, file_key, display_name)
+            chunk = processor._clean_data(chunk, file_type)
+            self._columns[file_type] = list(chunk.columns)
+            self.stats[f'{file_type}_rows'] += len(chunk)
+
+            if file_type == 'open':
+                recipient_counts = recipient_counts.add(chunk['recipient_name'].value_counts(), fill_value=0)
+
+            chunk_buckets = to_int64_ns(chunk['sent_date']) // (self.bucket_seconds * NANOS_PER_SECOND)
+            for bucket, piece in chunk.groupby(chunk_buckets, sort=False):
+                with open(self._bucket_path(file_type, bucket), 'ab') as f:
+                    pickle.dump(piece, f, protocol=pickle.HIGHEST_PROTOCOL)
+                bucket_ids.add(int(bucket))
+
+        processor.last_validation_report[file_key] = content_report
+        for message in content_report['errors']:
+            logger.warning(message.replace('❌', '⚠️', 1))
+
+        logger.info(f"📦 Spilled {self.stats[f'{file_type}_rows']} {file_type} rows into {len(bucket_ids)} time buckets")
+        return bucket_ids, recipient_counts
+
+    def _phase1_consumption(self, buckets):
+        """Number of distinct Opens per recipient consumed by Phase 1 matches"""
+        consumed_counts = pd.Series(dtype=np.int64)
+
+        for bucket in buckets:
+            start_ns, end_ns = self._bucket_bounds(bucket)
+            lead_ns = PHASE1_WINDOW[1] * NANOS_PER_SECOND
+
+            send_df = self._window('send', bucket, start_ns - lead_ns, end_ns)
+            open_df = self._window('open', bucket, start_ns - lead_ns, end_ns + lead_ns)
+            self._evict(bucket)
+            if len(send_df) == 0 or len(open_df) == 0:
+                continue
+
+            open_index = OpenIndex(open_df)
+            send_ns = self._whole_seconds(send_df, open_index)
+            found, count, _, open_pos = open_index.search(open_index.lookup(send_df['recipient_name']), send_ns, PHASE1_WINDOW)
+
+            # Count each consumed Open once, in the bucket that owns it
+            consumed = np.unique(open_pos[found & (count == 1)])
+            open_ns = to_int64_ns(open_df['sent_date'])
+            consumed = consumed[(open_ns[consumed] >= start_ns) & (open_ns[consumed] < end_ns)]
+            if len(consumed) > 0:
+                consumed_counts = consumed_counts.add(open_df['recipient_name'].iloc[consumed].value_counts(), fill_value=0)
+
+        return consumed_counts
+
+    def _join_bucket(self, bucket, open_counts, consumed_counts):
+        """Join one bucket's Sends (with the overlap they depend on) and return its output rows"""
+        start_ns, end_ns = self._bucket_bounds(bucket)
+
+        own_sends = self._load('send', bucket)
+        overlap_sends = self._window('send', bucket + 1, end_ns, end_ns + SEND_OVERLAP_SECONDS * NANOS_PER_SECOND)
+        send_df = self._concat([own_sends, overlap_sends])
+        open_df = self._concat([self._load('open', bucket),
+                                self._window('open', bucket + 1, end_ns, end_ns + OPEN_OVERLAP_SECONDS * NANOS_PER_SECOND)])
+        self.stats['peak_window_rows'] = max(self.stats['peak_window_rows'], len(send_df) + len(open_df))
+
+        # Recipient-level facts come from the whole file, not just this window
+        total_opens = open_counts.reindex(send_df['recipient_name']).fillna(0).values
+        used_opens = consumed_counts.reindex(send_df['recipient_name']).fillna(0).values
+        recipient_opens = (total_opens > 0, total_opens - used_opens > 0)
+
+        open_index = OpenIndex(open_df)
+        self._whole_seconds(send_df, open_index)
+        join_plan = self.engine.match(send_df[KEY_COLUMNS], open_index, recipient_opens)
+
+        # Keep this bucket's own Sends; the overlap Sends are emitted with their own bucket
+        phase = join_plan['phase'][:len(own_sends)]
+        open_pos = join_plan['open_pos'][:len(own_sends)]
+        row_order = np.concatenate([np.flatnonzero(phase == 1), np.flatnonzero(phase == 2), np.flatnonzero(phase == 0)])
+
+        self.stats['phase1_matches'] += int((phase == 1).sum())
+        self.stats['phase2_matches'] += int((phase == 2).sum())
+        self.stats['unmatched'] += int((phase == 0).sum())
+
+        # Integer Open fields are nullable in the LEFT JOIN; keep them float in every
+        # bucket so the CSV is formatted the same whether or not a bucket has NULLs
+        open_fields = open_df[[col for col in open_df.columns if col not in KEY_COLUMNS]]
+        int_columns = open_fields.select_dtypes(include='integer').columns
+        if len(int_columns) > 0:
+            open_fields = open_fields.astype({col: np.float64 for col in int_columns})
+        return self.processor._take_join(own_sends, row_order, open_fields, open_pos[row_order])
+
+    def _whole_seconds(self, send_df, open_index):
+        """Int64 Send timestamps; the windowed search is exact only on whole seconds"""
+        send_ns = to_int64_ns(send_df['sent_date'])
+        if not open_index.whole_seconds or (send_ns % NANOS_PER_SECOND).any():
+            raise ValueError("Streaming join requires whole-second timestamps")
+        return send_ns
+
+    def _bucket_bounds(self, bucket):
+        """[start, end) of a bucket in int64 nanoseconds"""
+        size_ns = self.bucket_seconds * NANOS_PER_SECOND
+        return bucket * size_ns, (bucket + 1) * size_ns
+
+    def _bucket_path(self, file_type, bucket):
+        return os.path.join(self._spill_dir, f"{file_type}_{bucket}.pkl")
+
+    def _window(self, file_type, bucket, start_ns, end_ns):
+        """Rows of the buckets around `bucket` with start_ns <= sent_date <= end_ns"""
+        window = self._concat([self._load(file_type, b) for b in (bucket - 1, bucket, bucket + 1)])
+        window_ns = to_int64_ns(window['sent_date'])
+        return window[(window_ns >= start_ns) & (window_ns <= end_ns)].reset_index(drop=True)
+
+    def _concat(self, frames):
+        """Concatenate bucket frames, skipping empty placeholders so dtypes come from real rows"""
+        non_empty = [df for df in frames if len(df) > 0]
+        if not non_empty:
+            return frames[0]
+        if len(non_empty) == 1:
+            return non_empty[0].reset_index(drop=True)
+        return pd.concat(non_empty, ignore_index=True)
+
+    def _load(self, file_type, bucket):
+        """Load a spilled bucket (cached until evicted), empty frame if it has no rows"""
+        key = (file_type, bucket)
+        if key not in self._cache:
+            pieces = []
+            path = self._bucket_path(file_type, bucket)
+            if os.path.exists(path):
+                with open(path, 'rb') as f:
+                    while True:
+                        try:
+                            pieces.append(pickle.load(f))
+                        except EOFError:
+                            break
+            if pieces:
+                self._cache[key] = pd.concat(pieces, ignore_index=True)
+            else:
+                self._cache[key] = pd.DataFrame({col: pd.Series(dtype='datetime64[ns]' if col == 'sent_date' else object)
+                                                 for col in self._columns.get(file_type, KEY_COLUMNS)})
+        return self._cache[key]
+
+    def _evict(self, bucket):
+        """Drop cached buckets no longer reachable from bucket or later"""
+        for key in [key for key in self._cache if key[1] < bucket - 1]:
+            del self._cache[key]
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Background Jobs Test - the job runner, bulk SDR archives and the multi-SDR pipeline job
+
+- JobRunner must return from submit at once, run jobs on its workers with
+  progress visible while they run, keep results and errors of finished jobs
+  and forget the oldest finished jobs beyond MAX_FINISHED_JOBS
+- extract_sdr_archive must pair {sdr}_send.csv / {sdr}_open.csv entries by base
+  name, skip and report everything else, and write the files unchanged
+- A multi-SDR job over an extracted archive, joined by a process pool, must
+  match a serial run on the original files, report one progress row per SDR
+  and remove the extracted files when it ends
+"""
+import io
+import os
+import sys
+import shutil
+import tempfile
+import threading
+import time
+import zipfile
+import logging
+import pandas as pd
+from pathlib import Path
+
+# Add src to path for imports
+BASE_DIR = Path(__file__).parent
+sys.path.insert(0, str(BASE_DIR))
+
+# Keep the per-row join logging out of the test output
+logging.disable(logging.INFO)
+
+
+def _sorted_rows(df):
+    """Joined rows in a stable order (worker pools finish SDRs in any order)"""
+    columns = list(df.columns)
+    return df.astype(str).sort_values(columns).reset_index(drop=True)
+
+
+def test_job_runner():
+    """Test that jobs run in the background, report progress and keep their outcome"""
+    print("🔍 Testing the background job runner...")
+
+    from src import job_runner
+    max_finished_jobs = job_runner.MAX_FINISHED_JOBS
+    try:
+        from src.calls_processor import CallsProcessor
+        from src.pipeline_jobs import calls_job
+        runner = job_runner.JobRunner(workers=1)
+        started, release = threading.Event(), threading.Event()
+
+        def blocking_job(job, rows):
+            job.update(stage='Working', total=1)
+            started.set()
+            if not release.wait(10):
+                raise TimeoutError("job was never released")
+            job.update(done=1, add_rows=rows)
+            return {'rows': rows}
+
+        def failing_job(job):
+            raise ValueError("bad input")
+
+        def wait_finished(job_id):
+            deadline = time.time() + 10
+            while not runner.get(job_id).finished:
+                if time.time() > deadline:
+                    raise AssertionError(f"{job_id} did not finish")
+                time.sleep(0.01)
+            return runner.get(job_id)
+
+        # Test 1: submit returns while the job runs; progress is visible meanwhile
+        first = runner.submit('blocking', blocking_job, 42)
+        second = runner.submit('failing', failing_job)
+        if not started.wait(10):
+            raise AssertionError("job did not start")
+        progress = runner.get(first).snapshot()
+        if progress['status'] != 'running' or progress['stage'] != 'Working' or progress['total'] != 1:
+            raise AssertionError(f"unexpected running job state: {progress}")
+        if runner.get(second).status != 'queued':
+            raise AssertionError("second job did not wait for the single worker")
+        print("  ✅ Jobs queue behind the worker and report progress while running")
+
+        # Test 2: Finished jobs keep their result or error
+        release.set()
+        done = wait_finished(first)
+        if done.status != 'done' or done.result != {'rows': 42} or done.snapshot()['rows_processed'] != 42:
+            raise AssertionError(f"unexpected finished job: {done.snapshot()}")
+        failed = wait_finished(second)
+        if failed.status != 'failed' or failed.error != 'bad input' or failed.result is not None:
+            raise AssertionError(f"unexpected failed job: {failed.snapshot()}")
+        print("  ✅ Results and errors kept on finished jobs")
+
+        # Test 3: A pipeline job runs through the runner
+        calls = wait_finished(runner.submit('calls', calls_job, CallsProcessor(), str(BASE_DIR / 'data' / 'calls_data.csv')))
+        if calls.status != 'done' or not calls.result['is_valid'] or calls.snapshot()['rows_processed'] != len(calls.result['calls_data']):
+            raise AssertionError(f"calls job failed: {calls.error or calls.result['error_messages']}")
+        print(f"  ✅ Calls job processed {len(calls.result['calls_data'])} rows in the background")
+
+        # Test 4: Only the newest finished jobs are kept
+        job_runner.MAX_FINISHED_JOBS = 2
+        latest = wait_finished(runner.submit('latest', lambda job: None)).job_id
+        runner.submit('trigger prune', lambda job: None)
+        kept = [job_id for job_id in (first, second, calls.job_id, latest) if runner.get(job_id) is not None]
+        if kept != [calls.job_id, latest]:
+            raise AssertionError(f"pruning kept {kept}")
+        print("  ✅ Oldest finished jobs pruned")
+
+        print("✅ Job runner tests passed")
+        return True
+
+    except Exception as e:
+        print(f"❌ Job runner test failed: {e}")
+        return False
+    finally:
+        job_runner.MAX_FINISHED_JOBS = max_finished_jobs
+
+
+def test_bulk_archive():
+    """Test that a bulk zip is extracted, joined by a worker pool and cleaned up"""
+    print("🔍 Testing bulk SDR archive processing...")
+
+    cwd = os.getcwd()
+    work_dir = tempfile.mkdtemp(prefix='bulk_archive_test_')
+    try:
+        from test_preprocess_pipeline import write_sdr_inputs
+        from src.sdr_archive import extract_sdr_archive
+        from src.pipeline_jobs import multi_sdr_job
+        from src.job_runner import Job
+        from src.data_processor import DataProcessor
+        data_dir = os.path.join(work_dir, 'data')
+        write_sdr_inputs(data_dir)
+        os.chdir(work_dir)
+        sdr_names = ['harshit.gupta', 'himanshu.singh']
+
+        archive = io.BytesIO()
+        with zipfile.ZipFile(archive, 'w', zipfile.ZIP_DEFLATED) as zf:
+            for sdr_name in sdr_names:
+                for kind in ('send', 'open'):
+                    zf.write(os.path.join(data_dir, f"{sdr_name}_{kind}.csv"), f"exports/{sdr_name}_{kind}.csv")
+            zf.writestr('exports/readme.txt', 'notes')
+            zf.writestr('__MACOSX/exports/._harshit.gupta_send.csv', 'resource fork')
+            zf.writestr('orphan_send.csv', 'recipient_email\n')
+        archive.seek(0)
+
+        # Test 1: Pairs are found by base name, everything else is reported
+        sdr_configs, warnings, directory = extract_sdr_archive(archive)
+        if [sdr_config['name'] for sdr_config in sdr_configs] != sdr_names:
+            raise AssertionError(f"unexpected SDRs: {[sdr_config['name'] for sdr_config in sdr_configs]}")
+        if len(warnings) != 2 or not any('readme.txt' in w for w in warnings) or not any('orphan_open.csv' in w for w in warnings):
+            raise AssertionError(f"unexpected warnings: {warnings}")
+        for sdr_config in sdr_configs:
+            for kind in ('send', 'open'):
+                with open(sdr_config[f"{kind}_file"], 'rb') as f, open(os.path.join(data_dir, f"{sdr_config['name']}_{kind}.csv"), 'rb') as g:
+                    if f.read() != g.read():
+                        raise AssertionError(f"{sdr_config['name']} {kind} file changed by extraction")
+        print(f"  ✅ {len(sdr_configs)} SDR pairs extracted, {len(warnings)} entries skipped")
+
+        # Test 2: The process pool job matches a serial run and removes its files
+        job = Job('job-1', 'bulk archive')
+        outcome = multi_sdr_job(job, DataProcessor(), sdr_configs, executor='process', jobs=2, work_dir=directory)
+        if outcome['error']:
+            raise AssertionError(f"bulk job failed: {outcome['error']}")
+        if os.path.exists(directory):
+            raise AssertionError("extracted archive was not removed when the job ended")
+        progress = job.snapshot()
+        if progress['done'] != len(sdr_names) or [item['Status'] for item in progress['items']] != ['✅ Done'] * len(sdr_names):
+            raise AssertionError(f"unexpected job progress: {progress}")
+
+        serial_configs = [{'name': sdr_name, 'send_file': os.path.join(data_dir, f"{sdr_name}_send.csv"),
+                           'open_file': os.path.join(data_dir, f"{sdr_name}_open.csv")} for sdr_name in sdr_names]
+        serial = multi_sdr_job(Job('job-2', 'serial'), DataProcessor(), serial_configs, executor='serial')
+        pd.testing.assert_frame_equal(_sorted_rows(outcome['successful_data']), _sorted_rows(serial['successful_data']),
+                                      obj="bulk job output")
+        if outcome['original_send_count'] != serial['original_send_count']:
+            raise AssertionError("bulk job counted a different number of Send rows")
+        print(f"  ✅ Process pool job matches the serial run ({len(outcome['successful_data'])} rows), files removed")
+
+        print("✅ Bulk archive tests passed")
+        return True
+
+    except Exception as e:
+        print(f"❌ Bulk archive test failed: {e}")
+        return False
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    results = [test_job_runner(), test_bulk_archive()]
+    print("=" * 50)
+    if all(results):
+        print("🎉 Background job tests PASSED!")
+    else:
+        print("❌ Background job tests FAILED! Check errors above.")
+    sys.exit(0 if all(results) else 1)
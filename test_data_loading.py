@@ -0,0 +1,465 @@
+#!/usr/bin/env python3
+"""
+Data Loading Test - encoding sniffing, CSV engines, content validation, date parsing, per-role CSV reads, the contacts cache and the result cache
+
+- sniff_encoding must pick the encoding each file was written in, and a byte
+  past the sniffed samples must only cost a re-parse with the next encoding
+- The pyarrow CSV engine must read the same frames as the C parser, and fall
+  back to it for files pyarrow rejects
+- Content rules run over every row: failures in the header sample reject the
+  file, later ones are reported with per-rule counts and spreadsheet row numbers
+- parse_datetimes / parse_general_datetimes must agree with pd.to_datetime and
+  turn dates outside the datetime64[ns] range into NaT instead of rejecting
+  the whole file
+- Per-role read schemas must keep every input column: extra Send and contacts
+  (CRM) columns reach the joined output of process_files
+- The contacts cache must return what a fresh contacts load returns, survive
+  a new process and a touched-but-unchanged file, and rebuild on a content change
+- A result cache hit must return the stored result and restore the run's stats
+  for any file with the same contents, and the cache must evict least recently
+  used entries first
+"""
+import os
+import sys
+import shutil
+import tempfile
+import time
+import pickle
+import io
+import logging
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+# Add src to path for imports
+BASE_DIR = Path(__file__).parent
+sys.path.insert(0, str(BASE_DIR))
+
+# Keep the per-file loading logs out of the test output
+logging.disable(logging.WARNING)
+
+
+def test_encoding_sniffing():
+    """Test that CSVs in each supported encoding are sniffed and parsed once correctly"""
+    print("🔍 Testing CSV encoding sniffing...")
+
+    try:
+        from src.csv_loader import sniff_encoding, read_csv_sniffed, SNIFF_SAMPLE_BYTES
+        from src.calls_processor import CallsProcessor
+        text = "Company / Account,Contact\nCafé Noël,José\nO’Brien Ltd,Zoë\n"
+
+        # Test 1: BOMs and decode probes
+        cases = [
+            ('utf-8-sig', text.encode('utf-8-sig')),
+            ('utf-16', text.encode('utf-16')),
+            ('utf-8', text.encode('utf-8')),
+            ('cp1252', text.encode('cp1252')),
+            # 0x81 is undefined in cp1252, so only latin-1 decodes it
+            ('latin-1', text.replace('’', "'").encode('latin-1') + b'X\x81,Y\n'),
+        ]
+        expected = pd.read_csv(io.StringIO(text))
+        for encoding, data in cases:
+            sniffed = sniff_encoding(io.BytesIO(data))[0]
+            if sniffed != encoding:
+                raise AssertionError(f"{encoding} file sniffed as {sniffed}")
+            df, load_info = read_csv_sniffed(io.BytesIO(data))
+            if encoding == 'latin-1':
+                df = df.iloc[:len(expected)].replace("O'Brien Ltd", 'O’Brien Ltd')
+            pd.testing.assert_frame_equal(df, expected, obj=f"{encoding} file")
+            if load_info['encoding'] != encoding:
+                raise AssertionError(f"{encoding} file parsed as {load_info['encoding']}")
+        print(f"  ✅ {len(cases)} encodings sniffed and parsed")
+
+        # Test 2: A cp1252 byte between the head and tail samples re-parses once as cp1252
+        filler = "Filler Co,Someone\n" * (3 * SNIFF_SAMPLE_BYTES // 18)
+        data = ("Company / Account,Contact\n" + filler).encode('utf-8') + "O’Brien Ltd,Zoë\n".encode('cp1252') + filler.encode('utf-8')
+        if sniff_encoding(io.BytesIO(data))[0] != 'utf-8':
+            raise AssertionError("samples of a mostly-UTF-8 file not sniffed as utf-8")
+        df, load_info = read_csv_sniffed(io.BytesIO(data))
+        if load_info['encoding'] != 'cp1252' or 'O’Brien Ltd' not in set(df['Company / Account']):
+            raise AssertionError(f"byte outside the samples not re-parsed as cp1252: {load_info['encoding']}")
+        print("  ✅ Byte outside the sniffed samples re-parsed with the next encoding")
+
+        # Test 3: CallsProcessor loads an uploaded cp1252 file
+        df = CallsProcessor()._load_csv_with_encoding(io.BytesIO(text.encode('cp1252')))
+        pd.testing.assert_frame_equal(df, expected, obj="calls upload")
+        print("  ✅ Calls upload in cp1252 loaded")
+
+        print("✅ Encoding sniffing tests passed")
+        return True
+
+    except Exception as e:
+        print(f"❌ Encoding sniffing test failed: {e}")
+        return False
+
+
+def test_arrow_csv_engine():
+    """Test that the pyarrow CSV engine reads what the C parser reads"""
+    print("🔍 Testing the pyarrow CSV engine...")
+
+    from src import csv_loader
+    if csv_loader.pa_csv is None:
+        print("  ⏭️ pyarrow is not installed, skipping")
+        return True
+
+    try:
+        from src.data_processor import DataProcessor
+        from src.read_schema import read_csv_with_schema
+        processor = DataProcessor()
+        # Numbers followed by comma text, signs, long floats, booleans and empty columns
+        tricky = (b"n,comment,amount,flag,empty,big\n"
+                  b"1,12,+5,True,,4611686018427387904\n"
+                  b'2,"12, called back",0.1000000000000000055511151231257827,False,,4611686018427387905\n'
+                  b'3,"no answer, retry",1e-320,True,,4611686018427387906\n')
+        sources = [(name, lambda path=path: path) for name, path in (
+            ('send export', str(BASE_DIR / 'data' / 'harshit.gupta_send.csv')),
+            ('open export', str(BASE_DIR / 'data' / 'harshit.gupta_open.csv')),
+            ('calls export', str(BASE_DIR / 'data' / 'calls_data.csv')))]
+        sources.append(('mixed columns', lambda: io.BytesIO(tricky)))
+
+        # Test 1: Plain and schema reads match the C parser
+        for name, source in sources:
+            frames = {}
+            for engine in ('pyarrow', 'c'):
+                csv_loader.set_csv_engine(engine)
+                frames[engine], load_info = csv_loader.read_csv_sniffed(source())
+                if load_info['engine'] != engine:
+                    raise AssertionError(f"{name}: parsed by {load_info['engine']}, expected {engine}")
+            pd.testing.assert_frame_equal(frames['pyarrow'], frames['c'], obj=name)
+        for role, path in (('send_mails', sources[0][1]()), ('open_mails', sources[1][1]())):
+            frames = {}
+            for engine in ('pyarrow', 'c'):
+                csv_loader.set_csv_engine(engine)
+                frames[engine] = read_csv_with_schema(path, processor.read_schemas[role])[0]
+            pd.testing.assert_frame_equal(frames['pyarrow'], frames['c'], obj=f"{role} schema read")
+        print(f"  ✅ {len(sources)} files and 2 schema reads identical to the C parser")
+
+        # Test 2: Rows pyarrow rejects fall back to the C parser
+        csv_loader.set_csv_engine('pyarrow')
+        ragged = b"a,b\n1,2\n3\n"
+        df, load_info = csv_loader.read_csv_sniffed(io.BytesIO(ragged))
+        pd.testing.assert_frame_equal(df, pd.read_csv(io.BytesIO(ragged)), obj="ragged file")
+        if load_info['engine'] != 'c':
+            raise AssertionError(f"ragged file parsed by {load_info['engine']}")
+        print("  ✅ Ragged file fell back to the C parser")
+
+        print("✅ pyarrow CSV engine tests passed")
+        return True
+
+    except Exception as e:
+        print(f"❌ pyarrow CSV engine test failed: {e}")
+        return False
+    finally:
+        csv_loader.set_csv_engine('c')
+
+
+def test_content_validation():
+    """Test that content rules cover every row with counts and row numbers"""
+    print("🔍 Testing full-file content validation...")
+
+    work_dir = tempfile.mkdtemp(prefix='validation_test_')
+    try:
+        from src.data_processor import DataProcessor
+        send_df = pd.read_csv(BASE_DIR / 'data' / 'harshit.gupta_send.csv')
+        open_df = pd.read_csv(BASE_DIR / 'data' / 'harshit.gupta_open.csv')
+        files = {'send_mails': os.path.join(work_dir, 'send.csv'), 'open_mails': os.path.join(work_dir, 'open.csv')}
+
+        # Test 1: Failures past the header sample are reported, not rejected
+        print("  Testing failures past the header sample...")
+        bad_rows = [100, 700, 701, 702, 703, 704, 2000]
+        send_df.loc[bad_rows, 'recipient_email'] = 'no-at-sign'
+        open_df['Opens'] = open_df['Opens'].astype(object)
+        open_df.loc[500, 'Opens'] = 'many'
+        send_df.to_csv(files['send_mails'], index=False)
+        open_df.to_csv(files['open_mails'], index=False)
+
+        processor = DataProcessor()
+        is_valid, errors, _ = processor.sheets_validator(files, required_roles=DataProcessor.SDR_FILE_ROLES)
+        if not is_valid:
+            raise AssertionError(f"late failures rejected the files: {errors}")
+        rules = {(entry['rule'], entry['column']): entry for report in processor.last_validation_report.values()
+                 for entry in report['rules']}
+        email_rule = rules[('email_format', 'Recipient Email')]
+        expected_rows = [row + 2 for row in bad_rows[:DataProcessor.VALIDATION_REPORT_ROWS]]
+        if email_rule['count'] != len(bad_rows) or email_rule['rows'] != expected_rows:
+            raise AssertionError(f"email rule reported {email_rule['count']} rows {email_rule['rows']}")
+        if rules[('numeric_format', 'Views')]['count'] != 1 or rules[('numeric_format', 'Views')]['rows'] != [502]:
+            raise AssertionError(f"numeric rule reported {rules[('numeric_format', 'Views')]}")
+        if rules[('date_format', 'sent_date')]['count'] != 0:
+            raise AssertionError("valid Send dates reported as invalid")
+        print(f"  ✅ {email_rule['count']} invalid emails (rows {email_rule['rows']}, ...) and 1 non-numeric Opens value reported")
+
+        # Test 2: A failure in the header sample rejects the file
+        print("  Testing a failure in the header sample...")
+        send_df.loc[3, 'sent_date'] = '2025/13/45'
+        send_df.to_csv(files['send_mails'], index=False)
+        is_valid, errors, _ = DataProcessor().sheets_validator(files, required_roles=DataProcessor.SDR_FILE_ROLES)
+        if is_valid or not any('Date Format Error' in error and '(rows 5)' in error for error in errors):
+            raise AssertionError(f"invalid date in the header sample not rejected: {errors}")
+        print("  ✅ Header sample failure rejects the file with its row number")
+
+        print("✅ Content validation tests passed")
+        return True
+
+    except Exception as e:
+        print(f"❌ Content validation test failed: {e}")
+        return False
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def test_date_parsing():
+    """Test that the numpy date parser matches pandas and coerces out-of-range dates"""
+    print("🔍 Testing date parsing...")
+
+    work_dir = tempfile.mkdtemp(prefix='date_parsing_test_')
+    try:
+        from src.date_parsing import parse_datetimes, parse_general_datetimes
+        from src.data_processor import DataProcessor
+
+        # Test 1: Fixed-width layouts and the pandas fallback agree with pd.to_datetime
+        print("  Testing DD/MM/YYYY values against pd.to_datetime...")
+        values = pd.Series(['01/03/2025 02:07:40', '1/03/2025 02:07:40', '31/02/2025 10:00:00', '15/07/2025',
+                            '2025-03-01 02:07:40', 'not a date', None])
+        parsed = parse_datetimes(values, '%d/%m/%Y %H:%M:%S')
+        expected = pd.to_datetime(values, format='%d/%m/%Y %H:%M:%S', errors='coerce')
+        pd.testing.assert_series_equal(parsed, expected.astype('datetime64[ns]'))
+        print("  ✅ Parsed dates match pd.to_datetime")
+
+        # Test 2: Years outside the datetime64[ns] range become NaT on either path
+        print("  Testing out-of-range years...")
+        parsed = parse_datetimes(pd.Series(['01/03/2925 02:07:40', '1/03/2925 02:07:40', '01/03/2025 02:07:40']),
+                                 '%d/%m/%Y %H:%M:%S')
+        if parsed.notna().tolist() != [False, False, True]:
+            raise AssertionError(f"out-of-range Send dates not coerced to NaT: {parsed.tolist()}")
+        parsed, unparsed = parse_general_datetimes(pd.Series(['2925-03-01 02:07:40', 'Mar 1, 2925, 10:00:00',
+                                                              'Mar 1 2025 10:00']), ['%Y-%m-%d %H:%M:%S'])
+        if parsed.notna().tolist() != [False, False, True] or len(unparsed) != 2:
+            raise AssertionError(f"out-of-range Open dates not coerced to NaT: {parsed.tolist()}, {unparsed}")
+        print("  ✅ Out-of-range years parsed as NaT")
+
+        # Test 3: One out-of-range Send date does not fail the load; at most the
+        # content validation reports that row (pandas < 2 cannot represent the date)
+        print("  Testing an export with an out-of-range Send date...")
+        send_df = pd.read_csv(BASE_DIR / 'data' / 'harshit.gupta_send.csv')
+        send_df.loc[0, 'sent_date'] = '01/03/2925 02:07:40'
+        send_file = os.path.join(work_dir, 'send.csv')
+        send_df.to_csv(send_file, index=False)
+        successful, _, errors = DataProcessor().process_single_sdr(send_file, str(BASE_DIR / 'data' / 'harshit.gupta_open.csv'), 'sdr')
+        if errors:
+            if len(errors) != 1 or 'Date Format Error' not in errors[0] or '(rows 2)' not in errors[0]:
+                raise AssertionError(f"export with an out-of-range date failed: {errors}")
+            print("  ✅ Out-of-range row reported by content validation")
+        elif successful is None or len(successful) == 0 or successful['sent_date'].isna().any():
+            raise AssertionError("export with an out-of-range date joined no rows or kept a NaT date")
+        else:
+            print("  ✅ Export joined with the out-of-range row dropped")
+
+        print("✅ Date parsing tests passed")
+        return True
+
+    except Exception as e:
+        print(f"❌ Date parsing test failed: {e}")
+        return False
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def test_extra_columns_survive():
+    """Test that columns outside the required ones reach the joined output"""
+    print("🔍 Testing extra Send and contacts columns...")
+
+    work_dir = tempfile.mkdtemp(prefix='read_schema_test_')
+    cwd = os.getcwd()
+    try:
+        from src.data_processor import DataProcessor
+        send_df = pd.read_csv(BASE_DIR / 'data' / 'harshit.gupta_send.csv')
+        send_df['Campaign'] = 'Q3 outbound'
+        emails = send_df['recipient_email'].dropna().unique()
+        contacts_df = pd.DataFrame({
+            'Email': emails,
+            'Company URL': [email.split('@')[-1] for email in emails],
+            'Owner': 'harshit.gupta',
+            'Lifecycle Stage': 'Lead'
+        })
+        files = {
+            'send_mails': os.path.join(work_dir, 'send.csv'),
+            'open_mails': str(BASE_DIR / 'data' / 'harshit.gupta_open.csv'),
+            'contacts': os.path.join(work_dir, 'contacts.csv')
+        }
+        send_df.to_csv(files['send_mails'], index=False)
+        contacts_df.to_csv(files['contacts'], index=False)
+        # process_files writes its outputs under the working directory
+        os.chdir(work_dir)
+
+        successful, _, errors = DataProcessor().process_files(files)[:3]
+        if errors or successful is None or len(successful) == 0:
+            raise AssertionError(f"process_files failed: {errors}")
+        missing = [column for column in ('Campaign', 'Owner', 'Lifecycle Stage') if column not in successful.columns]
+        if missing:
+            raise AssertionError(f"columns dropped from the joined output: {missing}")
+        if (successful['Owner'] != 'harshit.gupta').any() or (successful['Campaign'] != 'Q3 outbound').any():
+            raise AssertionError("extra column values were not carried through the joins")
+        print(f"  ✅ {len(successful.columns)} output columns, extra Send and contacts columns kept")
+
+        print("✅ Read schema tests passed")
+        return True
+
+    except Exception as e:
+        print(f"❌ Read schema test failed: {e}")
+        return False
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def test_contacts_cache():
+    """Test that cached contacts equal a fresh load and follow file changes"""
+    print("🔍 Testing the contacts index cache...")
+
+    work_dir = tempfile.mkdtemp(prefix='contacts_cache_test_')
+    try:
+        from src import contacts_cache
+        from src.data_processor import DataProcessor
+        contacts_file = os.path.join(work_dir, 'contacts.csv')
+        cache_dir = os.path.join(work_dir, 'cache')
+        pd.DataFrame({
+            'Email': [' ana@x.com', 'ben@x.com', 'ana@x.com', None, 'cy@x.com'],
+            'Company URL': ['x.com', 'ben.io', 'dup.com', 'none.com', 'cy.org'],
+            'Owner': ['a', 'b', 'c', 'd', 'e']
+        }).to_csv(contacts_file, index=False)
+
+        def check_load(name):
+            cached = DataProcessor(contacts_cache_dir=cache_dir)._load_contacts(contacts_file)
+            fresh = DataProcessor()._load_contacts(contacts_file)
+            pd.testing.assert_frame_equal(cached[0], fresh[0], obj=f"{name} contacts")
+            if not cached[1].equals(fresh[1]) or not np.array_equal(cached[2], fresh[2]):
+                raise AssertionError(f"{name}: cached email index differs from a fresh load")
+            return cached
+
+        # Test 1: First load builds the on-disk entry
+        check_load("first load")
+        cache_file = contacts_cache.ContactsIndexCache(cache_dir).cache_path(contacts_file)
+        if not os.path.exists(cache_file):
+            raise AssertionError("contacts cache file was not written")
+
+        # Test 2: A new process (empty memory cache) and a touched file reuse the entry
+        contacts_cache._memory_cache.clear()
+        later = time.time() + 10
+        os.utime(contacts_file, (later, later))
+        # Count the cache's CSV parses (a rebuild) while loading the touched file
+        parses = []
+        read_csv = contacts_cache.read_csv_with_schema
+        contacts_cache.read_csv_with_schema = lambda *args, **kwargs: parses.append(args) or read_csv(*args, **kwargs)
+        try:
+            check_load("touched file")
+        finally:
+            contacts_cache.read_csv_with_schema = read_csv
+        if parses:
+            raise AssertionError("touched but unchanged file rebuilt the cache entry")
+        with open(cache_file, 'rb') as f:
+            entry = pickle.load(f)
+        if entry['mtime_ns'] != os.stat(contacts_file).st_mtime_ns:
+            raise AssertionError("touched but unchanged file was not re-fingerprinted")
+        print("  ✅ Cache entry reused after a restart and a touch")
+
+        # Test 3: Changed content rebuilds the entry
+        with open(contacts_file, 'a') as f:
+            f.write('dee@x.com,dee.dev,f\n')
+        contacts_df, contacts_index, _ = check_load("changed file")
+        if 'dee@x.com' not in contacts_index:
+            raise AssertionError("changed contacts file served from a stale cache entry")
+        print(f"  ✅ Changed file rebuilt ({len(contacts_df)} contacts, {len(contacts_index)} unique emails)")
+
+        print("✅ Contacts cache tests passed")
+        return True
+
+    except Exception as e:
+        print(f"❌ Contacts cache test failed: {e}")
+        return False
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def test_result_cache():
+    """Test that cached stage results match a fresh run and are evicted least recently used first"""
+    print("🔍 Testing the pipeline result cache...")
+
+    work_dir = tempfile.mkdtemp(prefix='result_cache_test_')
+    try:
+        from src.result_cache import ResultCache
+        from src.data_processor import DataProcessor
+        cache_dir = os.path.join(work_dir, 'cache')
+        send_file = os.path.join(work_dir, 'send.csv')
+        open_file = os.path.join(work_dir, 'open.csv')
+        shutil.copy(BASE_DIR / 'data' / 'harshit.gupta_send.csv', send_file)
+        shutil.copy(BASE_DIR / 'data' / 'harshit.gupta_open.csv', open_file)
+
+        def run(processor, send_path):
+            computed = []
+            compute = processor._process_single_sdr
+            processor._process_single_sdr = lambda *args: computed.append(args) or compute(*args)
+            result = processor.process_single_sdr(send_path, open_file, 'sdr')
+            if result[2]:
+                raise AssertionError(f"Send-Open join failed: {result[2]}")
+            return result, bool(computed)
+
+        # Test 1: A hit in a new processor returns the stored result and stats
+        fresh = DataProcessor(result_cache_dir=cache_dir)
+        fresh_result, computed = run(fresh, send_file)
+        if not computed:
+            raise AssertionError("empty cache did not compute the join")
+        cached = DataProcessor(result_cache_dir=cache_dir)
+        cached_result, computed = run(cached, send_file)
+        if computed:
+            raise AssertionError("identical inputs recomputed the join")
+        pd.testing.assert_frame_equal(cached_result[0], fresh_result[0], obj="cached join")
+        pd.testing.assert_frame_equal(cached_result[1], fresh_result[1], obj="cached failures")
+        for name in DataProcessor.CACHED_STATS:
+            if name != 'last_memory_stats' and getattr(cached, name) != getattr(fresh, name):
+                raise AssertionError(f"cache hit did not restore {name}")
+        print(f"  ✅ Cache hit matches the fresh join ({len(fresh_result[0])} rows) and restores its stats")
+
+        # Test 2: Keys follow contents, not file names
+        renamed = os.path.join(work_dir, 'renamed_send.csv')
+        shutil.copy(send_file, renamed)
+        if run(DataProcessor(result_cache_dir=cache_dir), renamed)[1]:
+            raise AssertionError("renamed copy of the Send file missed the cache")
+        pd.read_csv(send_file).iloc[:-1].to_csv(renamed, index=False)
+        if not run(DataProcessor(result_cache_dir=cache_dir), renamed)[1]:
+            raise AssertionError("changed Send file was served from the cache")
+        print("  ✅ Renamed copy hits, changed content recomputes")
+
+        # Test 3: Eviction removes the least recently used entry
+        payload = b'x' * 100_000
+        cache = ResultCache(os.path.join(work_dir, 'lru'), max_bytes=250_000)
+        for age, name in ((30, 'a'), (20, 'b')):
+            cache.put(name, payload)
+            past = time.time() - age
+            os.utime(cache.cache_path(name), (past, past))
+        if cache.get('a') != payload:
+            raise AssertionError("stored entry was not returned")
+        cache.put('c', payload)
+        kept = sorted(name for name in ('a', 'b', 'c') if os.path.exists(cache.cache_path(name)))
+        if kept != ['a', 'c']:
+            raise AssertionError(f"eviction kept {kept}, expected ['a', 'c']")
+        print("  ✅ Least recently used entry evicted first")
+
+        print("✅ Result cache tests passed")
+        return True
+
+    except Exception as e:
+        print(f"❌ Result cache test failed: {e}")
+        return False
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    results = [test_encoding_sniffing(), test_arrow_csv_engine(), test_content_validation(), test_date_parsing(), test_extra_columns_survive(), test_contacts_cache(), test_result_cache()]
+    print("=" * 50)
+    if all(results):
+        print("🎉 Data loading tests PASSED!")
+    else:
+        print("❌ Data loading tests FAILED! Check errors above.")
+    sys.exit(0 if all(results) else 1)
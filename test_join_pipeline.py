@@ -0,0 +1,384 @@
+#!/usr/bin/env python3
+"""
+Join Pipeline Test - Send-Open join backends, sharding, explode mode, incremental and streaming joins
+
+- The 'asof' join engine must produce the same join as the legacy 'iterrows'
+  scan: Phase 1 (0-11s) vs Phase 2 (12-60s) assignment, failure_reason codes
+  and the joined output frames
+- Sharded joins (recipient hash shards, any executor) must equal the unsharded join
+- Explode mode must give every recipient of a multi-recipient Open row its own
+  Open event while counting the row's Views / Clicks once
+- Incremental ingestion must match a full join when a cumulative export adds
+  Sends and Opens and bumps the counters of Opens already ingested
+- The streaming join must write the same rows as process_single_sdr, with
+  full timestamps in every bucket and content validation over every chunk;
+  preprocess_data --streaming must produce the same email data
+"""
+import os
+import sys
+import glob
+import shutil
+import tempfile
+import logging
+import io
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+# Add src to path for imports
+BASE_DIR = Path(__file__).parent
+sys.path.insert(0, str(BASE_DIR))
+
+# Keep the per-row join logging out of the test output
+logging.disable(logging.INFO)
+
+BASE_TIME = pd.Timestamp('2025-07-01 09:00:00')
+
+
+def _send_open_frames(send_rows, open_rows):
+    """Cleaned Send / Open frames from (recipient, seconds after BASE_TIME) tuples"""
+    send_df = pd.DataFrame({
+        'recipient_name': [recipient for recipient, _ in send_rows],
+        'sent_date': [BASE_TIME + pd.Timedelta(seconds=seconds) for _, seconds in send_rows],
+        'Recipient Email': [recipient for recipient, _ in send_rows]
+    })
+    open_df = pd.DataFrame({
+        'recipient_name': [recipient for recipient, _ in open_rows],
+        'sent_date': [BASE_TIME + pd.Timedelta(seconds=seconds) for _, seconds in open_rows],
+        'Views': np.arange(1, len(open_rows) + 1, dtype=np.float64),
+        'Clicks': np.zeros(len(open_rows))
+    })
+    return send_df, open_df
+
+
+def _compare_backends(processor, send_df, open_df):
+    """Join plans and output frames of both backends; returns the iterrows plan or raises"""
+    plans = {backend: processor._build_join_plan(send_df, open_df, backend)[0] for backend in ('iterrows', 'asof')}
+    for field in ('open_pos', 'phase', 'increment', 'failure_reason', 'match_count'):
+        if not np.array_equal(plans['iterrows'][field], plans['asof'][field]):
+            raise AssertionError(f"join plan field '{field}' differs between backends")
+
+    frames = {backend: processor._incremental_datetime_join(send_df, open_df, backend=backend) for backend in ('iterrows', 'asof')}
+    for position, name in enumerate(('successful', 'failed')):
+        pd.testing.assert_frame_equal(frames['iterrows'][position], frames['asof'][position], obj=f"{name} frame")
+    return plans['iterrows']
+
+
+def test_join_backends_match():
+    """Test that the asof backend reproduces the iterrows backend"""
+    print("🔍 Testing asof vs iterrows Send-Open join...")
+
+    try:
+        from src.data_processor import DataProcessor
+        processor = DataProcessor()
+
+        # Test 1: Hand-built cases, one Send per expected outcome
+        print("  Testing phase assignment and failure_reason codes...")
+        cases = [
+            # (recipient, send second, open seconds, expected phase, expected failure_reason)
+            ('p1_at_0@x.com', 0, [0], 1, None),
+            ('p1_at_11@x.com', 0, [11], 1, None),
+            ('p2_at_12@x.com', 0, [12], 2, None),
+            ('p2_at_60@x.com', 0, [60], 2, None),
+            ('too_late@x.com', 0, [61], 0, 'no_match_within_60_seconds'),
+            ('no_opens@x.com', 0, [], 0, 'no_open_records_for_email'),
+            # Phase 1 ties consume nothing, so Phase 2 retries the Send beyond 11s
+            ('multi_p1@x.com', 0, [3, 3], 0, 'no_match_within_60_seconds'),
+            ('multi_p1_then_p2@x.com', 0, [3, 3, 15], 2, None),
+            ('multi_p2@x.com', 0, [20, 20], 0, 'multiple_matches_at_plus_20_seconds_phase2'),
+        ]
+        send_rows, open_rows = [], []
+        for recipient, send_second, open_seconds, _, _ in cases:
+            send_rows.append((recipient, send_second))
+            open_rows.extend((recipient, second) for second in open_seconds)
+        # An Open used in Phase 1 is not offered to Phase 2: the second Send (30s
+        # earlier) keeps its Phase 1 failure as it has no unused Opens left
+        send_rows += [('consumed@x.com', 100), ('consumed@x.com', 70)]
+        open_rows += [('consumed@x.com', 105)]
+
+        send_df, open_df = _send_open_frames(send_rows, open_rows)
+        plan = _compare_backends(processor, send_df, open_df)
+
+        for position, (recipient, _, _, phase, failure_reason) in enumerate(cases):
+            if plan['phase'][position] != phase or plan['failure_reason'][position] != failure_reason:
+                raise AssertionError(f"{recipient}: phase {plan['phase'][position]}, failure_reason "
+                                     f"{plan['failure_reason'][position]} (expected {phase}, {failure_reason})")
+        consumed = len(cases)
+        if plan['phase'][consumed] != 1 or plan['failure_reason'][consumed + 1] != 'no_match_within_11_seconds':
+            raise AssertionError("Open consumed in Phase 1 was offered to Phase 2")
+        print("  ✅ Phase 1 / Phase 2 assignment and failure codes match")
+
+        # Test 2: Random exports with dense ties and overlapping windows
+        print("  Testing random exports...")
+        rng = np.random.default_rng(7)
+        for trial in range(20):
+            recipients = [f"r{i}@x.com" for i in range(rng.integers(3, 30))]
+            send_rows = [(rng.choice(recipients), int(second)) for second in rng.integers(0, 900, rng.integers(50, 400))]
+            open_rows = [(recipient, second + int(rng.integers(0, 75))) for recipient, second in send_rows
+                         if rng.random() < 0.7]
+            send_df, open_df = _send_open_frames(send_rows, open_rows)
+            _compare_backends(processor, send_df, open_df)
+        print("  ✅ 20 random exports joined identically")
+
+        print("✅ Join backend tests passed")
+        return True
+
+    except Exception as e:
+        print(f"❌ Join backend test failed: {e}")
+        return False
+
+
+def test_sharded_join_matches():
+    """Test that hash-sharded joins reproduce the unsharded join"""
+    print("🔍 Testing sharded Send-Open join...")
+
+    try:
+        from src.data_processor import DataProcessor
+        send_file = str(BASE_DIR / 'data' / 'harshit.gupta_send.csv')
+        open_file = str(BASE_DIR / 'data' / 'harshit.gupta_open.csv')
+
+        expected, _, errors = DataProcessor().process_single_sdr(send_file, open_file, 'sdr')
+        if errors:
+            raise AssertionError(f"unsharded join failed: {errors}")
+        for executor in ('serial', 'process'):
+            processor = DataProcessor(join_shards=4, join_shard_executor=executor, join_shard_jobs=2)
+            successful, _, errors = processor.process_single_sdr(send_file, open_file, 'sdr')
+            if errors:
+                raise AssertionError(f"{executor} sharded join failed: {errors}")
+            shards = processor.last_join_stats.get('shards', [])
+            if len(shards) != 4 or sum(shard['send_rows'] for shard in shards) != len(expected):
+                raise AssertionError(f"{executor} join did not run in 4 shards: {shards}")
+            pd.testing.assert_frame_equal(successful, expected, obj=f"{executor} sharded join")
+        print("  ✅ 4 shards (serial and process executors) match the unsharded join")
+
+        print("✅ Sharded join tests passed")
+        return True
+
+    except Exception as e:
+        print(f"❌ Sharded join test failed: {e}")
+        return False
+
+
+def test_explode_open_recipients():
+    """Test that explode mode matches every recipient and counts metrics once"""
+    print("🔍 Testing multi-recipient Open explosion...")
+
+    work_dir = tempfile.mkdtemp(prefix='explode_test_')
+    try:
+        from src.data_processor import DataProcessor
+        recipients = ['ana@x.com', 'ben@x.com', 'cy@x.com']
+        send_file = os.path.join(work_dir, 'send.csv')
+        open_file = os.path.join(work_dir, 'open.csv')
+        pd.DataFrame({
+            'sent_date': ['01/07/2025 09:00:00'] * 3 + ['01/07/2025 10:00:00'],
+            'recipient_name': recipients + ['dee@x.com'],
+            'recipient_email': recipients + ['dee@x.com'],
+            'thread_id': ['t1', 't2', 't3', 't4'],
+            'message_id': ['m1', 'm2', 'm3', 'm4']
+        }).to_csv(send_file, index=False)
+        # One email to three recipients (one listed twice) and a single-recipient email
+        pd.DataFrame({
+            'Recipient': ['ana@x.com, ben@x.com,cy@x.com,ben@x.com', 'dee@x.com'],
+            'Subject': ['Intro', 'Follow-up'],
+            'Last Opened': ['2025-07-02 10:00:00', '2025-07-02 11:00:00'],
+            'Opens': [7, 2],
+            'Clicks': [3, 1],
+            'PDF views': [1, 0],
+            'Sent': ['2025-07-01 09:00:04', '2025-07-01 10:00:02']
+        }).to_csv(open_file, index=False)
+
+        joined = {}
+        for mode in DataProcessor.OPEN_RECIPIENT_MODES:
+            successful, _, errors = DataProcessor(open_recipient_mode=mode).process_single_sdr(send_file, open_file, 'sdr')
+            if errors:
+                raise AssertionError(f"{mode} join failed: {errors}")
+            joined[mode] = successful.set_index('recipient_name')
+
+        # Test 1: 'first' matches the first listed recipient only
+        matched = sorted(joined['first'].index[joined['first']['Views'].notna()])
+        if matched != ['ana@x.com', 'dee@x.com']:
+            raise AssertionError(f"first mode matched {matched}")
+
+        # Test 2: 'explode' matches every recipient, counters stay on the first one
+        exploded = joined['explode']
+        if exploded['Views'].isna().any():
+            raise AssertionError(f"explode mode left recipients unmatched: {list(exploded.index[exploded['Views'].isna()])}")
+        for col in ('Views', 'Clicks', 'PDF views'):
+            if exploded[col].sum() != joined['first'][col].sum():
+                raise AssertionError(f"explode mode changed the {col} total: {exploded[col].sum()} vs {joined['first'][col].sum()}")
+        if exploded.loc['ana@x.com', 'Views'] != 7 or exploded.loc[['ben@x.com', 'cy@x.com'], 'Views'].tolist() != [0, 0]:
+            raise AssertionError(f"counters not kept on the first recipient: {exploded['Views'].to_dict()}")
+        print("  ✅ Every recipient matched, Views / Clicks / PDF views counted once")
+
+        print("✅ Explode mode tests passed")
+        return True
+
+    except Exception as e:
+        print(f"❌ Explode mode test failed: {e}")
+        return False
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def _sorted_join(df):
+    """Joined frame in a fixed row order, as text (incremental output keeps Sends in ingestion order)"""
+    return df.sort_values(['sent_date', 'recipient_name', 'Recipient Email', 'message_id']).reset_index(drop=True).astype(str)
+
+
+def test_incremental_matches_full_join():
+    """Test that re-ingesting cumulative exports matches a full join"""
+    print("🔍 Testing incremental join state against a full join...")
+
+    work_dir = tempfile.mkdtemp(prefix='join_state_test_')
+    try:
+        from src.data_processor import DataProcessor
+        send_df = pd.read_csv(BASE_DIR / 'data' / 'harshit.gupta_send.csv')
+        open_df = pd.read_csv(BASE_DIR / 'data' / 'harshit.gupta_open.csv')
+        send_file = os.path.join(work_dir, 'send.csv')
+        open_file = os.path.join(work_dir, 'open.csv')
+        state_dir = os.path.join(work_dir, 'state')
+
+        def check_run(name):
+            incremental = DataProcessor(join_state_dir=state_dir)
+            successful, failed, errors = incremental.process_single_sdr(send_file, open_file, 'sdr')
+            if errors:
+                raise AssertionError(f"{name}: {errors}")
+            full_successful, full_failed, errors = DataProcessor().process_single_sdr(send_file, open_file, 'sdr')
+            if errors:
+                raise AssertionError(f"{name} (full join): {errors}")
+            pd.testing.assert_frame_equal(_sorted_join(successful), _sorted_join(full_successful), obj=f"{name} successful")
+            if len(failed) != len(full_failed):
+                raise AssertionError(f"{name}: {len(failed)} failed rows, full join has {len(full_failed)}")
+            return incremental.last_join_stats['incremental']
+
+        # Test 1: First export (70% of the rows) is a full join
+        print("  Ingesting a partial export...")
+        send_df.iloc[:int(len(send_df) * 0.7)].to_csv(send_file, index=False)
+        open_df.sample(frac=0.7, random_state=1).to_csv(open_file, index=False)
+        check_run("first export")
+
+        # Test 2: The cumulative export adds rows and bumps the counters of every ingested Open
+        print("  Ingesting the full export with updated Open counters...")
+        send_df.to_csv(send_file, index=False)
+        open_df.assign(Opens=open_df['Opens'] + 1).to_csv(open_file, index=False)
+        stats = check_run("cumulative export")
+        if stats['updated_open_rows'] == 0 or stats['new_open_rows'] == 0:
+            raise AssertionError(f"export was not ingested as a delta: {stats}")
+
+        # Test 3: Same rows again, only counters changed
+        print("  Ingesting the same export with updated counters only...")
+        open_df.assign(Opens=open_df['Opens'] + 2).to_csv(open_file, index=False)
+        stats = check_run("counter-only export")
+        if stats['updated_open_rows'] != len(open_df) or stats['new_send_rows'] or stats['new_open_rows']:
+            raise AssertionError(f"unexpected delta for a counter-only export: {stats}")
+        print(f"  ✅ {stats['updated_open_rows']} Open counters updated, output matches a full join")
+
+        print("✅ Incremental join tests passed")
+        return True
+
+    except Exception as e:
+        print(f"❌ Incremental join test failed: {e}")
+        return False
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def _csv_rows(source):
+    """Rows of a joined CSV (path or buffer) as text, in a fixed order (the streaming join writes bucket by bucket)"""
+    df = pd.read_csv(source, dtype=str, keep_default_na=False)
+    return df.sort_values(list(df.columns)).reset_index(drop=True)
+
+
+def test_streaming_matches_in_memory_join():
+    """Test that the streaming join writes the rows of process_single_sdr"""
+    print("🔍 Testing streaming vs in-memory Send-Open join...")
+
+    work_dir = tempfile.mkdtemp(prefix='streaming_test_')
+    cwd = os.getcwd()
+    try:
+        from src.data_processor import DataProcessor
+        from src.read_schema import PROCESSED_DATETIME_FORMAT
+
+        # Three midnight Sends on a day of their own (a bucket without times), an
+        # invalid email far past the header sample, and small chunks
+        send_df = pd.read_csv(BASE_DIR / 'data' / 'harshit.gupta_send.csv')
+        send_df.loc[:2, 'sent_date'] = '01/01/2024 00:00:00'
+        send_df.loc[1500, 'recipient_email'] = 'not-an-email'
+        send_file = os.path.join(work_dir, 'send.csv')
+        open_file = str(BASE_DIR / 'data' / 'harshit.gupta_open.csv')
+        output_file = os.path.join(work_dir, 'joined.csv')
+        send_df.to_csv(send_file, index=False)
+
+        # Test 1: Same rows as the in-memory join, timestamps written in full
+        print("  Streaming the join in 500-row chunks...")
+        streaming = DataProcessor()
+        stats, errors = streaming.process_single_sdr_streaming(send_file, open_file, output_file, 'sdr', chunk_size=500)
+        if errors:
+            raise AssertionError(f"streaming join failed: {errors}")
+        in_memory = DataProcessor()
+        successful, _, errors = in_memory.process_single_sdr(send_file, open_file, 'sdr')
+        if errors:
+            raise AssertionError(f"in-memory join failed: {errors}")
+
+        streamed = _csv_rows(output_file)
+        expected = _csv_rows(io.StringIO(successful.to_csv(index=False, date_format=PROCESSED_DATETIME_FORMAT)))
+        pd.testing.assert_frame_equal(streamed, expected, obj="streamed rows")
+        if not streamed['sent_date'].str.fullmatch(r'\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}').all():
+            raise AssertionError("streamed sent_date values written without a time")
+        print(f"  ✅ {len(streamed)} rows match across {stats['buckets']} buckets")
+
+        # Test 2: Content validation covers every chunk, with whole-file row numbers
+        print("  Comparing content validation reports...")
+        for file_key in ('send_mails', 'open_mails'):
+            if streaming.last_validation_report[file_key] != in_memory.last_validation_report[file_key]:
+                raise AssertionError(f"{file_key} validation report differs: {streaming.last_validation_report[file_key]}")
+        email_rule = [entry for entry in streaming.last_validation_report['send_mails']['rules'] if entry['rule'] == 'email_format'][0]
+        if email_rule['count'] != 1 or email_rule['rows'] != [1502]:
+            raise AssertionError(f"invalid email past the first chunk not reported: {email_rule}")
+        print("  ✅ Validation reports match, invalid row 1502 reported")
+
+        # Test 3: preprocess_data --streaming produces the same email data
+        print("  Running preprocess_data with and without --streaming...")
+        import preprocess_data
+        from test_preprocess_pipeline import write_sdr_inputs
+        write_sdr_inputs(os.path.join(work_dir, 'data'))
+        os.chdir(work_dir)
+        email_file = os.path.join('data', 'processed_files', 'processed_email_data.csv')
+        outputs = {}
+        for mode in ([], ['--streaming']):
+            if os.path.exists(email_file):
+                os.remove(email_file)
+            preprocess_data.main(preprocess_data.parse_args(['--executor', 'serial', '--output-format', 'csv', '--force', *mode]))
+            outputs[bool(mode)] = _csv_rows(email_file)
+        # Company URL IDs number URLs in row order, which is time-bucket order when streamed
+        url_ids = {mode: output.groupby('Company URL')['Company URL ID'].nunique() for mode, output in outputs.items()}
+        if (url_ids[True] != 1).any() or len(url_ids[True]) != len(url_ids[False]):
+            raise AssertionError("streamed run numbered Company URLs inconsistently")
+        outputs = {mode: _csv_rows(io.StringIO(output.drop(columns='Company URL ID').to_csv(index=False)))
+                   for mode, output in outputs.items()}
+        pd.testing.assert_frame_equal(outputs[True], outputs[False], obj="processed email data")
+        streamed_files = sorted(os.listdir(preprocess_data.STREAMING_DIR))
+        if len(streamed_files) != len(glob.glob(os.path.join('data', '*_send.csv'))):
+            raise AssertionError(f"missing per-SDR streamed joins: {streamed_files}")
+        print(f"  ✅ Same {len(outputs[True])} email rows, per-SDR joins in {preprocess_data.STREAMING_DIR}")
+
+        print("✅ Streaming join tests passed")
+        return True
+
+    except Exception as e:
+        print(f"❌ Streaming join test failed: {e}")
+        return False
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    results = [test_join_backends_match(), test_sharded_join_matches(), test_explode_open_recipients(), test_incremental_matches_full_join(),
+               test_streaming_matches_in_memory_join()]
+    print("=" * 50)
+    if all(results):
+        print("🎉 Join pipeline tests PASSED!")
+    else:
+        print("❌ Join pipeline tests FAILED! Check errors above.")
+    sys.exit(0 if all(results) else 1)
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Preprocess Pipeline Test - processed file storage and input manifest stage reuse
+
+- Processed datasets written as Parquet / Feather must load back with the same
+  values and dtypes the dashboard uses, and CSV exports with the same values
+- A second preprocess_data run on unchanged inputs must reuse every stage and
+  leave byte-identical outputs; a --force run must reproduce them
+"""
+import os
+import sys
+import glob
+import json
+import shutil
+import tempfile
+import time
+import logging
+import pandas as pd
+from pathlib import Path
+
+# Add src to path for imports
+BASE_DIR = Path(__file__).parent
+sys.path.insert(0, str(BASE_DIR))
+
+# Keep the per-row join logging out of the test output
+logging.disable(logging.INFO)
+
+
+def write_sdr_inputs(data_dir):
+    """SDR Send/Open exports and calls data from data/, plus a contacts file (every other Send recipient when data/contacts.csv is absent)"""
+    os.makedirs(data_dir)
+    for path in glob.glob(str(BASE_DIR / 'data' / '*_send.csv')) + glob.glob(str(BASE_DIR / 'data' / '*_open.csv')):
+        shutil.copy(path, data_dir)
+    shutil.copy(BASE_DIR / 'data' / 'calls_data.csv', data_dir)
+
+    contacts_file = BASE_DIR / 'data' / 'contacts.csv'
+    if contacts_file.exists():
+        shutil.copy(contacts_file, data_dir)
+        return
+    emails = pd.concat([pd.read_csv(path, usecols=['recipient_email'])['recipient_email']
+                        for path in glob.glob(os.path.join(data_dir, '*_send.csv'))]).dropna().unique()
+    pd.DataFrame({
+        'Email': emails[::2],
+        'Company URL': [email.split('@')[-1] for email in emails[::2]]
+    }).to_csv(os.path.join(data_dir, 'contacts.csv'), index=False)
+
+
+def _output_bytes(output_dir):
+    """Contents of the processed output files (metadata and manifest excluded)"""
+    outputs = {}
+    for name in sorted(os.listdir(output_dir)):
+        path = os.path.join(output_dir, name)
+        if os.path.isfile(path) and name.startswith(('processed_', 'contacts_failed_records')):
+            with open(path, 'rb') as f:
+                outputs[name] = f.read()
+    return outputs
+
+
+def test_processed_file_round_trip():
+    """Test that processed datasets load back unchanged in every storage format"""
+    print("🔍 Testing processed file round trips...")
+
+    from src import processed_store
+    output_dir = tempfile.mkdtemp(prefix='processed_store_test_')
+    try:
+        from src.data_processor import DataProcessor
+        from src.read_schema import build_read_schema
+        email_df, _, errors = DataProcessor().process_single_sdr(str(BASE_DIR / 'data' / 'harshit.gupta_send.csv'),
+                                                                 str(BASE_DIR / 'data' / 'harshit.gupta_open.csv'), 'sdr')
+        if errors:
+            raise AssertionError(f"Send-Open join failed: {errors}")
+        schema = build_read_schema('processed_email')
+        typed_df = processed_store._typed_frame(email_df, schema).reset_index(drop=True)
+
+        # Test 1: Typed formats keep values, dates and categoricals exactly
+        formats = [output_format for output_format in processed_store.OUTPUT_FORMATS
+                   if processed_store.resolve_output_format(output_format) == output_format]
+        loaded = {}
+        for output_format in formats:
+            path = processed_store.write_processed(email_df, output_dir, 'processed_email_data', output_format, schema)
+            loaded[output_format] = processed_store.read_processed(path, schema)
+            # Distinct mtimes, so the newest file is unambiguous below
+            time.sleep(0.01)
+        for output_format in set(formats) & set(processed_store.TYPED_FORMATS):
+            pd.testing.assert_frame_equal(loaded[output_format], typed_df, obj=f"{output_format} round trip")
+        if not pd.api.types.is_datetime64_any_dtype(typed_df['sent_date']) or typed_df['SDR_Name'].dtype != 'category':
+            raise AssertionError("typed frame does not carry datetime / category columns")
+        print(f"  ✅ {', '.join(formats)} written; typed formats load back identical")
+
+        # Test 2: The CSV export loads back with the same values
+        csv_df = loaded['csv']
+        for column in typed_df.columns:
+            expected = typed_df[column].astype(object).where(typed_df[column].notna(), None)
+            actual = csv_df[column].astype(object).where(csv_df[column].notna(), None)
+            if column not in ('sent_date', 'last_opened'):
+                expected, actual = expected.map(lambda value: None if value is None else str(value)), \
+                    actual.map(lambda value: None if value is None else str(value))
+            if not expected.equals(actual):
+                raise AssertionError(f"CSV round trip changed column '{column}'")
+        print("  ✅ CSV export loads back with the same values")
+
+        # Test 3: The most recently written format is the current one
+        current = processed_store.find_processed_file(output_dir, 'processed_email_data')
+        if current != os.path.join(output_dir, processed_store.processed_file_name('processed_email_data', formats[-1])):
+            raise AssertionError(f"find_processed_file picked {current}")
+        print(f"  ✅ Newest file ({os.path.basename(current)}) is the current dataset")
+
+        print("✅ Processed file round trip tests passed")
+        return True
+
+    except Exception as e:
+        print(f"❌ Processed file round trip test failed: {e}")
+        return False
+    finally:
+        shutil.rmtree(output_dir, ignore_errors=True)
+
+
+def test_preprocess_stage_reuse():
+    """Test that an unchanged second preprocess run reuses every stage"""
+    print("🔍 Testing preprocess_data stage reuse...")
+
+    work_dir = tempfile.mkdtemp(prefix='preprocess_test_')
+    cwd = os.getcwd()
+    try:
+        import preprocess_data
+        write_sdr_inputs(os.path.join(work_dir, 'data'))
+        os.chdir(work_dir)
+        output_dir = os.path.join('data', 'processed_files')
+
+        def run(*argv):
+            preprocess_data.main(preprocess_data.parse_args(['--executor', 'serial', *argv]))
+            with open(os.path.join(output_dir, 'preprocessing_metadata.json')) as f:
+                return json.load(f)['stages'], _output_bytes(output_dir)
+
+        # Test 1: First run computes every stage
+        print("  Running preprocessing on fresh inputs...")
+        first_stages, first_outputs = run()
+        if first_stages['reused'] or not first_stages['computed']:
+            raise AssertionError(f"first run reused stages: {first_stages}")
+        if len(first_outputs) < 3:
+            raise AssertionError(f"missing outputs: {sorted(first_outputs)}")
+
+        # Test 2: Unchanged inputs reuse every stage and keep the outputs byte for byte
+        print("  Running preprocessing again on unchanged inputs...")
+        second_stages, second_outputs = run()
+        if second_stages['computed'] or sorted(second_stages['reused']) != sorted(first_stages['computed']):
+            raise AssertionError(f"second run did not reuse every stage: {second_stages}")
+        if second_outputs != first_outputs:
+            raise AssertionError("second run changed the outputs")
+        print(f"  ✅ {len(second_stages['reused'])} stages reused, {len(second_outputs)} outputs byte-identical")
+
+        # Test 3: Recomputing everything reproduces the same outputs
+        print("  Running preprocessing with --force...")
+        forced_stages, forced_outputs = run('--force')
+        if forced_stages['reused']:
+            raise AssertionError(f"--force reused stages: {forced_stages}")
+        if forced_outputs != first_outputs:
+            changed = [name for name in first_outputs if forced_outputs.get(name) != first_outputs[name]]
+            raise AssertionError(f"--force run produced different outputs: {changed}")
+        print("  ✅ --force run reproduces the outputs")
+
+        print("✅ Preprocess stage reuse tests passed")
+        return True
+
+    except Exception as e:
+        print(f"❌ Preprocess stage reuse test failed: {e}")
+        return False
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    results = [test_processed_file_round_trip(), test_preprocess_stage_reuse()]
+    print("=" * 50)
+    if all(results):
+        print("🎉 Preprocess pipeline tests PASSED!")
+    else:
+        print("❌ Preprocess pipeline tests FAILED! Check errors above.")
+    sys.exit(0 if all(results) else 1)